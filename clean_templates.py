@@ -3,9 +3,13 @@ Script to clean _merged.lsf.lsx - removes all character templates.
 Run this from the repository root.
 """
 
-import xml.etree.ElementTree as ET
-from pathlib import Path
 import shutil
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "reference" / "scripts"))
+
+from root_templates import rewrite_game_objects  # noqa: E402
 
 merged_file = Path("Public/EldertideArmament/RootTemplates/_merged.lsf.lsx")
 
@@ -16,38 +20,25 @@ if not merged_file.exists():
 print(f"Reading: {merged_file}")
 print(f"File size: {merged_file.stat().st_size:,} bytes")
 
-# Create backup BEFORE parsing
+# Create backup BEFORE rewriting
 backup_file = merged_file.with_suffix('.lsf.lsx.backup')
 print(f"\nCreating backup: {backup_file}")
 shutil.copy2(merged_file, backup_file)
 print("Backup created successfully")
 
-tree = ET.parse(merged_file)
-root = tree.getroot()
-
-templates_region = root.find(".//region[@id='Templates']")
-templates_node = templates_region.find(".//node[@id='Templates']")
-children = templates_node.find("children")
-
-removed_count = 0
-kept_count = 0
 character_names = []
 
-game_objects = list(children.findall("node[@id='GameObjects']"))
 
-print(f"\nScanning {len(game_objects)} GameObjects templates...")
+def keep(record):
+    if record.type == 'character':
+        character_names.append(record.name or "Unknown")
+        return False
+    return True
 
-for obj in game_objects:
-    type_attr = obj.find("./attribute[@id='Type']")
-    
-    if type_attr is not None and type_attr.get('value') == 'character':
-        name_attr = obj.find("./attribute[@id='Name']")
-        name = name_attr.get('value') if name_attr is not None else "Unknown"
-        character_names.append(name)
-        children.remove(obj)
-        removed_count += 1
-    else:
-        kept_count += 1
+
+# Stream the templates from the backup straight into the cleaned file
+print(f"\nStreaming GameObjects templates...")
+kept_count, removed_count = rewrite_game_objects(backup_file, merged_file, keep)
 
 print(f"\n{'='*60}")
 print(f"Results:")
@@ -62,9 +53,6 @@ if character_names:
     if len(character_names) > 25:
         print(f"  ... and {len(character_names) - 25} more")
 
-print(f"\nSaving cleaned file...")
-tree.write(merged_file, encoding='utf-8', xml_declaration=True)
-
 new_size = merged_file.stat().st_size
 old_size = backup_file.stat().st_size
 reduction = old_size - new_size
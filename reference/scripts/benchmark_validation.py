@@ -1,170 +1,469 @@
 #!/usr/bin/env python3
 """
-Performance Benchmark Suite for BG3 Validation Scripts
+Performance Benchmark Harness for BG3 Validation Scripts
 
-This script benchmarks the performance of validation scripts to track improvements.
+Runs the unified validator in-process and times each phase of a run with
+``time.perf_counter_ns``:
+
+    read      read every file the checks consume (.txt, .lsx, .xml, .dds)
+    parse     tokenize the stats files of the included dumps and the mod
+    validate  build a fresh ValidationContext and run the selected checks
+              (each check is also recorded as ``validate:<check>``)
+    report    render the merged report
+
+Each iteration runs the phases in that order. ``--warmup`` iterations are run
+untimed first, then ``--repeat`` timed ones with the garbage collector paused
+while the clock runs. The parse caches are cleared before every parse phase,
+so ``validate`` measures the rules and index lookups against freshly parsed
+files; the on-disk validation cache and symbol indexes stay warm, as they are
+on any second run of the validator.
+
+Every run is recorded as one JSON object (git SHA, machine, configuration and
+the median / p95 / stddev of each phase) appended to
+``benchmark_results.jsonl``. With ``--compare`` the run fails (exit 1) when
+the median of any phase regresses past ``--threshold`` percent of the
+baseline's median.
+
+With ``--scales`` the mod is first cloned into seeded synthetic corpora of
+each size (see synthetic_corpus.py) and every corpus is benchmarked in turn.
+The scaling table then shows each phase's growth exponent between
+consecutive sizes: about 1.0 is linear, and anything well above it marks a
+phase that goes superlinear as the load order grows.
 
 Usage:
-    python3 benchmark_validation.py <path_to_mod_directory>
+    python3 benchmark_validation.py <path_to_mod_directory> [--warmup N] [--repeat N]
+                                    [--only CHECK ...] [--skip CHECK ...] [--include DIR ...]
+                                    [--output FILE] [--compare BASELINE]
+                                    [--threshold PCT] [--min-delta-ms MS]
+                                    [--scales N ...] [--seed N]
 
 Example:
     python3 benchmark_validation.py Public/EldertideArmament/
+    python3 benchmark_validation.py Public/EldertideArmament/ --output baseline.json
+    python3 benchmark_validation.py Public/EldertideArmament/ --compare baseline.json --threshold 15
+    python3 benchmark_validation.py Public/EldertideArmament/ --scales 1 10 100 --repeat 3
 """
 
-import sys
+import argparse
+import gc
+import io
+import json
+import math
 import os
-import time
+import platform
+import statistics
 import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, List, Sequence
+
+import functor_parser
+import stats_parser
+from eldertide_validate import CHECKS, ValidationContext, print_report, run_checks, select_checks
+from synthetic_corpus import DEFAULT_SEED, CorpusTemplate, generate_corpus
+from validate_references import DEFAULT_INCLUDE_DIRS
+
+# Bump whenever the shape of a recorded run changes
+RESULTS_VERSION = 1
+
+DEFAULT_RESULTS_FILE = Path(__file__).parent / "benchmark_results.jsonl"
+
+# Growth exponents above this between two scales are flagged as superlinear
+SUPERLINEAR_EXPONENT = 1.2
 
-# Module-level constants for better performance
-_SUMMARY_KEYWORDS = ('VALIDATION SUMMARY', 'VALIDATION PASSED', 'VALIDATION FAILED')
+# Every suffix a registered check reads
+_READ_SUFFIXES = frozenset(suffix for _, _, suffixes in CHECKS.values() for suffix in suffixes)
+
+
+def input_files(mod_dir: Path, include_dirs: Sequence[str]) -> List[Path]:
+    """Return the files under the included dumps and the mod's roots that checks read."""
+    files: List[Path] = []
+    for root in [*include_dirs, *ValidationContext(str(mod_dir)).watch_roots]:
+        files.extend(sorted(p for p in Path(root).rglob("*") if p.suffix in _READ_SUFFIXES and p.is_file()))
+    return files
+
+
+def stats_files(mod_dir: Path, include_dirs: Sequence[str]) -> List[Path]:
+    """Return the stats files of the included dumps and the mod, in load order."""
+    files: List[Path] = []
+    for root in [*include_dirs, mod_dir]:
+        files.extend(sorted(stats_parser.find_stats_files(root)))
+    return files
+
+
+def run_iteration(mod_dir: Path, include_dirs: Sequence[str], names: Sequence[str],
+                  files: Sequence[Path], stats: Sequence[Path]) -> Dict[str, int]:
+    """Run every phase once.
 
-def benchmark_command(command: list, description: str) -> Tuple[float, int]:
-    """Run a command and measure its execution time.
-    
     Returns:
-        Tuple of (execution_time_seconds, exit_code)
+        Mapping of phase name to elapsed nanoseconds
     """
-    print(f"\n{'='*70}")
-    print(f"Benchmarking: {description}")
-    print(f"{'='*70}")
-    
-    start_time = time.time()
-    
+    samples: Dict[str, int] = {}
+    sink = io.StringIO()
+    was_enabled = gc.isenabled()
+
     try:
-        result = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-        
-        end_time = time.time()
-        execution_time = end_time - start_time
-        
-        # Print summary of output - optimized to avoid repeated string searches
-        lines = result.stdout.split('\n')
-        summary_started = False
-        
-        for line in lines:
-            # Use any() with generator for early exit on first match (uses module-level constant)
-            if not summary_started and any(keyword in line for keyword in _SUMMARY_KEYWORDS):
-                summary_started = True
-            if summary_started:
-                print(line)
-        
-        print(f"\n⏱️  Execution Time: {execution_time:.3f} seconds")
-        
-        return execution_time, result.returncode
-        
-    except subprocess.TimeoutExpired:
-        end_time = time.time()
-        execution_time = end_time - start_time
-        print(f"❌ Timeout after {execution_time:.3f} seconds")
-        return execution_time, -1
-    except Exception as e:
-        end_time = time.time()
-        execution_time = end_time - start_time
-        print(f"❌ Error: {e}")
-        return execution_time, -1
-
-def run_benchmarks(mod_directory: str) -> Dict[str, float]:
-    """Run all validation benchmarks.
-    
-    Returns:
-        Dictionary mapping benchmark name to execution time
+        gc.collect()
+        gc.disable()
+        start = time.perf_counter_ns()
+        for path in files:
+            path.read_bytes()
+        samples["read"] = time.perf_counter_ns() - start
+
+        stats_parser.clear_cache()
+        functor_parser.clear_cache()
+        gc.collect()
+        start = time.perf_counter_ns()
+        for path in stats:
+            try:
+                stats_parser.load_stats_file(path)
+            except (OSError, UnicodeDecodeError):
+                continue
+        samples["parse"] = time.perf_counter_ns() - start
+
+        gc.collect()
+        ctx = ValidationContext(str(mod_dir), include_dirs)
+        try:
+            start = time.perf_counter_ns()
+            with redirect_stdout(sink):
+                results = run_checks(ctx, names)
+            samples["validate"] = time.perf_counter_ns() - start
+        finally:
+            ctx.close()
+        for name, (_, seconds) in results.items():
+            samples[f"validate:{name}"] = round(seconds * 1e9)
+
+        gc.collect()
+        start = time.perf_counter_ns()
+        with redirect_stdout(sink):
+            print_report(results)
+        samples["report"] = time.perf_counter_ns() - start
+    finally:
+        if was_enabled:
+            gc.enable()
+
+    return samples
+
+
+def summarize(samples_ns: Sequence[int]) -> Dict:
+    """Return the median, p95 (nearest rank), stddev, mean and min in milliseconds."""
+    ordered = sorted(samples_ns)
+    p95 = ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+    return {
+        "median_ms": statistics.median(ordered) / 1e6,
+        "p95_ms": p95 / 1e6,
+        "stdev_ms": (statistics.stdev(ordered) if len(ordered) > 1 else 0.0) / 1e6,
+        "mean_ms": statistics.fmean(ordered) / 1e6,
+        "min_ms": ordered[0] / 1e6,
+        "samples_ns": list(samples_ns),
+    }
+
+
+def git_revision() -> Dict:
+    """Return the checked-out commit and whether tracked files are modified."""
+    cwd = Path(__file__).parent
+    try:
+        sha = subprocess.run(["git", "rev-parse", "HEAD"], cwd=cwd, capture_output=True,
+                             text=True, check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=cwd,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return {"sha": None, "dirty": None}
+    return {"sha": sha, "dirty": bool(status.strip())}
+
+
+def machine_info() -> Dict:
+    """Return what identifies the machine a run was measured on."""
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": f"{platform.python_implementation()} {platform.python_version()}",
+    }
+
+
+def run_benchmark(mod_dir: str, include_dirs: Sequence[str], names: Sequence[str],
+                  warmup: int, repeat: int) -> Dict:
+    """Benchmark the selected checks and return the run as a JSON-ready record."""
+    mod_path = Path(mod_dir)
+    files = input_files(mod_path, include_dirs)
+    stats = stats_files(mod_path, include_dirs)
+
+    for _ in range(warmup):
+        run_iteration(mod_path, include_dirs, names, files, stats)
+
+    samples: Dict[str, List[int]] = {}
+    for _ in range(repeat):
+        for phase, elapsed in run_iteration(mod_path, include_dirs, names, files, stats).items():
+            samples.setdefault(phase, []).append(elapsed)
+
+    return {
+        "version": RESULTS_VERSION,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git": git_revision(),
+        "machine": machine_info(),
+        "target": str(mod_dir),
+        "config": {
+            "warmup": warmup,
+            "repeat": repeat,
+            "checks": list(names),
+            "include": list(include_dirs),
+            "files": len(files),
+            "bytes": sum(path.stat().st_size for path in files),
+        },
+        "phases": {phase: summarize(values) for phase, values in samples.items()},
+    }
+
+
+def run_scaling(mod_dir: str, include_dirs: Sequence[str], names: Sequence[str], warmup: int,
+                repeat: int, scales: Sequence[int], seed: int = DEFAULT_SEED) -> List[Dict]:
+    """Benchmark a synthetic corpus of each size in ``scales`` (multiples of the mod).
+
+    Each corpus is generated into a temporary directory and removed once it
+    has been measured.
     """
-    results = {}
-    script_dir = Path(__file__).parent
-    
-    # Benchmark 1: Spell Validation
-    spell_time, _ = benchmark_command(
-        ["python3", str(script_dir / "validate_spells.py"), 
-         f"{mod_directory}/Stats/Generated/Data/"],
-        "Spell Validation"
-    )
-    results["spell_validation"] = spell_time
-    
-    # Benchmark 2: Item Validation
-    item_time, _ = benchmark_command(
-        ["python3", str(script_dir / "validate_items.py"),
-         f"{mod_directory}/Stats/Generated/Data/"],
-        "Item Validation"
-    )
-    results["item_validation"] = item_time
-    
-    # Benchmark 3: Reference Validation
-    ref_time, _ = benchmark_command(
-        ["python3", str(script_dir / "validate_references.py"),
-         mod_directory],
-        "Cross-Reference Validation"
-    )
-    results["reference_validation"] = ref_time
-    
-    return results
+    template = CorpusTemplate(Path(mod_dir).resolve())
+    records = []
+    for scale in scales:
+        with tempfile.TemporaryDirectory(prefix=f"corpus_{scale}x_") as output_dir:
+            print(f"🧬 Generating {scale}× corpus...")
+            corpus = generate_corpus(mod_dir, output_dir, scale, seed, template)
+            print(f"⏱️  Benchmarking {scale}× corpus...")
+            record = run_benchmark(str(corpus), include_dirs, names, warmup, repeat)
+        record["config"].update(scale=scale, seed=seed, source=str(mod_dir))
+        records.append(record)
+    print()
+    return records
+
+
+def print_scaling(records: Sequence[Dict]) -> None:
+    """Print each phase's median per corpus size and its growth exponent.
 
-def print_summary(results: Dict[str, float]):
-    """Print benchmark summary."""
-    print(f"\n{'='*70}")
+    The exponent between two sizes is log(time ratio) / log(size ratio); it
+    is measured against the previous size, so the column flags where a
+    phase starts to go superlinear.
+    """
+    scales = [record["config"]["scale"] for record in records]
+
+    print("=" * 70)
+    print("SCALING")
+    print("=" * 70)
+    print(f"  {'phase':22s}" + "".join(f"{f'{s}×':>11s}" for s in scales) + "   exponent")
+    for phase in records[0]["phases"]:
+        medians = [record["phases"].get(phase, {}).get("median_ms", 0.0) for record in records]
+        exponents = [
+            math.log(b / a) / math.log(s2 / s1)
+            for (s1, a), (s2, b) in zip(zip(scales, medians), zip(scales[1:], medians[1:]))
+            if a > 0 and b > 0 and s2 != s1
+        ]
+        worst = max(exponents, default=None)
+        flag = "⚠️ " if worst is not None and worst > SUPERLINEAR_EXPONENT else "  "
+        exponent = " ".join(f"{e:.2f}" for e in exponents) or "-"
+        indent = "    " if ":" in phase else "  "
+        label = phase.split(":", 1)[-1]
+        print(f"{indent}{label:{24 - len(indent)}s}" + "".join(f"{m:9.1f}ms" for m in medians)
+              + f" {flag}{exponent}")
+    print()
+
+
+def load_record(path: str) -> Dict:
+    """Load a recorded run: a JSON object, or the last line of a JSONL history.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file holds no recorded run.
+    """
+    text = Path(path).read_text(encoding="utf-8").strip()
+    if not text:
+        raise ValueError(f"No recorded run in {path}")
+    try:
+        record = json.loads(text)
+    except json.JSONDecodeError:
+        record = json.loads(text.splitlines()[-1])
+    if not isinstance(record, dict) or "phases" not in record:
+        raise ValueError(f"No recorded run in {path}")
+    return record
+
+
+def append_record(record: Dict, path: Path = DEFAULT_RESULTS_FILE) -> None:
+    """Append ``record`` as one line of the JSONL history."""
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, sort_keys=True) + "\n")
+
+
+def save_record(record: Dict, path: str) -> None:
+    """Write ``record`` on its own, e.g. to serve as a ``--compare`` baseline."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(record, f, indent=1, sort_keys=True)
+        f.write("\n")
+
+
+def print_phases(record: Dict) -> None:
+    """Print the per-phase summary of a run."""
+    print("=" * 70)
     print("BENCHMARK SUMMARY")
-    print(f"{'='*70}")
-    
-    total_time = sum(results.values())
-    
-    for name, time_val in results.items():
-        percentage = (time_val / total_time * 100) if total_time > 0 else 0
-        print(f"  {name:30s}: {time_val:6.3f}s ({percentage:5.1f}%)")
-    
-    print(f"  {'-'*42}")
-    print(f"  {'Total Time':30s}: {total_time:6.3f}s")
+    print("=" * 70)
+    print(f"  {'phase':28s} {'median':>9s} {'p95':>9s} {'stddev':>9s}")
+    for phase, summary in record["phases"].items():
+        indent = "    " if ":" in phase else "  "
+        label = phase.split(":", 1)[-1]
+        print(f"{indent}{label:{30 - len(indent)}s} {summary['median_ms']:7.2f}ms {summary['p95_ms']:7.2f}ms "
+              f"{summary['stdev_ms']:7.2f}ms")
     print()
-    
-    # Performance ratings
-    if total_time < 0.1:
-        rating = "⚡ EXCELLENT - Lightning fast!"
-    elif total_time < 0.5:
-        rating = "✅ GOOD - Fast validation"
-    elif total_time < 2.0:
-        rating = "👍 ACCEPTABLE - Reasonable performance"
-    else:
-        rating = "⚠️  SLOW - Consider optimization"
-    
-    print(f"Performance Rating: {rating}")
+
+
+def compare_records(current: Dict, baseline: Dict, threshold: float,
+                    min_delta_ms: float) -> List[str]:
+    """Compare the phase medians of two runs and print the differences.
+
+    A phase regresses when its median exceeds the baseline's by more than
+    ``threshold`` percent and by more than ``min_delta_ms`` (so timer noise on
+    sub-millisecond phases is not reported).
+
+    Returns:
+        Names of the regressed phases
+    """
+    regressions: List[str] = []
+
+    print("=" * 70)
+    print("COMPARISON WITH BASELINE")
+    print("=" * 70)
+    base_git = baseline.get("git", {})
+    print(f"Baseline: {baseline.get('timestamp', '?')} ({(base_git.get('sha') or 'unknown')[:12]})")
+    if baseline.get("machine") != current["machine"]:
+        print("⚠️  Baseline was recorded on a different machine or Python; timings may not be comparable")
+    if baseline.get("config", {}).get("checks") != current["config"]["checks"]:
+        print("⚠️  Baseline ran a different set of checks")
+    print()
+
+    for phase, summary in current["phases"].items():
+        base = baseline["phases"].get(phase)
+        if base is None:
+            continue
+        now_ms, base_ms = summary["median_ms"], base["median_ms"]
+        delta_ms = now_ms - base_ms
+        change = (delta_ms / base_ms * 100) if base_ms > 0 else 0.0
+        regressed = delta_ms > min_delta_ms and now_ms > base_ms * (1 + threshold / 100)
+        if regressed:
+            regressions.append(phase)
+        icon = "❌" if regressed else "✅"
+        print(f"{icon} {phase:28s} {base_ms:8.2f}ms → {now_ms:8.2f}ms ({change:+6.1f}%)")
     print()
 
-def main():
+    return regressions
+
+
+def main() -> None:
     if len(sys.argv) < 2:
         print(__doc__)
         sys.exit(1)
-    
-    mod_directory = sys.argv[1]
-    
-    if not os.path.exists(mod_directory):
-        print(f"❌ Error: Path does not exist: {mod_directory}")
+
+    parser = argparse.ArgumentParser(description="BG3 Validation Performance Benchmark")
+    parser.add_argument("target", help="Path to mod directory to benchmark")
+    parser.add_argument("--only", nargs="+", choices=list(CHECKS), default=[],
+                        help="Benchmark only these checks.")
+    parser.add_argument("--skip", nargs="+", choices=list(CHECKS), default=[],
+                        help="Do not run these checks.")
+    parser.add_argument(
+        "--include",
+        nargs="*",
+        default=[d for d in DEFAULT_INCLUDE_DIRS if os.path.isdir(d)],
+        help=(
+            "Additional directories to pull definitions and `using` parents from. "
+            "Defaults to the bundled reference dumps; pass --include with no directories to disable."
+        ),
+    )
+    parser.add_argument("--warmup", type=int, default=2,
+                        help="Untimed iterations run first (default: 2).")
+    parser.add_argument("--repeat", type=int, default=10,
+                        help="Timed iterations (default: 10).")
+    parser.add_argument("--output", metavar="FILE",
+                        help="Also write this run as a standalone JSON file, e.g. a baseline.")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="Fail if a phase regressed against this recorded run (JSON or JSONL).")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="Allowed median slowdown per phase, in percent (default: 10).")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0,
+                        help="Ignore slowdowns smaller than this many milliseconds (default: 1.0).")
+    parser.add_argument("--scales", nargs="+", type=int, metavar="N",
+                        help="Benchmark synthetic corpora of these sizes (multiples of the mod) instead.")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED,
+                        help=f"Seed for the synthetic corpora (default: {DEFAULT_SEED}).")
+    args = parser.parse_args()
+
+    target = args.target
+
+    if not os.path.isdir(target):
+        print(f"❌ Error: Path must be a directory: {target}")
+        sys.exit(1)
+
+    if args.repeat < 1 or args.warmup < 0:
+        print("❌ Error: --repeat must be at least 1 and --warmup at least 0")
+        sys.exit(1)
+
+    if args.scales and (args.compare or args.output):
+        print("❌ Error: --compare and --output take a single run; use them without --scales")
+        sys.exit(1)
+
+    if args.scales and min(args.scales) < 1:
+        print("❌ Error: --scales must be at least 1")
+        sys.exit(1)
+
+    names = select_checks(args.only, args.skip)
+    if not names:
+        print("❌ Error: --only/--skip left no checks to run")
         sys.exit(1)
-    
-    print("="*70)
-    print("BG3 Validation Performance Benchmark Suite")
-    print("="*70)
-    print(f"Target: {mod_directory}")
+
+    baseline = None
+    if args.compare:
+        try:
+            baseline = load_record(args.compare)
+        except (OSError, ValueError) as e:
+            print(f"❌ Error: Cannot load baseline: {e}")
+            sys.exit(1)
+
+    print("=" * 70)
+    print("BG3 Validation Performance Benchmark")
+    print("=" * 70)
+    print(f"Target: {target}")
+    print(f"Checks: {', '.join(names)}")
+    for extra in args.include:
+        print(f"➕ Including definitions from: {extra}")
+    print(f"Iterations: {args.warmup} warmup + {args.repeat} timed")
+    if args.scales:
+        print(f"Scales: {', '.join(f'{s}×' for s in args.scales)} (seed {args.seed})")
     print()
-    
-    results = run_benchmarks(mod_directory)
-    print_summary(results)
-    
-    # Save results to file for tracking
-    results_file = Path(__file__).parent / "benchmark_results.txt"
-    with open(results_file, 'a') as f:
-        import datetime
-        timestamp = datetime.datetime.now().isoformat()
-        f.write(f"\n{timestamp}\n")
-        for name, time_val in results.items():
-            f.write(f"  {name}: {time_val:.3f}s\n")
-        f.write(f"  Total: {sum(results.values()):.3f}s\n")
-    
-    print(f"📊 Results appended to: {results_file}")
+
+    if args.scales:
+        records = run_scaling(target, args.include, names, args.warmup, args.repeat, args.scales, args.seed)
+        print_scaling(records)
+        for record in records:
+            append_record(record)
+        print(f"📊 {len(records)} run(s) appended to: {DEFAULT_RESULTS_FILE}")
+        return
+
+    record = run_benchmark(target, args.include, names, args.warmup, args.repeat)
+    print_phases(record)
+
+    append_record(record)
+    print(f"📊 Run appended to: {DEFAULT_RESULTS_FILE}")
+    if args.output:
+        save_record(record, args.output)
+        print(f"📊 Run written to: {args.output}")
+    print()
+
+    if baseline is not None:
+        regressions = compare_records(record, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"❌ Performance regression in: {', '.join(regressions)}")
+            sys.exit(1)
+        print(f"✅ No phase regressed by more than {args.threshold:g}%")
+
 
 if __name__ == "__main__":
     main()
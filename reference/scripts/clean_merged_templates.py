@@ -2,13 +2,16 @@
 Clean _merged.lsf.lsx by removing character templates.
 
 This script removes all character templates (Type="character") from the merged
-root templates file, keeping only items, projectiles, and objects.
+root templates file, keeping only items, projectiles, and objects. The file is
+streamed (see root_templates.py), so even full merged dumps of several hundred
+megabytes are cleaned in bounded memory.
 """
 
-import xml.etree.ElementTree as ET
 import sys
 from pathlib import Path
 
+from root_templates import iter_game_objects, rewrite_game_objects
+
 def clean_merged_file(input_file, output_file=None, dry_run=False):
     """Remove all character templates from merged.lsf.lsx file."""
     
@@ -17,49 +20,26 @@ def clean_merged_file(input_file, output_file=None, dry_run=False):
     
     print(f"Reading: {input_file}")
     
-    # Parse XML
-    tree = ET.parse(input_file)
-    root = tree.getroot()
+    character_names = []
     
-    # Find the Templates region
-    templates_region = root.find(".//region[@id='Templates']")
-    if templates_region is None:
-        print("ERROR: Could not find Templates region")
-        return False
+    def keep(record):
+        if record.type == 'character':
+            # Keep the name for reporting
+            character_names.append(record.name or "Unknown")
+            return False
+        return True
     
-    templates_node = templates_region.find(".//node[@id='Templates']")
-    if templates_node is None:
-        print("ERROR: Could not find Templates node")
-        return False
+    # Stream the templates, rewriting the file unless this is a dry run
+    if dry_run:
+        kept_count = sum(1 for record in iter_game_objects(input_file) if keep(record))
+        removed_count = len(character_names)
+    else:
+        kept_count, removed_count = rewrite_game_objects(input_file, output_file, keep)
     
-    children = templates_node.find("children")
-    if children is None:
-        print("ERROR: Could not find children node")
+    if kept_count + removed_count == 0:
+        print("ERROR: Could not find any GameObjects templates")
         return False
     
-    # Find and remove character templates
-    removed_count = 0
-    kept_count = 0
-    character_names = []
-    
-    game_objects = list(children.findall("node[@id='GameObjects']"))
-    
-    for obj in game_objects:
-        # Find Type attribute
-        type_attr = obj.find("./attribute[@id='Type']")
-        
-        if type_attr is not None and type_attr.get('value') == 'character':
-            # Get name for reporting
-            name_attr = obj.find("./attribute[@id='Name']")
-            name = name_attr.get('value') if name_attr is not None else "Unknown"
-            character_names.append(name)
-            
-            if not dry_run:
-                children.remove(obj)
-            removed_count += 1
-        else:
-            kept_count += 1
-    
     # Report findings
     print(f"\n{'DRY RUN - ' if dry_run else ''}Results:")
     print(f"  Templates kept: {kept_count}")
@@ -70,10 +50,9 @@ def clean_merged_file(input_file, output_file=None, dry_run=False):
         for name in sorted(character_names):
             print(f"  - {name}")
     
-    # Save if not dry run
+    # Report where the file went
     if not dry_run:
-        print(f"\nSaving cleaned file to: {output_file}")
-        tree.write(output_file, encoding='utf-8', xml_declaration=True)
+        print(f"\nSaved cleaned file to: {output_file}")
         print("✓ File saved successfully")
     else:
         print("\n(Dry run - no changes made)")
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Eldertide Unified Validator (eldertide-validate)
+
+Runs every validation check against a mod in a single process. The mod's
+stats files and the included reference dumps are parsed once into a shared
+model (parsed files, inheritance resolver, symbol indexes) that all checks
+read from, and the findings are printed as one merged report.
+
+With ``--watch`` the model stays resident after the first run: the mod is
+watched (inotify, or polling where unavailable) and each burst of saves only
+re-runs the checks reading the touched kinds of files. Unchanged files are
+served from the validation cache and the incremental reference store, so
+only what was edited is reparsed.
+
+Usage:
+    python3 eldertide_validate.py <path_to_mod_directory> [--only CHECK ...] [--skip CHECK ...]
+                                  [--include DIR ...] [--watch [--poll]]
+                                  [--profile] [--profile-mode summary|cprofile|chrome] [--profile-output FILE]
+
+Example:
+    python3 eldertide_validate.py Public/EldertideArmament/
+    python3 eldertide_validate.py Public/EldertideArmament/ --only spells items functors
+    python3 eldertide_validate.py Public/EldertideArmament/ --skip references
+    python3 eldertide_validate.py Public/EldertideArmament/ --include reference/vanilla_data
+    python3 eldertide_validate.py Public/EldertideArmament/ --watch
+    python3 eldertide_validate.py Public/EldertideArmament/ --profile
+    python3 eldertide_validate.py Public/EldertideArmament/ --profile-mode chrome --profile-output trace.json
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from file_watcher import FileWatcher
+from loca_index import LocaIndex, open_loca_index
+from stats_parser import find_stats_files, load_stats_file
+from stats_resolver import StatsResolver, build_resolver
+from symbol_index import SymbolIndex, open_symbol_index
+import profiling
+import validate_combos
+import validate_effects
+import validate_equipment
+import validate_functors
+import validate_icons
+import validate_items
+import validate_localization
+import validate_references
+import validate_spells
+import validate_templates
+import validate_treasure
+
+
+class ValidationContext:
+    """The shared in-memory model every check of one run reads from.
+
+    The resolver and symbol indexes are built on first use, so a run limited
+    with ``--only`` only pays for what its checks need. With ``incremental``
+    the reference check reuses the store kept by the previous run.
+    """
+
+    def __init__(self, mod_dir: str, include_dirs: Sequence[str] = (), incremental: bool = False):
+        self.mod_dir = Path(mod_dir)
+        self.include_dirs = [d for d in include_dirs if os.path.isdir(d)]
+        self.incremental = incremental
+        data_dir = self.mod_dir / "Stats" / "Generated" / "Data"
+        self.data_dir = data_dir if data_dir.is_dir() else self.mod_dir
+        self._resolver: Optional[StatsResolver] = None
+        self._indexes: Optional[List[SymbolIndex]] = None
+        self._loca: Optional[LocaIndex] = None
+
+    @property
+    def resolver(self) -> StatsResolver:
+        """Inheritance graph over the included dumps and the whole mod."""
+        if self._resolver is None:
+            self._resolver = build_resolver(self.mod_dir, self.include_dirs)
+        return self._resolver
+
+    @property
+    def indexes(self) -> List[SymbolIndex]:
+        """Symbol indexes of the included dumps, in load order."""
+        if self._indexes is None:
+            self._indexes = [open_symbol_index(d) for d in self.include_dirs]
+        return self._indexes
+
+    @property
+    def loca(self) -> LocaIndex:
+        """Localization handles of the included dumps and the mod."""
+        if self._loca is None:
+            self._loca = open_loca_index(validate_localization.localization_files(self.mod_dir, self.include_dirs))
+        return self._loca
+
+    @property
+    def watch_roots(self) -> List[Path]:
+        """Directories whose files feed the checks."""
+        return ([self.mod_dir] + validate_localization.mod_localization_dirs(self.mod_dir)
+                + [root for root in validate_icons.dds_dirs(self.mod_dir) if root != self.mod_dir])
+
+    def refresh(self, changed: Iterable[str]) -> None:
+        """Forget derived state built from files that changed on disk.
+
+        Parsed files are revalidated by stat on their next load, so only the
+        resolver (which flattens entries across files) and the handle table
+        have to be rebuilt.
+        """
+        changed = list(changed)
+        if any(path.endswith(".txt") for path in changed):
+            self._resolver = None
+        if any(path.endswith(".loca.xml") for path in changed):
+            self._loca = None
+
+    def mod_entry_names(self) -> Set[str]:
+        """Names of every ``new entry`` defined by the mod itself."""
+        names: Set[str] = set()
+        for file_path in find_stats_files(self.mod_dir):
+            try:
+                stats = load_stats_file(file_path)
+            except (OSError, UnicodeDecodeError):
+                continue
+            names.update(stats.by_name)
+        return names
+
+    def close(self) -> None:
+        for index in self._indexes or ():
+            index.close()
+
+
+def check_spells(ctx: ValidationContext) -> List:
+    errors = []
+    cache = validate_spells.create_cache()
+    for spell_file in validate_spells.find_spell_files(str(ctx.data_dir)):
+        _, file_errors = validate_spells.validate_spell_file(str(spell_file), cache, ctx.resolver)
+        errors.extend(file_errors)
+    return errors
+
+
+def check_items(ctx: ValidationContext) -> List:
+    errors = []
+    cache = validate_items.create_cache()
+    for item_file in validate_items.find_item_files(str(ctx.data_dir)):
+        _, file_errors = validate_items.validate_item_file(str(item_file), cache, ctx.resolver)
+        errors.extend(file_errors)
+    return errors
+
+
+def check_functors(ctx: ValidationContext) -> List:
+    return validate_functors.validate_functors(ctx.mod_dir)
+
+
+def check_templates(ctx: ValidationContext) -> List:
+    return validate_templates.validate_templates(ctx.mod_dir, ctx.resolver, ctx.indexes)
+
+
+def check_treasure(ctx: ValidationContext) -> List:
+    return validate_treasure.validate_treasure(ctx.mod_dir, ctx.include_dirs, ctx.indexes)
+
+
+def check_combos(ctx: ValidationContext) -> List:
+    return validate_combos.validate_combos(ctx.mod_dir, ctx.resolver, ctx.include_dirs)
+
+
+def check_equipment(ctx: ValidationContext) -> List:
+    return validate_equipment.validate_equipment(ctx.mod_dir, ctx.indexes)
+
+
+def check_effects(ctx: ValidationContext) -> List:
+    baseline = validate_effects.DEFAULT_BASELINE
+    known = validate_effects.load_baseline(baseline) if baseline.is_file() else set()
+    return validate_effects.validate_effects(ctx.mod_dir, ctx.include_dirs, ctx.indexes, known)
+
+
+def check_icons(ctx: ValidationContext) -> List:
+    return validate_icons.validate_icons(ctx.mod_dir, ctx.indexes)
+
+
+def check_localization(ctx: ValidationContext) -> List:
+    return (validate_localization.validate_localization(ctx.mod_dir, ctx.loca, ctx.indexes)
+            + validate_localization.validate_description_params(ctx.mod_dir, ctx.loca, ctx.resolver))
+
+
+def check_references(ctx: ValidationContext) -> List:
+    if ctx.incremental:
+        errors, _ = validate_references.revalidate_references(str(ctx.mod_dir), ctx.indexes)
+        return errors
+
+    parsed_data = validate_references.parse_directory_single_pass(str(ctx.mod_dir), verbose=False)
+    for index in ctx.indexes:
+        validate_references.merge_index_definitions(parsed_data, index)
+
+    errors = []
+    errors.extend(validate_references.validate_spell_references(parsed_data))
+    errors.extend(validate_references.validate_passive_references(parsed_data))
+    errors.extend(validate_references.validate_status_references(parsed_data))
+    errors.extend(validate_references.validate_inheritance(ctx.resolver, ctx.mod_entry_names()))
+    errors.extend(validate_references.validate_uuid_uniqueness(parsed_data))
+    return errors
+
+
+# Registered checks in run order:
+# name -> (report title, check function, suffixes of the files it reads)
+CHECKS: Dict[str, Tuple[str, Callable[[ValidationContext], List], Tuple[str, ...]]] = {
+    "spells": ("Spell Definitions", check_spells, (".txt",)),
+    "items": ("Item Definitions", check_items, (".txt",)),
+    "functors": ("Boosts & Functors", check_functors, (".txt",)),
+    "templates": ("Root Templates", check_templates, (".txt", ".lsx")),
+    "treasure": ("Treasure Tables", check_treasure, (".txt",)),
+    "combos": ("Item Combinations", check_combos, (".txt",)),
+    "equipment": ("Equipment & Spell Sets", check_equipment, (".txt",)),
+    "effects": ("MultiEffectInfos", check_effects, (".txt", ".lsx")),
+    "icons": ("Icons", check_icons, (".txt", ".lsx", ".dds", ".DDS")),
+    "localization": ("Localization", check_localization, (".txt", ".lsx", ".xml")),
+    "references": ("Cross-References", check_references, (".txt",)),
+}
+
+
+def severity_of(diagnostic) -> str:
+    """Return "error" or "warning"; diagnostics without a severity are errors."""
+    return getattr(diagnostic, "severity", "error")
+
+
+def select_checks(only: Sequence[str] = (), skip: Sequence[str] = ()) -> List[str]:
+    """Apply ``--only``/``--skip`` to the registered checks, keeping run order."""
+    selected = [name for name in CHECKS if not only or name in only]
+    return [name for name in selected if name not in skip]
+
+
+def run_checks(ctx: ValidationContext, names: Sequence[str]) -> Dict[str, Tuple[List, float]]:
+    """Run the named checks against ``ctx``.
+
+    Returns:
+        Mapping of check name to (diagnostics, seconds), in run order
+    """
+    results: Dict[str, Tuple[List, float]] = {}
+    for name in names:
+        title, check, _ = CHECKS[name]
+        print(f"🔍 Running {title}...")
+        start = time.perf_counter()
+        with profiling.span(f"check:{name}"):
+            diagnostics = check(ctx)
+        results[name] = (diagnostics, time.perf_counter() - start)
+        profiling.count(f"diagnostics.{name}", len(diagnostics))
+    print()
+    return results
+
+
+@profiling.phase("report")
+def print_report(results: Dict[str, Tuple[List, float]]) -> Tuple[int, int]:
+    """Print the merged report.
+
+    Returns:
+        Tuple of (total_errors, total_warnings)
+    """
+    totals: Dict[str, int] = defaultdict(int)
+
+    for name, (diagnostics, _) in results.items():
+        if not diagnostics:
+            continue
+        title = CHECKS[name][0]
+        print("=" * 70)
+        print(f"{title.upper()}")
+        print("=" * 70)
+        print()
+        for diagnostic in diagnostics:
+            print(diagnostic)
+
+    print("=" * 70)
+    print("VALIDATION SUMMARY")
+    print("=" * 70)
+    for name, (diagnostics, seconds) in results.items():
+        errors = sum(1 for d in diagnostics if severity_of(d) == "error")
+        warnings = len(diagnostics) - errors
+        totals["errors"] += errors
+        totals["warnings"] += warnings
+        icon = "❌" if errors else "⚠️ " if warnings else "✅"
+        print(f"{icon} {CHECKS[name][0]:24s} {errors:4d} error(s) {warnings:4d} warning(s)  ({seconds:.3f}s)")
+    print()
+    print(f"   Total errors: {totals['errors']}")
+    print(f"   Total warnings: {totals['warnings']}")
+    print()
+
+    return totals["errors"], totals["warnings"]
+
+
+def watch(ctx: ValidationContext, names: Sequence[str], poll: bool = False) -> None:
+    """Re-run the checks affected by each debounced batch of saved files."""
+    suffixes = sorted({suffix for name in names for suffix in CHECKS[name][2]})
+    with FileWatcher([str(root) for root in ctx.watch_roots], suffixes, force_polling=poll) as watcher:
+        print(f"👀 Watching {', '.join(str(r) for r in watcher.roots)} ({watcher.backend}); Ctrl+C to stop")
+        print()
+        for changed in watcher.changes():
+            affected = [name for name in names
+                        if any(path.endswith(CHECKS[name][2]) for path in changed)]
+            if not affected:
+                continue
+
+            start = time.perf_counter()
+            for path in sorted(changed):
+                print(f"🔄 Changed: {os.path.relpath(path, ctx.mod_dir)}")
+            ctx.refresh(changed)
+            results = run_checks(ctx, affected)
+            print_report(results)
+            print(f"⏱️  Revalidated in {time.perf_counter() - start:.3f}s")
+            print()
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    parser = argparse.ArgumentParser(description="Eldertide Unified Validator")
+    parser.add_argument("target", help="Path to mod directory to validate")
+    parser.add_argument("--only", nargs="+", choices=list(CHECKS), default=[],
+                        help="Run only these checks.")
+    parser.add_argument("--skip", nargs="+", choices=list(CHECKS), default=[],
+                        help="Do not run these checks.")
+    parser.add_argument(
+        "--include",
+        nargs="*",
+        default=[d for d in validate_references.DEFAULT_INCLUDE_DIRS if os.path.isdir(d)],
+        help=(
+            "Additional directories to pull definitions and `using` parents from. "
+            "Defaults to the bundled reference dumps; pass --include with no directories to disable."
+        ),
+    )
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and revalidate whenever watched files are saved.")
+    parser.add_argument("--poll", action="store_true",
+                        help="With --watch, poll for changes instead of using inotify.")
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.start_from_args(args)
+
+    target = args.target
+
+    if not os.path.exists(target):
+        print(f"❌ Error: Path does not exist: {target}")
+        sys.exit(1)
+
+    if not os.path.isdir(target):
+        print(f"❌ Error: Path must be a directory: {target}")
+        sys.exit(1)
+
+    names = select_checks(args.only, args.skip)
+    if not names:
+        print("❌ Error: --only/--skip left no checks to run")
+        sys.exit(1)
+
+    print("=" * 70)
+    print("Eldertide Unified Validator")
+    print("=" * 70)
+    print(f"Checks: {', '.join(names)}")
+    for extra in args.include:
+        print(f"➕ Including definitions from: {extra}")
+    print()
+
+    start = time.perf_counter()
+    ctx = ValidationContext(target, args.include, incremental=args.watch)
+    try:
+        results = run_checks(ctx, names)
+        errors, warnings = print_report(results)
+        print(f"⏱️  Total time: {time.perf_counter() - start:.3f}s")
+        print()
+
+        if args.watch:
+            try:
+                watch(ctx, names, args.poll)
+            except KeyboardInterrupt:
+                print("\n👋 Stopped watching")
+                sys.exit(0)
+    finally:
+        ctx.close()
+
+    if errors:
+        print("❌ Validation FAILED (errors found)")
+        sys.exit(1)
+    elif warnings:
+        print("⚠️  Validation PASSED with warnings")
+        sys.exit(0)
+    else:
+        print("✅ Validation PASSED")
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
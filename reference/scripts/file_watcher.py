@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+File Watcher for Validation Watch Mode
+
+Reports batches of changed files under one or more directory trees. On Linux
+the kernel's inotify interface is used directly (through ctypes, no extra
+packages), so a save is noticed immediately; elsewhere, or if inotify is not
+available, the trees are polled by stat. Bursts of events (editors writing a
+temporary file, renaming it, touching metadata) are debounced into a single
+batch.
+
+Usage:
+    from file_watcher import FileWatcher
+
+    with FileWatcher(["Public/EldertideArmament"], suffixes=(".txt", ".lsx")) as watcher:
+        for changed in watcher.changes():
+            print(sorted(changed))
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+# inotify event masks (see inotify(7))
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+
+_WATCH_MASK = (_IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO
+               | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF)
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_inotify():
+    """Return libc with the inotify functions, or None if unavailable."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class FileWatcher:
+    """Watch directory trees for changes to files with the given suffixes."""
+
+    def __init__(self, roots: Sequence[str], suffixes: Sequence[str] = (".txt",),
+                 debounce: float = 0.05, poll_interval: float = 0.25, force_polling: bool = False):
+        """
+        Args:
+            roots: Directories to watch recursively (missing ones are skipped)
+            suffixes: Only report files whose name ends with one of these
+            debounce: Quiet period (seconds) that ends a batch of events
+            poll_interval: Seconds between scans when polling
+            force_polling: Use the stat-polling backend even if inotify works
+        """
+        self.roots = [Path(r).resolve() for r in roots if os.path.isdir(r)]
+        self.suffixes = tuple(suffixes)
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._fd = -1
+        self._watches: Dict[int, Path] = {}
+        self._snapshot: Dict[str, Tuple[int, int]] = {}
+
+        libc = None if force_polling else _load_inotify()
+        if libc is not None:
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd >= 0:
+                self._libc = libc
+                self._fd = fd
+                for root in self.roots:
+                    self._watch_tree(root)
+
+        if self._fd < 0:
+            self._snapshot = self._scan()
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._fd >= 0 else "polling"
+
+    def __enter__(self) -> "FileWatcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _wanted(self, name: str) -> bool:
+        return name.endswith(self.suffixes)
+
+    def _watch_tree(self, directory: Path) -> None:
+        for dirpath, dirnames, _ in os.walk(directory):
+            # Skip hidden directories (caches, VCS metadata)
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dirpath), _WATCH_MASK)
+            if wd >= 0:
+                self._watches[wd] = Path(dirpath)
+
+    def _read_inotify(self, timeout: Optional[float]) -> Set[str]:
+        """Wait up to ``timeout`` seconds for events and return changed paths."""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        changed: Set[str] = set()
+        try:
+            buffer = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset < len(buffer):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+            offset += _EVENT_HEADER.size
+            name = buffer[offset:offset + length].rstrip(b"\0").decode("utf-8", "replace")
+            offset += length
+
+            if mask & _IN_Q_OVERFLOW:
+                # Events were dropped; report everything we watch
+                changed.update(self._scan())
+                continue
+            if mask & _IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+
+            directory = self._watches.get(wd)
+            if directory is None or not name:
+                continue
+            path = directory / name
+            if mask & _IN_ISDIR:
+                if mask & (_IN_CREATE | _IN_MOVED_TO) and not name.startswith("."):
+                    self._watch_tree(path)
+                    changed.update(self._scan_tree(path))
+                continue
+            if self._wanted(name):
+                changed.add(str(path))
+        return changed
+
+    def _scan_tree(self, root: Path) -> Dict[str, Tuple[int, int]]:
+        snapshot: Dict[str, Tuple[int, int]] = {}
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            for filename in filenames:
+                if not self._wanted(filename):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot: Dict[str, Tuple[int, int]] = {}
+        for root in self.roots:
+            snapshot.update(self._scan_tree(root))
+        return snapshot
+
+    def _poll(self, timeout: Optional[float]) -> Set[str]:
+        """Sleep up to ``timeout`` seconds (one poll interval at most) and diff a new scan."""
+        time.sleep(self.poll_interval if timeout is None else min(timeout, self.poll_interval))
+        snapshot = self._scan()
+        previous = self._snapshot
+        self._snapshot = snapshot
+        changed = {path for path, stat in snapshot.items() if previous.get(path) != stat}
+        changed.update(path for path in previous if path not in snapshot)
+        return changed
+
+    def poll(self, timeout: Optional[float] = None) -> Set[str]:
+        """Return the next debounced batch of changed paths (empty on timeout).
+
+        Args:
+            timeout: Seconds to wait for the first change; None waits forever
+        """
+        read = self._read_inotify if self._fd >= 0 else self._poll
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        changed: Set[str] = set()
+        while not changed:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return changed
+            changed = read(remaining)
+
+        # Keep collecting until the tree has been quiet for one debounce period
+        while True:
+            more = read(self.debounce)
+            if not more:
+                return changed
+            changed |= more
+
+    def changes(self) -> Iterator[Set[str]]:
+        """Yield debounced batches of changed paths forever."""
+        while True:
+            yield self.poll()
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    roots: List[str] = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    with FileWatcher(roots, (".txt", ".lsx", ".xml"), force_polling="--poll" in sys.argv) as watcher:
+        print(f"👀 Watching {len(watcher.roots)} director(ies) with {watcher.backend}; Ctrl+C to stop")
+        try:
+            for changed in watcher.changes():
+                for path in sorted(changed):
+                    print(f"   changed: {path}")
+        except KeyboardInterrupt:
+            print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,676 @@
+#!/usr/bin/env python3
+"""
+Parser for BG3 Functor, Boost and Condition Strings
+
+Stats properties such as ``Boosts``, ``SpellProperties``, ``StatsFunctors``
+and ``TargetConditions`` hold small expressions rather than plain values::
+
+    TARGET:IF(not Tagged('TORCH')):DealDamage(1d4,Fire,Magical);ApplyStatus(SELF,BURNING,100,2)
+    Character() and not Dead() and HasStatus('MAG_FROST', context.Target)
+
+This module tokenizes and parses them into a typed AST of NamedTuples, so
+validators can read arguments by position instead of matching them with
+regular expressions.
+
+Two grammars are accepted:
+
+* Functor lists (``parse_functors``): ``;``-separated items, each with
+  optional target prefixes (``TARGET:``, ``GROUND:``), an optional
+  ``IF(condition):`` guard and an expression, usually a call. Multi-cast
+  groups such as ``Cast2[...]`` hold nested lists. Boosts, spell
+  properties, status functors, spell rolls and description parameters all
+  use this form.
+* Conditions (``parse_condition``): one Lua-like boolean expression with
+  ``and``/``or``/``not``, comparisons, arithmetic, calls, ``context.Target``
+  style names and ``{...}`` tables. Alternatives separated by ``;`` (one per
+  multi-target pick) parse as a ``;`` BinaryOp, as do flag lists inside
+  arguments such as ``BlockRegainHP(Undead;Construct)``.
+
+The same strings repeat thousands of times across the mod and the reference
+dumps, so parsed results (and parse errors) are interned in an LRU cache
+keyed by the raw string: a full pass costs one parse per unique string.
+
+Usage:
+    python3 functor_parser.py <expression> [--condition]
+    python3 functor_parser.py --scan <directory> ...
+
+Example:
+    python3 functor_parser.py "IF(not Tagged('TORCH')):DealDamage(1d4,Fire,Magical)"
+    python3 functor_parser.py "Character() and not Dead()" --condition
+    python3 functor_parser.py --scan Public/EldertideArmament reference/vanilla_data
+"""
+
+import argparse
+import re
+import sys
+import time
+from collections import Counter
+from functools import lru_cache
+from typing import Iterator, List, NamedTuple, Optional, Tuple, Union
+
+import profiling
+
+# Unique strings kept per grammar; well above the ~6,000 distinct expressions
+# of the mod and the bundled dumps combined
+AST_CACHE_SIZE = 65536
+
+# Properties holding one condition expression
+CONDITION_KEYS = frozenset({
+    "Conditions", "TargetConditions", "RequirementConditions", "RemoveConditions",
+    "CycleConditions", "BoostConditions", "AoEConditions", "UseConditions",
+    "ThrowableTargetConditions", "OriginTargetConditions", "EnableCondition",
+    "EnabledConditions", "OnApplyConditions", "ForkingConditions",
+})
+
+# Properties holding a functor list (functors, boosts, rolls, description parameters)
+FUNCTOR_KEYS = frozenset({
+    "Boosts", "DefaultBoosts", "BoostsOnEquipMainHand", "BoostsOnEquipOffHand",
+    "SpellProperties", "SpellSuccess", "SpellFail", "SpellRoll", "OriginSpellProperties",
+    "ThrowableSpellProperties", "ThrowableSpellSuccess", "ThrowableSpellFail", "ThrowableSpellRoll",
+    "StatsFunctors", "OnApplyFunctors", "OnRemoveFunctors", "TickFunctors", "OnTickFunctors",
+    "OnApplyRoll", "OnApplySuccess", "OnApplyFail", "OnTickRoll", "OnTickSuccess", "OnTickFail",
+    "OnRollsFailed", "OnSuccess", "Properties", "Success", "Failure",
+    "ToggleOnFunctors", "ToggleOffFunctors", "WeaponFunctors", "AuraStatuses",
+    "TooltipDamage", "TooltipDamageList", "TooltipConditionalDamage", "TooltipStatusApply",
+    "DamageStats", "DescriptionParams", "ExtraDescriptionParams", "TooltipUpcastDescriptionParams",
+})
+
+_TOKEN_PATTERN = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<guid>[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b)
+  | (?P<dice>\d+d\d+\b)
+  | (?P<number>\d+(?:\.\d+)?%?|\.\d+%?)
+  | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<string>'[^']*'|"[^"]*")
+  | (?P<op>==|~=|!=|<=|>=|[-+*/<>()\[\]{},;:.])
+""", re.VERBOSE)
+
+_COMPARISON_OPS = frozenset({"==", "~=", "!=", "<", ">", "<=", ">="})
+
+
+# ============================================================================
+# AST
+# ============================================================================
+
+class Number(NamedTuple):
+    """A numeric literal; ``100%`` is ``Number(100, percent=True)``."""
+    value: Union[int, float]
+    percent: bool = False
+
+
+class Dice(NamedTuple):
+    """A dice roll such as ``2d6``."""
+    count: int
+    sides: int
+
+
+class String(NamedTuple):
+    """A quoted string, without its quotes."""
+    value: str
+
+
+class Guid(NamedTuple):
+    """A bare template/resource UUID."""
+    value: str
+
+
+class Name(NamedTuple):
+    """An identifier; member access is kept dotted (``context.Source``)."""
+    name: str
+
+
+class Empty(NamedTuple):
+    """An argument left out, as in ``UnlockSpell(X,,,,Charisma)``."""
+
+
+class Table(NamedTuple):
+    """A Lua table literal such as ``{'A','B'}``."""
+    items: Tuple["Expr", ...]
+
+
+class Call(NamedTuple):
+    """A function, functor or boost call."""
+    name: str
+    args: Tuple["Expr", ...]
+
+
+class UnaryOp(NamedTuple):
+    op: str
+    operand: "Expr"
+
+
+class BinaryOp(NamedTuple):
+    """A binary operation; ``op`` is ``and``, ``or``, ``;``, a comparison or arithmetic."""
+    op: str
+    left: "Expr"
+    right: "Expr"
+
+
+Expr = Union[Number, Dice, String, Guid, Name, Empty, Table, Call, UnaryOp, BinaryOp]
+
+
+class Functor(NamedTuple):
+    """One item of a functor list: ``TARGET:IF(cond):Call(...)``."""
+    targets: Tuple[str, ...]
+    condition: Optional[Expr]
+    expr: Expr
+
+
+class CastGroup(NamedTuple):
+    """A multi-cast group such as ``Cast2[...]`` or ``CastOffhand[...]``."""
+    name: str
+    items: Tuple["FunctorItem", ...]
+
+
+FunctorItem = Union[Functor, CastGroup]
+
+
+class ParseError(ValueError):
+    """Raised for a malformed expression; ``position`` is a character offset."""
+
+    def __init__(self, message: str, text: str, position: int):
+        super().__init__(f"{message} at column {position + 1}")
+        self.text = text
+        self.position = position
+
+
+# ============================================================================
+# Tokenizer
+# ============================================================================
+
+class Token(NamedTuple):
+    kind: str
+    text: str
+    position: int
+
+
+def tokenize(text: str) -> List[Token]:
+    """Split an expression into tokens, dropping whitespace.
+
+    Raises:
+        ParseError: On a character no token starts with
+    """
+    tokens: List[Token] = []
+    position = 0
+    end = len(text)
+    while position < end:
+        match = _TOKEN_PATTERN.match(text, position)
+        if match is None:
+            raise ParseError(f"Unexpected character {text[position]!r}", text, position)
+        kind = match.lastgroup
+        if kind != "space":
+            tokens.append(Token(kind, match.group(), position))
+        position = match.end()
+    tokens.append(Token("end", "", end))
+    return tokens
+
+
+# ============================================================================
+# Parser
+# ============================================================================
+
+class _Parser:
+    """Recursive-descent parser over one token list."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = tokenize(text)
+        # Pad with end tokens so one-token lookahead never runs off the list;
+        # operators and keywords are matched on token text alone (string,
+        # number and dice tokens can never equal one)
+        self.tokens.append(self.tokens[-1])
+        self.texts = [token.text for token in self.tokens]
+        self.index = 0
+
+    def peek(self, offset: int = 0) -> Token:
+        return self.tokens[self.index + offset]
+
+    def at(self, text: str, offset: int = 0) -> bool:
+        return self.texts[self.index + offset] == text
+
+    def at_end(self) -> bool:
+        return self.tokens[self.index].kind == "end"
+
+    def advance(self) -> Token:
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def expect(self, text: str) -> Token:
+        if not self.at(text):
+            self.error(f"Expected {text!r}")
+        return self.advance()
+
+    def error(self, message: str):
+        token = self.peek()
+        found = f"'{token.text}'" if token.text else "end of input"
+        raise ParseError(f"{message}, found {found}", self.text, token.position)
+
+    # Functor lists ----------------------------------------------------------
+
+    def functor_list(self, closing: str = "") -> Tuple[FunctorItem, ...]:
+        items: List[FunctorItem] = []
+        while True:
+            if self.at(";"):
+                self.advance()
+                continue
+            if self.at_end() or (closing and self.at(closing)):
+                return tuple(items)
+            items.append(self.functor_item())
+            if not (self.at(";") or self.at_end() or (closing and self.at(closing))):
+                self.error("Expected ';'")
+
+    def functor_item(self) -> FunctorItem:
+        if self.peek().kind == "name" and self.at("[", 1):
+            name = self.advance().text
+            self.advance()
+            items = self.functor_list("]")
+            self.expect("]")
+            return CastGroup(name, items)
+
+        targets: List[str] = []
+        condition: Optional[Expr] = None
+        while self.peek().kind == "name":
+            if self.at(":", 1):
+                targets.append(self.advance().text)
+                self.advance()
+            elif self.at("IF") and self.at("(", 1) and condition is None:
+                self.advance()
+                self.advance()
+                condition = self.expression()
+                self.expect(")")
+                self.expect(":")
+            else:
+                break
+        return Functor(tuple(targets), condition, self.expression())
+
+    # Expressions, lowest precedence first -----------------------------------
+
+    def sequence(self, closing: str = "") -> Expr:
+        """Expressions joined by ``;``, as in conditions and flag arguments."""
+        left = self.expression()
+        while self.at(";"):
+            self.advance()
+            if self.at_end() or (closing and self.at(closing)):
+                break
+            left = BinaryOp(";", left, self.expression())
+        return left
+
+    def expression(self) -> Expr:
+        left = self.conjunction()
+        while self.at("or"):
+            self.advance()
+            left = BinaryOp("or", left, self.conjunction())
+        return left
+
+    def conjunction(self) -> Expr:
+        left = self.negation()
+        while self.at("and"):
+            self.advance()
+            left = BinaryOp("and", left, self.negation())
+        return left
+
+    def negation(self) -> Expr:
+        if self.at("not"):
+            self.advance()
+            return UnaryOp("not", self.negation())
+        return self.comparison()
+
+    def comparison(self) -> Expr:
+        left = self.additive()
+        while self.texts[self.index] in _COMPARISON_OPS:
+            op = self.advance().text
+            left = BinaryOp(op, left, self.additive())
+        return left
+
+    def additive(self) -> Expr:
+        left = self.term()
+        while self.at("+") or self.at("-"):
+            op = self.advance().text
+            left = BinaryOp(op, left, self.term())
+        return left
+
+    def term(self) -> Expr:
+        left = self.unary()
+        while self.at("*") or self.at("/"):
+            op = self.advance().text
+            left = BinaryOp(op, left, self.unary())
+        return left
+
+    def unary(self) -> Expr:
+        if self.at("-") or self.at("+"):
+            op = self.advance().text
+            operand = self.unary()
+            if isinstance(operand, Number):
+                return Number(-operand.value if op == "-" else operand.value, operand.percent)
+            return UnaryOp(op, operand)
+        return self.primary()
+
+    def primary(self) -> Expr:
+        token = self.peek()
+        kind = token.kind
+        if kind == "number":
+            self.advance()
+            text = token.text.rstrip("%")
+            value = float(text) if "." in text else int(text)
+            return Number(value, token.text.endswith("%"))
+        if kind == "dice":
+            self.advance()
+            count, _, sides = token.text.partition("d")
+            return Dice(int(count), int(sides))
+        if kind == "string":
+            self.advance()
+            return String(token.text[1:-1])
+        if kind == "guid":
+            self.advance()
+            return Guid(token.text)
+        if kind == "name":
+            self.advance()
+            name = token.text
+            while self.at(".") and self.peek(1).kind == "name":
+                self.advance()
+                name = f"{name}.{self.advance().text}"
+            if self.at("("):
+                self.advance()
+                return Call(name, self.arguments(")"))
+            return Name(name)
+        if self.at("("):
+            self.advance()
+            inner = self.expression()
+            self.expect(")")
+            return inner
+        if self.at("{"):
+            self.advance()
+            return Table(self.arguments("}"))
+        self.error("Expected an expression")
+
+    def arguments(self, closing: str) -> Tuple[Expr, ...]:
+        """Comma-separated arguments up to ``closing``; omitted ones are Empty().
+
+        A guarded functor is accepted as an argument, as in
+        ``UseBoosts(IF(cond):Advantage(AttackRoll))``.
+        """
+        if self.at(closing):
+            self.advance()
+            return ()
+        args: List[Expr] = []
+        while True:
+            if self.at(",") or self.at(closing):
+                args.append(Empty())
+            elif self.at("IF") and self.at("(", 1):
+                args.append(self.functor_item())
+            else:
+                args.append(self.sequence(closing))
+            if self.at(","):
+                self.advance()
+                continue
+            self.expect(closing)
+            return tuple(args)
+
+    def finish(self) -> None:
+        if not self.at_end():
+            self.error("Unexpected trailing input")
+
+
+# ============================================================================
+# Cached entry points
+# ============================================================================
+
+@lru_cache(maxsize=AST_CACHE_SIZE)
+def _parse_functors_cached(text: str) -> Union[Tuple[FunctorItem, ...], ParseError]:
+    try:
+        parser = _Parser(text)
+        items = parser.functor_list()
+        parser.finish()
+        return items
+    except ParseError as error:
+        return error
+
+
+@lru_cache(maxsize=AST_CACHE_SIZE)
+def _parse_condition_cached(text: str) -> Union[Expr, ParseError]:
+    try:
+        parser = _Parser(text)
+        while parser.at(";"):
+            parser.advance()
+        if parser.at_end():
+            return Empty()
+        # Trailing ";" terminators are tolerated like in functor lists
+        expr = parser.sequence()
+        parser.finish()
+        return expr
+    except ParseError as error:
+        return error
+
+
+@profiling.phase("parse:functors")
+def parse_functors(text: str) -> Tuple[FunctorItem, ...]:
+    """Parse a functor list such as a ``Boosts`` or ``SpellSuccess`` value.
+
+    Results are cached by the raw string; the same tuple is returned for
+    repeated strings, so callers must not rely on identity being distinct.
+
+    Raises:
+        ParseError: If the string is not a valid functor list
+    """
+    result = _parse_functors_cached(text)
+    if isinstance(result, ParseError):
+        raise result
+    return result
+
+
+@profiling.phase("parse:conditions")
+def parse_condition(text: str) -> Expr:
+    """Parse a condition such as a ``TargetConditions`` value.
+
+    An empty condition parses to ``Empty()``. Results are cached like
+    ``parse_functors``.
+
+    Raises:
+        ParseError: If the string is not a valid condition
+    """
+    result = _parse_condition_cached(text)
+    if isinstance(result, ParseError):
+        raise result
+    return result
+
+
+def parse_property(key: str, value: str) -> Optional[Union[Expr, Tuple[FunctorItem, ...]]]:
+    """Parse a stats property value according to its key.
+
+    Returns:
+        The condition expression or functor list, or None for properties
+        that hold neither
+
+    Raises:
+        ParseError: If the value is malformed
+    """
+    if key in CONDITION_KEYS:
+        return parse_condition(value)
+    if key in FUNCTOR_KEYS:
+        return parse_functors(value)
+    return None
+
+
+def cache_info() -> Tuple:
+    """Return the ``lru_cache`` statistics of (functor lists, conditions)."""
+    return _parse_functors_cached.cache_info(), _parse_condition_cached.cache_info()
+
+
+def clear_cache() -> None:
+    _parse_functors_cached.cache_clear()
+    _parse_condition_cached.cache_clear()
+
+
+# ============================================================================
+# Traversal
+# ============================================================================
+
+def iter_calls(node) -> Iterator[Call]:
+    """Yield every call in a parsed value, outermost first and in source order.
+
+    Accepts a functor list, a single functor item or an expression; calls in
+    ``IF(...)`` guards and in arguments are included.
+    """
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Call):
+            yield node
+            stack.extend(reversed(node.args))
+        elif isinstance(node, Functor):
+            stack.append(node.expr)
+            if node.condition is not None:
+                stack.append(node.condition)
+        elif isinstance(node, CastGroup):
+            stack.extend(reversed(node.items))
+        elif isinstance(node, BinaryOp):
+            stack.append(node.right)
+            stack.append(node.left)
+        elif isinstance(node, UnaryOp):
+            stack.append(node.operand)
+        elif isinstance(node, Table):
+            stack.extend(reversed(node.items))
+        elif isinstance(node, tuple) and not hasattr(node, "_fields"):
+            stack.extend(reversed(node))
+
+
+def iter_functors(items: Tuple[FunctorItem, ...]) -> Iterator[Functor]:
+    """Yield the functors of a list, descending into cast groups."""
+    for item in items:
+        if isinstance(item, CastGroup):
+            yield from iter_functors(item.items)
+        else:
+            yield item
+
+
+def _operand_source(node) -> str:
+    """Render an operand, parenthesizing nested operations."""
+    if isinstance(node, BinaryOp):
+        return f"({to_source(node)})"
+    return to_source(node)
+
+
+def to_source(node) -> str:
+    """Render a parsed value back into (normalized) stats syntax."""
+    if isinstance(node, Number):
+        value = node.value
+        return f"{value}{'%' if node.percent else ''}"
+    if isinstance(node, Dice):
+        return f"{node.count}d{node.sides}"
+    if isinstance(node, String):
+        return f"'{node.value}'"
+    if isinstance(node, (Guid, Name)):
+        return node[0]
+    if isinstance(node, Empty):
+        return ""
+    if isinstance(node, Table):
+        return "{" + ",".join(to_source(item) for item in node.items) + "}"
+    if isinstance(node, Call):
+        return f"{node.name}(" + ",".join(to_source(arg) for arg in node.args) + ")"
+    if isinstance(node, UnaryOp):
+        separator = " " if node.op == "not" else ""
+        return f"{node.op}{separator}{_operand_source(node.operand)}"
+    if isinstance(node, BinaryOp):
+        left, right = _operand_source(node.left), _operand_source(node.right)
+        if node.op == ";":
+            return f"{left};{right}"
+        if node.op in ("and", "or") or node.op in _COMPARISON_OPS:
+            return f"{left} {node.op} {right}"
+        return f"{left}{node.op}{right}"
+    if isinstance(node, Functor):
+        prefix = "".join(f"{target}:" for target in node.targets)
+        if node.condition is not None:
+            prefix += f"IF({to_source(node.condition)}):"
+        return prefix + to_source(node.expr)
+    if isinstance(node, CastGroup):
+        return f"{node.name}[" + ";".join(to_source(item) for item in node.items) + "]"
+    return ";".join(to_source(item) for item in node)
+
+
+# ============================================================================
+# Command line
+# ============================================================================
+
+def scan(directories: List[str]) -> int:
+    """Parse every functor and condition property under ``directories``.
+
+    Returns:
+        The number of values that failed to parse
+    """
+    from stats_parser import find_stats_files, load_stats_file
+
+    failures = 0
+    values = 0
+    by_key: Counter = Counter()
+    start = time.perf_counter()
+    for directory in directories:
+        for file_path in find_stats_files(directory):
+            try:
+                stats = load_stats_file(file_path)
+            except (OSError, UnicodeDecodeError):
+                continue
+            for entry in stats.entries:
+                if entry.kind != "entry":
+                    continue
+                for key, value, line_num in entry.items():
+                    try:
+                        parsed = parse_property(key, value)
+                    except ParseError as error:
+                        failures += 1
+                        print(f"❌ {file_path}:{line_num} - {entry.name}")
+                        print(f"   Property: {key}")
+                        print(f"   Value: {value}")
+                        print(f"   Error: {error}\n")
+                        continue
+                    if parsed is not None:
+                        values += 1
+                        by_key[key] += 1
+    elapsed = time.perf_counter() - start
+
+    functor_info, condition_info = cache_info()
+    print(f"📊 Parsed {values} value(s) in {elapsed:.3f}s")
+    print(f"   Unique functor lists: {functor_info.currsize} ({functor_info.hits} cache hit(s))")
+    print(f"   Unique conditions: {condition_info.currsize} ({condition_info.hits} cache hit(s))")
+    for key, count in by_key.most_common():
+        print(f"   {key}: {count}")
+    return failures
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    parser = argparse.ArgumentParser(description="Parse BG3 functor, boost and condition strings")
+    parser.add_argument("expression", nargs="?", help="String to parse and print as an AST")
+    parser.add_argument("--condition", action="store_true", help="Parse the string as a condition.")
+    parser.add_argument("--scan", nargs="+", metavar="DIR", default=[],
+                        help="Parse every functor and condition property of these directories.")
+    args = parser.parse_args()
+
+    if args.scan:
+        failures = scan(args.scan)
+        if failures:
+            print(f"\n❌ {failures} value(s) failed to parse")
+            sys.exit(1)
+        print("\n✅ Every value parsed")
+        return
+
+    if args.expression is None:
+        print("❌ Error: Give an expression or --scan")
+        sys.exit(1)
+
+    try:
+        parsed = parse_condition(args.expression) if args.condition else parse_functors(args.expression)
+    except ParseError as error:
+        print(f"❌ {error}")
+        print(f"   {error.text}")
+        print(f"   {' ' * error.position}^")
+        sys.exit(1)
+    print(parsed)
+    print(to_source(parsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Localization Handle Index for BG3 ``.loca.xml`` Files
+
+Stats entries and ``.lsx`` resources refer to text through handles such as
+``hcfb7712dgbc4bg4c29gae6fg0caa3131629d;1`` (handle, then version). This
+module streams ``.loca.xml`` files with ``iterparse`` (the full English
+localization of the game runs to hundreds of megabytes) into a handle ->
+(version, text) table.
+
+The table is cached as SQLite next to the symbol indexes and keyed by a stat
+signature of the source files, so later runs load it with a single query into
+a dict and resolving a handle is one dict lookup.
+
+Usage:
+    python3 loca_index.py <loca_file_or_directory> ... [--rebuild] [--handle HANDLE ...]
+
+Example:
+    python3 loca_index.py Localization/English
+    python3 loca_index.py Localization/English --handle 'hd437e736g47fcg4d9dg8c25gb97bcf62b372;1'
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from symbol_index import DEFAULT_CACHE_DIR
+
+# Bump whenever the schema or the indexed content changes
+LOCA_INDEX_VERSION = 1
+
+DEFAULT_LANGUAGE = "English"
+
+_SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE handles (
+    handle TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    file TEXT NOT NULL
+);
+"""
+
+
+class LocaEntry(NamedTuple):
+    """One ``<content>`` element of a ``.loca.xml`` file."""
+    handle: str
+    version: int
+    text: str
+
+
+def split_handle(value: str) -> Tuple[str, Optional[int]]:
+    """Split a stats value like ``h...;3`` into ``(handle, 3)``.
+
+    The version is None when the value has none or it is not a number.
+    """
+    handle, _, version = value.partition(";")
+    return handle, int(version) if version.isdigit() else None
+
+
+def iter_loca_entries(path: Union[str, Path]) -> Iterator[LocaEntry]:
+    """Stream the entries of one ``.loca.xml`` file, in file order."""
+    root = None
+    for event, elem in ET.iterparse(str(path), events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+            continue
+        if elem.tag != "content":
+            continue
+        version = elem.get("version", "1")
+        yield LocaEntry(elem.get("contentuid", ""), int(version) if version.isdigit() else 1, elem.text or "")
+        # Detach the finished element so the tree never grows
+        root.remove(elem)
+
+
+def find_loca_files(directory: Union[str, Path], language: str = DEFAULT_LANGUAGE) -> List[Path]:
+    """Return the ``.loca.xml`` files of one language under ``directory``.
+
+    ``directory`` may be a language folder itself (``Localization/English``),
+    a ``Localization`` folder or any tree containing ``Localization/<language>``.
+    """
+    directory = Path(directory)
+    if directory.name == language:
+        return sorted(directory.glob("*.loca.xml"))
+    if directory.name == "Localization":
+        return sorted((directory / language).glob("*.loca.xml"))
+    return sorted(directory.rglob(f"Localization/{language}/*.loca.xml"))
+
+
+class LocaIndex:
+    """Every handle of a set of ``.loca.xml`` files, held in memory.
+
+    When a handle appears in more than one file, the file listed last wins.
+    """
+
+    def __init__(self, db_path: Path, files: Sequence[Path]):
+        self.db_path = db_path
+        self.files = list(files)
+        conn = sqlite3.connect(f"{db_path.as_uri()}?mode=ro", uri=True)
+        try:
+            self.handles: Dict[str, Tuple[int, str]] = {
+                handle: (version, text)
+                for handle, version, text in conn.execute("SELECT handle, version, text FROM handles")
+            }
+        finally:
+            conn.close()
+
+    def __len__(self) -> int:
+        return len(self.handles)
+
+    def __contains__(self, handle: str) -> bool:
+        return handle in self.handles
+
+    def lookup(self, value: str) -> Optional[Tuple[int, str]]:
+        """Return ``(version, text)`` for a handle, with or without ``;version``."""
+        return self.handles.get(value.partition(";")[0])
+
+    def text(self, value: str) -> Optional[str]:
+        found = self.lookup(value)
+        return found[1] if found else None
+
+
+def _stat_signature(files: Sequence[Path]) -> str:
+    signature = []
+    for file_path in files:
+        st = file_path.stat()
+        signature.append([str(file_path), st.st_mtime_ns, st.st_size])
+    return json.dumps(signature, separators=(",", ":"))
+
+
+def _read_signature(db_path: Path) -> Optional[str]:
+    try:
+        conn = sqlite3.connect(f"{db_path.as_uri()}?mode=ro", uri=True)
+    except sqlite3.Error:
+        return None
+    try:
+        meta = dict(conn.execute("SELECT key, value FROM meta"))
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+    if meta.get("version") != str(LOCA_INDEX_VERSION):
+        return None
+    return meta.get("stat_signature")
+
+
+def _write_index(db_path: Path, files: Sequence[Path], signature: str) -> None:
+    """Build the index into a temporary file and atomically move it into place."""
+    tmp_path = db_path.with_name(f"{db_path.name}.{os.getpid()}.tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(_SCHEMA)
+        for file_path in files:
+            conn.executemany(
+                "INSERT OR REPLACE INTO handles VALUES (?, ?, ?, ?)",
+                ((entry.handle, entry.version, entry.text, str(file_path))
+                 for entry in iter_loca_entries(file_path)),
+            )
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ("version", str(LOCA_INDEX_VERSION)),
+            ("stat_signature", signature),
+        ])
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, db_path)
+
+
+def loca_index_path_for(files: Sequence[Path], cache_dir: Optional[Union[str, Path]] = None) -> Path:
+    """Return the SQLite file used to index ``files``."""
+    cache_dir = Path(cache_dir).resolve() if cache_dir else DEFAULT_CACHE_DIR
+    key = "\0".join(str(f) for f in files)
+    slug = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+    stem = files[0].name.split(".")[0].replace(" ", "_") if files else "empty"
+    return cache_dir / f"loca-{stem}-{slug}.v{LOCA_INDEX_VERSION}.sqlite"
+
+
+def open_loca_index(files: Sequence[Union[str, Path]], cache_dir: Optional[Union[str, Path]] = None,
+                    rebuild: bool = False) -> LocaIndex:
+    """Load the handle index of some ``.loca.xml`` files, (re)building it if stale.
+
+    Args:
+        files: Localization files, in load order
+        cache_dir: Where index files live (default: ``reference/.symbol_index``)
+        rebuild: Force a rebuild even if the existing index is current
+
+    Returns:
+        A LocaIndex with every handle loaded
+    """
+    files = [Path(f).resolve() for f in files]
+    db_path = loca_index_path_for(files, cache_dir)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    signature = _stat_signature(files)
+    if rebuild or not db_path.exists() or _read_signature(db_path) != signature:
+        _write_index(db_path, files, signature)
+    return LocaIndex(db_path, files)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    parser = argparse.ArgumentParser(description="Localization Handle Index")
+    parser.add_argument("targets", nargs="+", help=".loca.xml files or directories containing them")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the index even if it is current.")
+    parser.add_argument("--handle", nargs="+", default=[], help="Handles to look up (with or without ;version).")
+    args = parser.parse_args()
+
+    files: List[Path] = []
+    for target in args.targets:
+        if os.path.isfile(target):
+            files.append(Path(target))
+        elif os.path.isdir(target):
+            files.extend(find_loca_files(target))
+        else:
+            print(f"❌ Error: Path does not exist: {target}")
+            sys.exit(1)
+
+    index = open_loca_index(files, rebuild=args.rebuild)
+    print(f"🌐 Loca index: {index.db_path}")
+    print(f"   Files: {len(index.files)}")
+    print(f"   Handles: {len(index)}")
+
+    for value in args.handle:
+        found = index.lookup(value)
+        if found is None:
+            print(f"❌ {value}: not found")
+        else:
+            version, text = found
+            print(f"✅ {value} (version {version}): {text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Process-Pool Helpers for Per-File Validation
+
+Fans a per-file validation function out to a process pool while keeping the
+merged results in input order, so error output is identical to a serial run.
+Progress is reported through a callback in completion order as workers finish.
+
+Usage:
+    from parallel_validation import map_files
+
+    results = map_files(validate_one, files, jobs=4,
+                        on_done=lambda idx, path, result, done: print(done, path))
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def resolve_jobs(jobs: int) -> int:
+    """Normalize a ``--jobs`` value: 0 (or less) means one worker per CPU."""
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def map_files(func: Callable[[T], R], items: Sequence[T], jobs: int = 1,
+              initializer: Optional[Callable[..., Any]] = None, initargs: Tuple = (),
+              on_done: Optional[Callable[[int, T, R, int], None]] = None) -> List[R]:
+    """Apply ``func`` to every item, in a process pool when ``jobs > 1``.
+
+    Args:
+        func: Module-level (picklable) function taking one item
+        items: Items to process (usually file paths)
+        jobs: Number of worker processes; 1 runs in-process
+        initializer: Optional per-worker setup function
+        initargs: Arguments for ``initializer``
+        on_done: Called in the parent as ``on_done(index, item, result, completed)``
+                 in completion order
+
+    Returns:
+        Results in the same order as ``items``
+    """
+    results: List[Any] = [None] * len(items)
+
+    if jobs <= 1 or len(items) <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for idx, item in enumerate(items):
+            results[idx] = func(item)
+            if on_done is not None:
+                on_done(idx, item, results[idx], idx + 1)
+        return results
+
+    workers = min(jobs, len(items))
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as executor:
+        futures = {executor.submit(func, item): idx for idx, item in enumerate(items)}
+        completed = 0
+        for future in as_completed(futures):
+            idx = futures[future]
+            results[idx] = future.result()
+            completed += 1
+            if on_done is not None:
+                on_done(idx, items[idx], results[idx], completed)
+
+    return results
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Profiling Hooks for the Validation Scripts
+
+A small instrumentation layer behind the ``--profile`` flag of every
+validator. Named spans time the phases of a run and counters record how much
+work each phase did:
+
+    read        reading stats files from disk
+    tokenize    scanning stats files into entries (stats_parser)
+    parse:*     parsing functors, conditions and treasure tables
+    check:*     each check of the unified validator
+    rule:*      each property check of a stats_rules.RuleSet
+    report      rendering the merged report
+    print       every write to stdout (per-file progress, reports)
+
+Besides these, enabling profiling wraps the public functions of every loaded
+script module whose names mark a unit of work (``validate_*``, ``check_*``,
+``load_*``, ...) and the constructors of their ``*Error`` diagnostic
+classes, so every rule and every diagnostic shows up under its own name.
+Nothing is wrapped while profiling is off: :func:`phase` only tags a
+function, and :func:`span` and :func:`count` cost a single flag check.
+
+Modes:
+    summary       print calls, total and self time of every span at exit
+    cprofile      run under cProfile and write a .prof file (snakeviz,
+                  flameprof or ``python -m pstats``)
+    chrome        write every span as a Chrome trace event file (open it in
+                  chrome://tracing or https://ui.perfetto.dev)
+
+Work done in ``--jobs`` worker processes is not profiled.
+
+Usage:
+    import profiling
+
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.start_from_args(args)
+
+    @profiling.phase("tokenize")
+    def parse_stats_bytes(data, path=""):
+        ...
+
+    with profiling.span("read"):
+        data = f.read()
+    profiling.count("stats.bytes", len(data))
+"""
+
+import atexit
+import cProfile
+import functools
+import inspect
+import json
+import os
+import pstats
+import sys
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Dict, Iterable, List, Optional
+
+MODES = ("summary", "cprofile", "chrome")
+
+DEFAULT_OUTPUTS = {
+    "cprofile": "validation.prof",
+    "chrome": "validation_trace.json",
+}
+
+# Public module-level functions starting with these are wrapped in spans
+INSTRUMENTED_PREFIXES = ("validate_", "check_", "parse_", "load_", "read_", "build_", "open_",
+                         "index_", "collect_", "find_", "resolve_")
+
+_SCRIPTS_DIR = Path(__file__).resolve().parent
+
+# Global switch read by every hook; spans and counters are no-ops while False
+enabled = False
+
+_mode: Optional[str] = None
+_output: Optional[str] = None
+_profiler: Optional[cProfile.Profile] = None
+_started_ns = 0
+
+# name -> [calls, total_ns, self_ns]
+_timers: Dict[str, List[int]] = {}
+_counters: Dict[str, int] = {}
+# Open spans as [name, start_ns, child_ns]
+_stack: List[List] = []
+# Completed spans for chrome mode as (name, start_ns, duration_ns)
+_events: List[tuple] = []
+
+
+class _Span:
+    """Times one named region; reusable and safe to nest."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        _stack.append([self.name, time.perf_counter_ns(), 0])
+        return self
+
+    def __exit__(self, *exc):
+        _close_span(time.perf_counter_ns())
+        return False
+
+
+class _NullSpan:
+    """The span handed out while profiling is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def _close_span(end_ns: int) -> None:
+    name, start_ns, child_ns = _stack.pop()
+    elapsed = end_ns - start_ns
+    timer = _timers.get(name)
+    if timer is None:
+        timer = _timers[name] = [0, 0, 0]
+    timer[0] += 1
+    timer[1] += elapsed
+    timer[2] += elapsed - child_ns
+    if _stack:
+        _stack[-1][2] += elapsed
+    if _mode == "chrome":
+        _events.append((name, start_ns, elapsed))
+
+
+def span(name: str):
+    """Return a context manager timing ``name``; a shared no-op when disabled."""
+    if not enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def count(name: str, n: int = 1) -> None:
+    """Add ``n`` to counter ``name`` (no-op when disabled)."""
+    if enabled:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def phase(name: str) -> Callable[[Callable], Callable]:
+    """Decorator naming the span a function is timed as once profiling starts.
+
+    The function itself is returned unchanged, so tagging costs nothing
+    while profiling is off.
+    """
+    def tag(func: Callable) -> Callable:
+        func.__profile_name__ = name
+        return func
+    return tag
+
+
+def _timed(name: str, func: Callable) -> Callable:
+    """Wrap ``func`` so every call is recorded as span ``name``."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        _stack.append([name, time.perf_counter_ns(), 0])
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _close_span(time.perf_counter_ns())
+    wrapper.__profiled__ = True
+    return wrapper
+
+
+def _module_label(module: ModuleType) -> str:
+    if module.__name__ == "__main__":
+        return Path(module.__file__).stem
+    return module.__name__
+
+
+def script_modules() -> List[ModuleType]:
+    """Return the loaded modules that live in this scripts directory."""
+    modules = []
+    for module in list(sys.modules.values()):
+        source = getattr(module, "__file__", None)
+        if source and Path(source).resolve().parent == _SCRIPTS_DIR and module.__name__ != __name__:
+            modules.append(module)
+    return modules
+
+
+def instrument(modules: Iterable[ModuleType]) -> int:
+    """Wrap the work functions, :func:`phase` functions and diagnostic constructors of ``modules``.
+
+    Functions imported into other modules (``from stats_parser import
+    load_stats_file``) are replaced there too, so every call site is timed.
+
+    Returns:
+        Number of functions and constructors wrapped
+    """
+    modules = list(modules)
+    wrappers: Dict[int, Callable] = {}
+
+    for module in modules:
+        label = _module_label(module)
+        for attr, value in list(vars(module).items()):
+            if (inspect.isfunction(value) and value.__module__ == module.__name__
+                    and (attr.startswith(INSTRUMENTED_PREFIXES) or hasattr(value, "__profile_name__"))
+                    and not inspect.isgeneratorfunction(value)
+                    and not getattr(value, "__profiled__", False)):
+                name = getattr(value, "__profile_name__", f"{label}.{attr}")
+                wrappers[id(value)] = _timed(name, value)
+            elif (inspect.isclass(value) and value.__module__ == module.__name__
+                    and attr.endswith("Error") and not issubclass(value, BaseException)
+                    and "__init__" in vars(value)
+                    and not getattr(value.__init__, "__profiled__", False)):
+                value.__init__ = _timed(f"{attr}()", value.__init__)
+                wrappers[id(value)] = value
+
+    for module in modules:
+        for attr, value in list(vars(module).items()):
+            wrapper = wrappers.get(id(value))
+            if wrapper is not None and wrapper is not value:
+                setattr(module, attr, wrapper)
+
+    return len(wrappers)
+
+
+class _TimedStdout:
+    """Proxy for sys.stdout that records every write as span ``print``."""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def write(self, text):
+        _stack.append(["print", time.perf_counter_ns(), 0])
+        try:
+            return self._stream.write(text)
+        finally:
+            _close_span(time.perf_counter_ns())
+
+    def __getattr__(self, attr):
+        return getattr(self._stream, attr)
+
+
+def start(mode: Optional[str], output: Optional[str] = None) -> None:
+    """Start profiling in ``mode`` (None does nothing); results are written at exit."""
+    global enabled, _mode, _output, _profiler, _started_ns
+    if not mode or _mode is not None:
+        return
+    if mode not in MODES:
+        raise ValueError(f"Unknown profile mode: {mode} (expected one of {', '.join(MODES)})")
+
+    _mode = mode
+    _output = output or DEFAULT_OUTPUTS.get(mode)
+    _started_ns = time.perf_counter_ns()
+    atexit.register(finish)
+
+    if mode == "cprofile":
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+        return
+
+    enabled = True
+    instrument(script_modules())
+    sys.stdout = _TimedStdout(sys.stdout)
+
+
+def finish() -> None:
+    """Stop profiling and print or write the results (registered with atexit)."""
+    global enabled, _mode
+    if _mode is None:
+        return
+    mode, _mode = _mode, None
+    enabled = False
+    wall_ns = time.perf_counter_ns() - _started_ns
+    if isinstance(sys.stdout, _TimedStdout):
+        sys.stdout = sys.stdout._stream
+    # Spans left open by sys.exit() inside them end now
+    while _stack:
+        _close_span(time.perf_counter_ns())
+
+    if mode == "cprofile":
+        _profiler.disable()
+        _profiler.dump_stats(_output)
+        print()
+        print("=" * 70)
+        print("PROFILE (cProfile, top 20 by cumulative time)")
+        print("=" * 70)
+        pstats.Stats(_profiler, stream=sys.stdout).sort_stats("cumulative").print_stats(20)
+        print(f"📊 cProfile data written to: {_output}")
+        return
+
+    print_summary(wall_ns)
+    if mode == "chrome":
+        write_chrome_trace(_output)
+        print(f"📊 Chrome trace written to: {_output}")
+
+
+def print_summary(wall_ns: int, limit: int = 40) -> None:
+    """Print the slowest spans by self time, then the counters."""
+    print()
+    print("=" * 70)
+    print("PROFILE")
+    print("=" * 70)
+    print(f"  {'span':44s} {'calls':>7s} {'total':>10s} {'self':>10s} {'self%':>6s}")
+    ranked = sorted(_timers.items(), key=lambda item: item[1][2], reverse=True)
+    for name, (calls, total_ns, self_ns) in ranked[:limit]:
+        share = self_ns / wall_ns * 100 if wall_ns else 0.0
+        print(f"  {name[:44]:44s} {calls:7d} {total_ns / 1e6:8.2f}ms {self_ns / 1e6:8.2f}ms {share:5.1f}%")
+    if len(ranked) > limit:
+        print(f"  ... {len(ranked) - limit} more span(s)")
+    print(f"  {'wall time':44s} {'':7s} {wall_ns / 1e6:8.2f}ms")
+    if _counters:
+        print()
+        for name, value in sorted(_counters.items()):
+            print(f"  {name:44s} {value:>12,d}")
+    print()
+
+
+def write_chrome_trace(path: str) -> None:
+    """Write the recorded spans and counters in the Chrome trace event format."""
+    pid = os.getpid()
+    events = [
+        {"name": name, "cat": name.split(".", 1)[0].split(":", 1)[0], "ph": "X", "pid": pid, "tid": 0,
+         "ts": (start_ns - _started_ns) / 1e3, "dur": duration_ns / 1e3}
+        for name, start_ns, duration_ns in _events
+    ]
+    end_us = (time.perf_counter_ns() - _started_ns) / 1e3
+    events.extend({"name": name, "ph": "C", "pid": pid, "tid": 0, "ts": end_us, "args": {"value": value}}
+                  for name, value in sorted(_counters.items()))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+def add_arguments(parser) -> None:
+    """Add ``--profile``, ``--profile-mode MODE`` and ``--profile-output FILE`` to an argparse parser.
+
+    ``--profile`` is a plain flag, so it never takes the positional target
+    that may follow it as a mode.
+    """
+    parser.add_argument("--profile", action="store_const", const=True, default=False,
+                        help="Profile the run and print a span breakdown.")
+    parser.add_argument("--profile-mode", choices=MODES, default=None,
+                        help="What --profile records: a span breakdown (summary, the default), cProfile "
+                             "data (cprofile) or a Chrome trace (chrome). Implies --profile.")
+    parser.add_argument("--profile-output", metavar="FILE",
+                        help="Where --profile-mode cprofile/chrome writes "
+                             f"(default: {DEFAULT_OUTPUTS['cprofile']} / {DEFAULT_OUTPUTS['chrome']}).")
+
+
+def start_from_args(args) -> None:
+    """Start profiling as requested by the arguments from :func:`add_arguments`."""
+    mode = args.profile_mode or ("summary" if args.profile else None)
+    start(mode, args.profile_output)
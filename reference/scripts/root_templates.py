@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Streaming Reader/Rewriter for Merged RootTemplates (_merged.lsf.lsx)
+
+A mod's ``RootTemplates/_merged.lsf.lsx`` is small, but the merged vanilla
+templates it is checked against run to hundreds of megabytes, far too much to
+load with ``ET.parse``. This module walks the file with ``iterparse`` instead:
+each top-level ``GameObjects`` node is built, handed to the caller and then
+freed, so memory stays bounded by the largest single template rather than the
+file.
+
+Two entry points are built on the same walk:
+
+* ``iter_game_objects`` yields lightweight ``GameObject`` records (MapKey,
+  Name, Type, Stats, Icon, ParentTemplateId).
+* ``rewrite_game_objects`` copies the file to a new one, keeping only the
+  templates a predicate accepts. Everything else, including whitespace, is
+  written back as it was read.
+
+Usage:
+    python3 root_templates.py <merged_lsx> [--type TYPE] [--drop-type TYPE --output FILE]
+
+Example:
+    python3 root_templates.py Public/EldertideArmament/RootTemplates/_merged.lsf.lsx
+    python3 root_templates.py Public/EldertideArmament/RootTemplates/_merged.lsf.lsx --type item
+    python3 root_templates.py _merged.lsf.lsx --drop-type character --output _merged.cleaned.lsx
+"""
+
+import argparse
+import os
+import sys
+import xml.etree.ElementTree as ET
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Iterator, NamedTuple, Optional, TextIO, Tuple, Union
+from xml.sax.saxutils import escape
+
+# Depth of the template nodes: save / region / node "Templates" / children / node
+TEMPLATE_DEPTH = 5
+
+TEMPLATE_NODE_ID = "GameObjects"
+
+XML_DECLARATION = '<?xml version="1.0" encoding="utf-8"?>'
+
+_ATTRIBUTE_ENTITIES = {'"': "&quot;", "\n": "&#10;", "\r": "&#13;", "\t": "&#09;"}
+
+
+class GameObject(NamedTuple):
+    """The identifying fields of one root template."""
+    map_key: str
+    name: str
+    type: str
+    stats: str
+    icon: str
+    parent_template_id: str
+
+
+class RewriteStats(NamedTuple):
+    """Outcome of ``rewrite_game_objects``."""
+    kept: int
+    removed: int
+
+
+def _is_template(elem: ET.Element, depth: int) -> bool:
+    return depth == TEMPLATE_DEPTH and elem.tag == "node" and elem.get("id") == TEMPLATE_NODE_ID
+
+
+def _walk(source: Union[str, Path]) -> Iterator[Tuple[str, ET.Element, int]]:
+    """Yield ``(event, element, depth)`` for every element down to template depth.
+
+    Elements below the template level are not reported; each template subtree
+    arrives complete with its ``end`` event and is detached from its parent as
+    soon as the consumer moves on, which keeps the tree from growing.
+    """
+    stack = []
+    for event, elem in ET.iterparse(str(source), events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            if len(stack) <= TEMPLATE_DEPTH:
+                yield event, elem, len(stack)
+            continue
+
+        depth = len(stack)
+        if depth <= TEMPLATE_DEPTH:
+            yield event, elem, depth
+        stack.pop()
+        if depth == TEMPLATE_DEPTH and stack:
+            stack[-1].remove(elem)
+
+
+def game_object_from_element(elem: ET.Element) -> GameObject:
+    """Build a record from the direct ``attribute`` children of a template node."""
+    fields = {}
+    for attribute in elem.iterfind("attribute"):
+        fields[attribute.get("id")] = attribute.get("value", "")
+    return GameObject(
+        map_key=fields.get("MapKey", ""),
+        name=fields.get("Name", ""),
+        type=fields.get("Type", ""),
+        stats=fields.get("Stats", ""),
+        icon=fields.get("Icon", ""),
+        parent_template_id=fields.get("ParentTemplateId", ""),
+    )
+
+
+def iter_game_objects(source: Union[str, Path]) -> Iterator[GameObject]:
+    """Yield every root template in a merged ``.lsx`` file, in file order.
+
+    Args:
+        source: Path to a ``_merged.lsf.lsx`` (or any RootTemplates ``.lsx``)
+
+    Yields:
+        One GameObject per template node
+    """
+    for event, elem, depth in _walk(source):
+        if event == "end" and _is_template(elem, depth):
+            yield game_object_from_element(elem)
+
+
+def _start_tag(elem: ET.Element) -> str:
+    attributes = "".join(f' {key}="{escape(value, _ATTRIBUTE_ENTITIES)}"' for key, value in elem.attrib.items())
+    return f"<{elem.tag}{attributes}"
+
+
+def _rewrite(source: Union[str, Path], out: TextIO, keep: Callable[[GameObject], bool]) -> RewriteStats:
+    kept = 0
+    removed = 0
+    # Start tag still missing its ">" (or " />" if the element turns out empty)
+    open_elem: Optional[ET.Element] = None
+    # Element whose tail text is not known until the parser moves past it
+    closed_elem: Optional[ET.Element] = None
+
+    out.write(XML_DECLARATION)
+    for event, elem, depth in _walk(source):
+        if closed_elem is not None:
+            out.write(escape(closed_elem.tail or ""))
+            closed_elem = None
+        if open_elem is not None:
+            if event == "end" and elem is open_elem and len(elem) == 0 and not elem.text:
+                out.write(" />")
+                open_elem = None
+                closed_elem = elem
+                continue
+            out.write(">" + escape(open_elem.text or ""))
+            open_elem = None
+
+        if depth == TEMPLATE_DEPTH:
+            if event == "start":
+                continue
+            if _is_template(elem, depth):
+                record = game_object_from_element(elem)
+                if not keep(record):
+                    removed += 1
+                    continue
+                kept += 1
+            # iterparse reports events in batches, so the tail may already be
+            # set here; it is written separately once the next event arrives
+            tail, elem.tail = elem.tail, None
+            out.write(ET.tostring(elem, encoding="unicode"))
+            elem.tail = tail
+            closed_elem = elem
+        elif event == "start":
+            out.write(_start_tag(elem))
+            open_elem = elem
+        else:
+            out.write(f"</{elem.tag}>")
+            closed_elem = elem
+
+    return RewriteStats(kept, removed)
+
+
+def rewrite_game_objects(source: Union[str, Path], destination: Union[str, Path],
+                         keep: Callable[[GameObject], bool]) -> RewriteStats:
+    """Stream ``source`` into ``destination``, keeping only accepted templates.
+
+    Removed templates are dropped together with the whitespace that followed
+    them, as ``ElementTree`` does when a child is removed. Only counts are
+    kept; a predicate that wants the removed records can collect them
+    itself. The output is written to a temporary file next to
+    ``destination`` and moved into place at the end, so ``destination`` may
+    be ``source`` itself.
+
+    Args:
+        source: Merged ``.lsx`` file to read
+        destination: File to write
+        keep: Predicate deciding whether a template is kept
+
+    Returns:
+        RewriteStats with the number of templates kept and removed
+    """
+    destination = Path(destination)
+    tmp_path = destination.with_name(f"{destination.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8", newline="") as out:
+            stats = _rewrite(source, out, keep)
+        os.replace(tmp_path, destination)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return stats
+
+
+def drop_types(*type_names: str) -> Callable[[GameObject], bool]:
+    """Return a ``keep`` predicate rejecting templates of the given types."""
+    dropped = frozenset(type_names)
+    return lambda record: record.type not in dropped
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    parser = argparse.ArgumentParser(description="Stream the templates of a merged RootTemplates file")
+    parser.add_argument("source", help="Path to a _merged.lsf.lsx file")
+    parser.add_argument("--type", dest="type_name", help="Only list templates of this type.")
+    parser.add_argument("--drop-type", nargs="+", default=[], help="Template types to remove when rewriting.")
+    parser.add_argument("--output", help="Write a copy without the --drop-type templates here.")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.source):
+        print(f"❌ Error: File does not exist: {args.source}")
+        sys.exit(1)
+
+    if args.output:
+        if not args.drop_type:
+            print("❌ Error: --output needs --drop-type")
+            sys.exit(1)
+        stats = rewrite_game_objects(args.source, args.output, drop_types(*args.drop_type))
+        print(f"✅ Wrote {args.output}: kept {stats.kept}, removed {stats.removed}")
+        return
+
+    counts: Counter = Counter()
+    for record in iter_game_objects(args.source):
+        counts[record.type] += 1
+        if args.type_name is None or record.type == args.type_name:
+            print(f"{record.map_key}  {record.type:12s} {record.name or '-':40s} {record.stats}")
+
+    print()
+    for type_name, count in sorted(counts.items()):
+        print(f"   {type_name or '(untyped)':20s} {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Shared BG3 Stats File Parser
+
+This module tokenizes BG3 stats files (``Stats/Generated/Data/*.txt`` and the
+``new <kind> "..."`` / ``data "..." "..."`` files next to them) exactly once
+and exposes the result as a compact entry table. Every validator consumes the
+same table, so a full validation run reads and scans each file a single time.
+
+Files are scanned as raw bytes by a compiled byte-level pattern, without
+splitting lines or decoding the text. Each file keeps its bytes and stores its
+data lines column-wise: the property key (one shared string per distinct
+key), the offsets of the value inside the bytes and the line number. A value
+is only decoded when a caller reads it, so a pass over the vanilla dumps
+allocates a handful of objects per entry rather than several per line. An
+entry only records its name, type, ``using`` parent, starting line and the
+slice of those columns that belongs to it. The ``add`` lines of ``new
+equipment`` and ``new spellset`` blocks are stored the same way, keyed by the
+words after ``add`` (``equipmentgroup``, ``equipment entry``, ``spell``) with
+the quoted name, if any, as the value.
+
+Usage:
+    from stats_parser import load_stats_file
+
+    stats = load_stats_file("Public/EldertideArmament/Stats/Generated/Data/Armor.txt")
+    for entry in stats.of_type("Armor"):
+        print(entry.name, entry.using, entry.get("Rarity"))
+"""
+
+import os
+import re
+import sys
+from array import array
+from pathlib import Path
+from typing import Container, Dict, Iterator, List, Optional, Tuple, Union
+
+import profiling
+
+# One alternation per line shape; the tokenizer walks the whole buffer with a
+# single finditer call instead of splitting and stripping every line. The
+# pattern works on bytes, so the file never has to be decoded as a whole.
+_LINE_PATTERN = re.compile(
+    rb'^[ \t]*(?:'
+    rb'new (?P<kind>\w+) "(?P<name>[^"\n]+)"'
+    rb'|type "(?P<type>[^"\n]+)"'
+    rb'|using "(?P<using>[^"\n]+)"'
+    rb'|data "(?P<key>[^"\n]+)" "(?P<value>[^"\n]*)"'
+    rb'|add (?P<add>[a-z]+(?: [a-z]+)*)(?: "(?P<add_value>[^"\n]*)")?'
+    rb')',
+    re.MULTILINE,
+)
+
+# Group numbers of _LINE_PATTERN; ``lastindex`` tells which alternative matched
+_KIND, _NAME, _TYPE, _USING, _KEY, _VALUE, _ADD, _ADD_VALUE = range(1, 9)
+
+_BOM = b"\xef\xbb\xbf"
+
+# Keys, kinds and types decoded once per process and shared by every file
+_SYMBOLS: Dict[bytes, str] = {}
+
+
+def _symbol(raw: bytes) -> str:
+    symbol = _SYMBOLS.get(raw)
+    if symbol is None:
+        symbol = _SYMBOLS[raw] = sys.intern(raw.decode("utf-8"))
+    return symbol
+
+StatsPath = Union[str, "os.PathLike[str]"]
+
+
+class StatsEntry:
+    """A single ``new <kind> "name"`` block.
+
+    The entry's own ``data`` lines live in the owning :class:`StatsFile`
+    columns between ``data_start`` (inclusive) and ``data_end`` (exclusive).
+    """
+
+    __slots__ = ("kind", "name", "type", "using", "line", "data_start", "data_end", "source")
+
+    def __init__(self, source: "StatsFile", kind: str, name: str, line: int, data_start: int):
+        self.source = source
+        self.kind = kind
+        self.name = name
+        self.type: Optional[str] = None
+        self.using: Optional[str] = None
+        self.line = line
+        self.data_start = data_start
+        self.data_end = data_start
+
+    def __repr__(self) -> str:
+        return f"StatsEntry({self.kind} {self.name!r} @ {self.source.path}:{self.line})"
+
+    def items(self, only: Optional[Container[str]] = None) -> Iterator[Tuple[str, str, int]]:
+        """Yield ``(key, value, line)`` for every data line of this entry.
+
+        With ``only``, lines whose key is not in it are skipped before their
+        value is decoded.
+        """
+        source = self.source
+        data, keys, spans, lines = source.data, source.keys, source.spans, source.lines
+        for i in range(self.data_start, self.data_end):
+            key = keys[i]
+            if only is None or key in only:
+                yield key, data[spans[2 * i]:spans[2 * i + 1]].decode("utf-8"), lines[i]
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Return the entry's own value for ``key`` (last definition wins)."""
+        keys = self.source.keys
+        for i in range(self.data_end - 1, self.data_start - 1, -1):
+            if keys[i] == key:
+                return self.source.value(i)
+        return default
+
+    def properties(self) -> Dict[str, str]:
+        """Return the entry's own data lines as a dictionary."""
+        source = self.source
+        data, keys, spans = source.data, source.keys, source.spans
+        return {keys[i]: data[spans[2 * i]:spans[2 * i + 1]].decode("utf-8")
+                for i in range(self.data_start, self.data_end)}
+
+    def to_dict(self) -> Dict[str, Union[str, int]]:
+        """Return the entry in the dictionary shape the ``validate_*`` rules expect."""
+        entry: Dict[str, Union[str, int]] = {"_name": self.name, "_start_line": self.line}
+        if self.using is not None:
+            entry["using"] = self.using
+        entry.update(self.properties())
+        return entry
+
+
+class StatsFile:
+    """Column-oriented entry table for one stats file.
+
+    ``data`` holds the raw file; value ``i`` is the byte range
+    ``spans[2 * i]:spans[2 * i + 1]`` of it, decoded by :meth:`value` on access.
+    """
+
+    __slots__ = ("path", "entries", "data", "keys", "spans", "lines", "_by_name")
+
+    def __init__(self, path: str, data: bytes = b""):
+        self.path = path
+        self.entries: List[StatsEntry] = []
+        self.data = data
+        self.keys: List[str] = []
+        self.spans = array("I")
+        self.lines = array("I")
+        self._by_name: Optional[Dict[str, StatsEntry]] = None
+
+    def value(self, i: int) -> str:
+        """Decode the value of data line ``i``."""
+        return self.data[self.spans[2 * i]:self.spans[2 * i + 1]].decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[StatsEntry]:
+        return iter(self.entries)
+
+    def of_type(self, type_name: str) -> Iterator[StatsEntry]:
+        """Yield ``new entry`` blocks whose ``type`` matches ``type_name``."""
+        for entry in self.entries:
+            if entry.type == type_name:
+                yield entry
+
+    @property
+    def by_name(self) -> Dict[str, StatsEntry]:
+        """Map of ``new entry`` names to entries (built on first use)."""
+        if self._by_name is None:
+            self._by_name = {e.name: e for e in self.entries if e.kind == "entry"}
+        return self._by_name
+
+
+@profiling.phase("tokenize")
+def parse_stats_bytes(data: bytes, path: str = "") -> StatsFile:
+    """Tokenize the raw bytes of a stats file into a :class:`StatsFile`.
+
+    A leading UTF-8 byte order mark is skipped. Values are not decoded here;
+    see :meth:`StatsFile.value`.
+    """
+    stats = StatsFile(path, data)
+    keys, spans, lines = stats.keys, stats.spans, stats.lines
+    entries = stats.entries
+    symbols = _SYMBOLS
+
+    current: Optional[StatsEntry] = None
+    line_num = 1
+    last_pos = 0
+
+    for match in _LINE_PATTERN.finditer(data, len(_BOM) if data.startswith(_BOM) else 0):
+        pos = match.start()
+        line_num += data.count(b"\n", last_pos, pos)
+        last_pos = pos
+
+        group = match.lastindex
+        if group == _VALUE:
+            if current is not None:
+                raw = match.group(_KEY)
+                keys.append(symbols.get(raw) or _symbol(raw))
+                spans.extend(match.span(_VALUE))
+                lines.append(line_num)
+                current.data_end = len(keys)
+        elif group == _NAME:
+            raw = match.group(_KIND)
+            current = StatsEntry(stats, symbols.get(raw) or _symbol(raw), match.group(_NAME).decode("utf-8"),
+                                 line_num, len(keys))
+            entries.append(current)
+        elif group == _ADD or group == _ADD_VALUE:
+            # Equipment and spell set lines ("add equipment entry", "add spell")
+            # are stored as data columns so their order and lines survive
+            if current is not None:
+                keys.append(_symbol(match.group(_ADD)))
+                spans.extend(match.span(_ADD_VALUE) if group == _ADD_VALUE else (0, 0))
+                lines.append(line_num)
+                current.data_end = len(keys)
+        elif current is not None:
+            if group == _TYPE:
+                current.type = _symbol(match.group(_TYPE))
+            else:
+                current.using = sys.intern(match.group(_USING).decode("utf-8"))
+
+    return stats
+
+
+def parse_stats_text(text: str, path: str = "") -> StatsFile:
+    """Tokenize the contents of a stats file given as text."""
+    return parse_stats_bytes(text.encode("utf-8"), path)
+
+
+# Parsed files keyed by absolute path and validated against (mtime_ns, size),
+# so every validator in one process shares a single read of each file.
+_FILE_CACHE: Dict[str, Tuple[int, int, StatsFile]] = {}
+
+
+def load_stats_file(path: StatsPath) -> StatsFile:
+    """Parse a stats file, reusing the in-process copy if it is unchanged.
+
+    Raises:
+        OSError: If the file cannot be read.
+        UnicodeDecodeError: If the file is not valid UTF-8.
+    """
+    key = os.path.abspath(path)
+    st = os.stat(key)
+    cached = _FILE_CACHE.get(key)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        profiling.count("stats.cache_hits")
+        return cached[2]
+
+    with profiling.span("read"), open(key, "rb") as f:
+        data = f.read()
+    # Values are decoded lazily, so reject invalid UTF-8 up front as before
+    if not data.isascii():
+        data.decode("utf-8")
+
+    stats = parse_stats_bytes(data, str(path))
+    _FILE_CACHE[key] = (st.st_mtime_ns, st.st_size, stats)
+    profiling.count("stats.files")
+    profiling.count("stats.bytes", st.st_size)
+    profiling.count("stats.entries", len(stats.entries))
+    return stats
+
+
+def find_stats_files(directory: StatsPath, pattern: str = "*.txt") -> List[Path]:
+    """Return all files under ``directory`` matching ``pattern`` (recursive)."""
+    return list(Path(directory).rglob(pattern))
+
+
+def clear_cache() -> None:
+    """Forget every parsed file held by :func:`load_stats_file`."""
+    _FILE_CACHE.clear()
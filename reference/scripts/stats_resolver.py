@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+BG3 Stats Inheritance Resolver
+
+Stats entries inherit every ``data`` field of the entry named in their
+``using "..."`` line. This module builds that inheritance graph across the
+mod and any included reference dumps and returns each entry's flattened
+(effective) properties.
+
+Resolution is memoized per entry name, so a parent shared by many children is
+flattened only once per run. Cycles are detected, recorded in
+``StatsResolver.cycles`` and broken at the back edge instead of recursing
+forever. Directories given to :func:`build_resolver` are only parsed when the
+graph is first used, so a run served entirely from the validation cache never
+reads them.
+
+Usage:
+    from stats_resolver import build_resolver
+
+    resolver = build_resolver("Public/EldertideArmament/Stats/Generated/Data/",
+                              ["reference/vanilla_data"])
+    print(resolver.resolve("ELDER_Ring_1").get("Rarity"))
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Union
+
+from stats_parser import StatsEntry, StatsFile, find_stats_files, load_stats_file
+
+
+class StatsResolver:
+    """Inheritance graph over ``new entry`` blocks with memoized flattening."""
+
+    def __init__(self):
+        self.cycles: List[List[str]] = []
+        self.directories: List[str] = []
+        self._entries: Dict[str, StatsEntry] = {}
+        self._pending: List[Path] = []
+        self._resolved: Dict[str, Dict[str, str]] = {}
+        self._load_order_digest: Optional[str] = None
+
+    @property
+    def entries(self) -> Dict[str, StatsEntry]:
+        """Every known entry by name (loads deferred directories first)."""
+        if self._pending:
+            self.load()
+        return self._entries
+
+    def defer_directory(self, directory: Union[str, Path]) -> None:
+        """Queue ``directory`` to be added on first use of the graph."""
+        self.directories.append(str(Path(directory).resolve()))
+        self._pending.append(Path(directory))
+        self._load_order_digest = None
+
+    def load(self) -> None:
+        """Add every deferred directory now, in the order they were queued."""
+        pending, self._pending = self._pending, []
+        for directory in pending:
+            self._load_directory(directory)
+
+    def add_file(self, stats: StatsFile) -> None:
+        """Register every entry of ``stats``; later definitions override earlier ones."""
+        entries = self.entries
+        for entry in stats.entries:
+            if entry.kind == "entry":
+                entries[entry.name] = entry
+        self._resolved.clear()
+
+    def add_directory(self, directory: Union[str, Path]) -> int:
+        """Register every readable stats file under ``directory``.
+
+        Returns:
+            Number of files added
+        """
+        self.directories.append(str(Path(directory).resolve()))
+        self._load_order_digest = None
+        return self._load_directory(directory)
+
+    def load_order_digest(self) -> str:
+        """Digest of every stats file in ``directories``, in load order.
+
+        Covers each file's path and (mtime_ns, size, inode) and only stats the
+        files, so it is cheap even while the graph is still deferred. Adding,
+        removing or editing any file that may define or override a ``using``
+        parent changes it. Computed once per resolver.
+        """
+        if self._load_order_digest is None:
+            sha256 = hashlib.sha256()
+            for directory in self.directories:
+                for file_path in find_stats_files(directory):
+                    try:
+                        st = file_path.stat()
+                    except OSError:
+                        continue
+                    sha256.update(f"{file_path}\0{st.st_mtime_ns}\0{st.st_size}\0{st.st_ino}\n".encode("utf-8"))
+            self._load_order_digest = sha256.hexdigest()[:16]
+        return self._load_order_digest
+
+    def _load_directory(self, directory: Union[str, Path]) -> int:
+        added = 0
+        for file_path in find_stats_files(directory):
+            try:
+                stats = load_stats_file(file_path)
+            except (OSError, UnicodeDecodeError):
+                continue
+            self.add_file(stats)
+            added += 1
+        return added
+
+    def resolve(self, name: str) -> Dict[str, str]:
+        """Return the flattened properties of ``name`` (empty if undefined).
+
+        The returned dictionary is shared with the memo table and must not be
+        modified by the caller.
+        """
+        memo = self._resolved
+        cached = memo.get(name)
+        if cached is not None:
+            return cached
+        entries = self.entries
+
+        # Walk up the chain until we hit a memoized ancestor, a missing
+        # parent or a cycle, then fold the chain back down.
+        chain: List[str] = []
+        on_chain: Set[str] = set()
+        base: Dict[str, str] = {}
+        current: Optional[str] = name
+
+        while current is not None:
+            cached = memo.get(current)
+            if cached is not None:
+                base = cached
+                break
+            if current in on_chain:
+                self.cycles.append(chain[chain.index(current):])
+                break
+            entry = entries.get(current)
+            if entry is None:
+                break
+            chain.append(current)
+            on_chain.add(current)
+            current = entry.using
+
+        for entry_name in reversed(chain):
+            merged = dict(base)
+            merged.update(entries[entry_name].properties())
+            memo[entry_name] = merged
+            base = merged
+
+        return memo.get(name, {})
+
+    def effective(self, entry: StatsEntry) -> Dict[str, Union[str, int]]:
+        """Return ``entry`` in :meth:`StatsEntry.to_dict` shape with inherited values merged in.
+
+        Every property of the entry and its ancestors is decoded; values are
+        not kept lazy here, unlike :meth:`StatsEntry.items`.
+        """
+        result: Dict[str, Union[str, int]] = {"_name": entry.name, "_start_line": entry.line}
+        if entry.using is not None:
+            result["using"] = entry.using
+
+        if self.entries.get(entry.name) is entry:
+            result.update(self.resolve(entry.name))
+        else:
+            # Shadowed by a later definition of the same name; flatten it on
+            # its own so it is still checked against its declared parent.
+            if entry.using is not None:
+                result.update(self.resolve(entry.using))
+            result.update(entry.properties())
+
+        return result
+
+    def ancestor_files(self, entries: Iterable[StatsEntry]) -> Set[str]:
+        """Return paths of every file that defines an ancestor of ``entries``."""
+        known = self.entries
+        files: Set[str] = set()
+        seen: Set[str] = set()
+        for entry in entries:
+            parent = entry.using
+            while parent is not None and parent not in seen:
+                seen.add(parent)
+                parent_entry = known.get(parent)
+                if parent_entry is None:
+                    break
+                files.add(parent_entry.source.path)
+                parent = parent_entry.using
+        return files
+
+    def unresolved_parents(self) -> Dict[str, List[str]]:
+        """Map each ``using`` target with no known definition to its children."""
+        missing: Dict[str, List[str]] = {}
+        entries = self.entries
+        for entry in entries.values():
+            if entry.using is not None and entry.using not in entries:
+                missing.setdefault(entry.using, []).append(entry.name)
+        return missing
+
+
+def build_resolver(target: Union[str, Path], include_dirs: Sequence[str] = ()) -> StatsResolver:
+    """Build a resolver over ``include_dirs`` (in load order) and then ``target``.
+
+    ``target`` may be a stats file, in which case its sibling files are loaded
+    too so parents defined elsewhere in the mod are found. Nothing is parsed
+    until the resolver is first used.
+    """
+    resolver = StatsResolver()
+    for include in include_dirs:
+        if Path(include).is_dir():
+            resolver.defer_directory(include)
+
+    path = Path(target)
+    resolver.defer_directory(path.parent if path.is_file() else path)
+    return resolver
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Persistent Symbol Index for BG3 Reference Dumps
+
+The vanilla and AI-Allies dumps under ``reference/`` only change between game
+patches, yet every validation run used to re-parse them. This module builds a
+versioned SQLite index of every stats entry (spells, statuses, passives,
+interrupts, items, ...), every ``RootTemplate`` UUID, every localization
+handle, every effect UUID (``CastEffect``, ``StatusEffect``, ...), every
+``Icon`` name and every equipment set and spell set (with the items and
+spells they list), with the file and line that uses it, and reuses it until
+the dump changes.
+
+Each index is keyed by a content hash of the dump directory. A stat signature
+(path, mtime, size of every file) is stored alongside it, so an unchanged dump
+is recognised without reading any file; only when the signature differs is the
+content hash recomputed, and only when that differs is the index rebuilt.
+
+Usage:
+    python3 symbol_index.py <dump_directory> [--rebuild]
+
+Example:
+    python3 symbol_index.py reference/vanilla_data
+    python3 symbol_index.py "reference/AI-Allies (Overhaul)" --rebuild
+"""
+
+import hashlib
+import json
+import re
+import os
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
+
+from stats_parser import find_stats_files, load_stats_file
+
+# Bump whenever the schema or the indexed content changes
+INDEX_VERSION = 5
+
+# Pseudo stats type under which RootTemplate UUIDs are indexed
+TEMPLATE_TYPE = "RootTemplate"
+
+# Pseudo stats type under which localization handles (without ";version") are indexed
+LOCA_TYPE = "TranslatedString"
+
+# Pseudo stats type under which MultiEffectInfo UUIDs used by stats are indexed
+EFFECT_TYPE = "Effect"
+
+# Pseudo stats type under which the icon names stats use are indexed
+ICON_TYPE = "Icon"
+
+# Pseudo stats types of ``new equipment`` / ``new spellset`` definitions
+EQUIPMENT_TYPE = "Equipment"
+SPELLSET_TYPE = "SpellSet"
+
+# Pseudo stats types of the names those definitions list (``entry`` holds the set)
+EQUIPMENT_ENTRY_TYPE = "EquipmentEntry"
+SPELLSET_SPELL_TYPE = "SpellSetSpell"
+
+# Set members, effect UUIDs and icons are uses of a name, not definitions; untyped
+# lookups skip them
+_MEMBER_TYPES = (EQUIPMENT_ENTRY_TYPE, SPELLSET_SPELL_TYPE, EFFECT_TYPE, ICON_TYPE)
+_NOT_MEMBER = f"type NOT IN ({','.join('?' * len(_MEMBER_TYPES))})"
+
+PSEUDO_TYPES = frozenset({
+    TEMPLATE_TYPE, LOCA_TYPE, EFFECT_TYPE, ICON_TYPE, EQUIPMENT_TYPE, SPELLSET_TYPE, EQUIPMENT_ENTRY_TYPE, SPELLSET_SPELL_TYPE,
+})
+
+# Stats properties whose values are localization handles
+TRANSLATED_KEYS = frozenset({"DisplayName", "Description", "ExtraDescription"})
+
+# Stats properties whose values hold MultiEffectInfo UUIDs (older entries may
+# also name effects directly, e.g. "VFX_...:Dummy_FX_01"; only UUIDs are indexed)
+EFFECT_KEYS = frozenset({
+    "ApplyEffect", "BeamEffect", "CastEffect", "DisappearEffect", "EndEffect", "HitEffect", "ImpactEffect",
+    "PositionEffect", "PrepareEffect", "PreviewEffect", "ReappearEffect", "StatusEffect", "StatusEffectOnTurn",
+    "StatusEffectOverride", "StatusEffectOverrideForItems", "TargetEffect",
+})
+
+# Every stats property the index reads; other values are never decoded
+_INDEXED_KEYS = frozenset({TEMPLATE_TYPE, ICON_TYPE}) | TRANSLATED_KEYS | EFFECT_KEYS
+
+_UUID_PATTERN = re.compile(r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}')
+
+# Names per query in lookup_many (SQLite's default limit is 999 host parameters)
+_LOOKUP_BATCH = 500
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / ".symbol_index"
+
+_SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE symbols (
+    type TEXT NOT NULL,
+    name TEXT NOT NULL,
+    file TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    entry TEXT
+);
+CREATE INDEX symbols_by_name ON symbols (type, name);
+CREATE INDEX symbols_by_file ON symbols (file);
+"""
+
+
+class Symbol(NamedTuple):
+    """A single definition in a reference dump."""
+    type: str
+    name: str
+    file: str
+    line: int
+    entry: Optional[str]
+
+
+class SymbolIndex:
+    """Read-only view over one dump directory's SQLite index.
+
+    File paths are stored relative to ``root``. When a name is defined more
+    than once (e.g. in both ``Gustav`` and ``GustavDev``), the definition
+    loaded last wins, matching the game's load order.
+    """
+
+    def __init__(self, db_path: Path, root: Path):
+        self.db_path = db_path
+        self.root = root
+        self._conn = sqlite3.connect(f"{db_path.as_uri()}?mode=ro", uri=True)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "SymbolIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __contains__(self, name: str) -> bool:
+        row = self._conn.execute(
+            f"SELECT 1 FROM symbols WHERE name = ? AND {_NOT_MEMBER} LIMIT 1", (name, *_MEMBER_TYPES)
+        ).fetchone()
+        return row is not None
+
+    def lookup(self, name: str, type_name: Optional[str] = None) -> Optional[Symbol]:
+        """Return the winning definition of ``name`` (optionally of one stats type)."""
+        if type_name is None:
+            query = (f"SELECT type, name, file, line, entry FROM symbols WHERE name = ? AND {_NOT_MEMBER} "
+                     "ORDER BY rowid DESC LIMIT 1")
+            params: Tuple = (name, *_MEMBER_TYPES)
+        else:
+            query = "SELECT type, name, file, line, entry FROM symbols WHERE type = ? AND name = ? ORDER BY rowid DESC LIMIT 1"
+            params = (type_name, name)
+        row = self._conn.execute(query, params).fetchone()
+        return Symbol(*row) if row else None
+
+    def lookup_many(self, names: Iterable[str], type_names: Optional[Iterable[str]] = None) -> Dict[str, Symbol]:
+        """Return the winning definition of each name that has one.
+
+        Names are looked up a batch at a time instead of one query per name.
+        ``type_names`` limits the lookup to those stats types; without it,
+        names only used by stats or sets (effect UUIDs, icons, set members) are
+        skipped as in :meth:`lookup`.
+        """
+        names = list(dict.fromkeys(names))
+        type_filter = f" AND {_NOT_MEMBER}"
+        type_params: Tuple = _MEMBER_TYPES
+        if type_names is not None:
+            type_params = tuple(type_names)
+            type_filter = f" AND type IN ({','.join('?' * len(type_params))})"
+
+        found: Dict[str, Symbol] = {}
+        for start in range(0, len(names), _LOOKUP_BATCH):
+            batch = names[start:start + _LOOKUP_BATCH]
+            rows = self._conn.execute(
+                f"SELECT type, name, file, line, entry FROM symbols "
+                f"WHERE name IN ({','.join('?' * len(batch))}){type_filter} ORDER BY rowid",
+                (*batch, *type_params),
+            )
+            for row in rows:
+                found[row[1]] = Symbol(*row)
+        return found
+
+    def names(self, type_name: str, files: Optional[Iterable[Union[str, Path]]] = None) -> Set[str]:
+        """Return every name of ``type_name``, optionally limited to some files.
+
+        ``files`` may be absolute or relative to the index root.
+        """
+        if files is None:
+            rows = self._conn.execute("SELECT name FROM symbols WHERE type = ?", (type_name,))
+            return {name for (name,) in rows}
+
+        rel_files = [self._relative(f) for f in files]
+        if not rel_files:
+            return set()
+        placeholders = ",".join("?" * len(rel_files))
+        rows = self._conn.execute(
+            f"SELECT name FROM symbols WHERE type = ? AND file IN ({placeholders})",
+            (type_name, *rel_files),
+        )
+        return {name for (name,) in rows}
+
+    def definitions(self, type_name: str) -> Dict[str, Tuple[str, int]]:
+        """Map each name of ``type_name`` to its winning ``(file, line)``."""
+        rows = self._conn.execute(
+            "SELECT name, file, line FROM symbols WHERE type = ? ORDER BY rowid", (type_name,)
+        )
+        root = self.root
+        return {name: (str(root / file), line) for name, file, line in rows}
+
+    def counts(self) -> Dict[str, int]:
+        """Number of indexed definitions per stats type."""
+        rows = self._conn.execute("SELECT type, COUNT(*) FROM symbols GROUP BY type ORDER BY type")
+        return dict(rows)
+
+    def meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _relative(self, path: Union[str, Path]) -> str:
+        path = Path(path)
+        if path.is_absolute():
+            try:
+                return path.resolve().relative_to(self.root).as_posix()
+            except ValueError:
+                pass
+        return path.as_posix()
+
+
+def _dump_files(root: Path) -> List[Path]:
+    return sorted(find_stats_files(root))
+
+
+def _stat_signature(root: Path, files: List[Path]) -> str:
+    signature = []
+    for file_path in files:
+        st = file_path.stat()
+        signature.append([file_path.relative_to(root).as_posix(), st.st_mtime_ns, st.st_size])
+    return json.dumps(signature, separators=(",", ":"))
+
+
+def _content_hash(root: Path, files: List[Path]) -> str:
+    sha256 = hashlib.sha256()
+    for file_path in files:
+        sha256.update(file_path.relative_to(root).as_posix().encode("utf-8"))
+        sha256.update(b"\0")
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                sha256.update(chunk)
+        sha256.update(b"\0")
+    return sha256.hexdigest()
+
+
+def _read_meta(db_path: Path) -> Dict[str, str]:
+    try:
+        conn = sqlite3.connect(f"{db_path.as_uri()}?mode=ro", uri=True)
+    except sqlite3.Error:
+        return {}
+    try:
+        return dict(conn.execute("SELECT key, value FROM meta"))
+    except sqlite3.Error:
+        return {}
+    finally:
+        conn.close()
+
+
+def _write_index(db_path: Path, root: Path, files: List[Path], content_hash: str, signature: str) -> None:
+    """Build the index into a temporary file and atomically move it into place."""
+    tmp_path = db_path.with_name(f"{db_path.name}.{os.getpid()}.tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    rows = []
+    for file_path in files:
+        try:
+            stats = load_stats_file(file_path)
+        except (OSError, UnicodeDecodeError):
+            continue
+        rel = file_path.relative_to(root).as_posix()
+        for entry in stats.entries:
+            if entry.kind == "equipment" or entry.kind == "spellset":
+                set_type, member_key, member_type = (
+                    (EQUIPMENT_TYPE, "equipment entry", EQUIPMENT_ENTRY_TYPE) if entry.kind == "equipment"
+                    else (SPELLSET_TYPE, "spell", SPELLSET_SPELL_TYPE)
+                )
+                rows.append((set_type, entry.name, rel, entry.line, None))
+                for key, value, line_num in entry.items((member_key,)):
+                    if value:
+                        rows.append((member_type, value, rel, line_num, entry.name))
+                continue
+            if entry.kind != "entry":
+                continue
+            rows.append((entry.type or "", entry.name, rel, entry.line, None))
+            for key, value, line_num in entry.items(_INDEXED_KEYS):
+                if key == TEMPLATE_TYPE:
+                    rows.append((TEMPLATE_TYPE, value, rel, line_num, entry.name))
+                elif key in TRANSLATED_KEYS and value:
+                    rows.append((LOCA_TYPE, value.partition(";")[0], rel, line_num, entry.name))
+                elif key == ICON_TYPE and value:
+                    rows.append((ICON_TYPE, value, rel, line_num, entry.name))
+                elif key in EFFECT_KEYS and value:
+                    for uuid in _UUID_PATTERN.findall(value):
+                        rows.append((EFFECT_TYPE, uuid.lower(), rel, line_num, entry.name))
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(_SCHEMA)
+        conn.executemany("INSERT INTO symbols VALUES (?, ?, ?, ?, ?)", rows)
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ("version", str(INDEX_VERSION)),
+            ("root", str(root)),
+            ("content_hash", content_hash),
+            ("stat_signature", signature),
+        ])
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, db_path)
+
+
+def _update_signature(db_path: Path, signature: str) -> None:
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("UPDATE meta SET value = ? WHERE key = 'stat_signature'", (signature,))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def index_path_for(root: Union[str, Path], cache_dir: Optional[Union[str, Path]] = None) -> Path:
+    """Return the SQLite file used to index ``root``."""
+    root = Path(root).resolve()
+    cache_dir = Path(cache_dir).resolve() if cache_dir else DEFAULT_CACHE_DIR
+    slug = hashlib.sha1(str(root).encode("utf-8")).hexdigest()[:12]
+    return cache_dir / f"{root.name.replace(' ', '_')}-{slug}.v{INDEX_VERSION}.sqlite"
+
+
+def open_symbol_index(root: Union[str, Path], cache_dir: Optional[Union[str, Path]] = None,
+                      rebuild: bool = False) -> SymbolIndex:
+    """Open the symbol index for a dump directory, (re)building it if stale.
+
+    Args:
+        root: Dump directory (e.g. ``reference/vanilla_data``)
+        cache_dir: Where index files live (default: ``reference/.symbol_index``)
+        rebuild: Force a rebuild even if the existing index is current
+
+    Returns:
+        A read-only SymbolIndex
+    """
+    root = Path(root).resolve()
+    db_path = index_path_for(root, cache_dir)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    files = _dump_files(root)
+    signature = _stat_signature(root, files)
+
+    meta = {} if rebuild or not db_path.exists() else _read_meta(db_path)
+    if meta.get("version") == str(INDEX_VERSION):
+        if meta.get("stat_signature") == signature:
+            return SymbolIndex(db_path, root)
+        content_hash = _content_hash(root, files)
+        if meta.get("content_hash") == content_hash:
+            _update_signature(db_path, signature)
+            return SymbolIndex(db_path, root)
+    else:
+        content_hash = _content_hash(root, files)
+
+    _write_index(db_path, root, files, content_hash, signature)
+    return SymbolIndex(db_path, root)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    target = sys.argv[1]
+    rebuild = "--rebuild" in sys.argv
+
+    if not os.path.isdir(target):
+        print(f"❌ Error: Path must be a directory: {target}")
+        sys.exit(1)
+
+    with open_symbol_index(target, rebuild=rebuild) as index:
+        print(f"📚 Symbol index: {index.db_path}")
+        print(f"   Content hash: {index.meta('content_hash')}")
+        for type_name, count in index.counts().items():
+            print(f"   {type_name or '(untyped)':20s} {count}")
+
+
+if __name__ == "__main__":
+    main()
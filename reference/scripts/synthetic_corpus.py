@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Synthetic Mod Corpus Generator
+
+Builds a deterministic, seeded corpus ``scale`` times the size of a real mod
+for scaling benchmarks. Copy 0 is the mod itself, unchanged. Each further copy
+is a mutated clone of its stats files (``Stats/**/*.txt``: spells, items,
+statuses, treasure tables, equipment, item combos), its root templates and
+its localization:
+
+- every stats name the mod defines gets a per-copy tag after its first
+  word (``ELDER_Ring_1`` -> ``ELDER_S0001_Ring_1``), so type prefixes and
+  derived names such as an item combo's ``<name>_1`` result still line up;
+  ``I_``/``T_`` treasure references are renamed with it
+- every template MapKey and localization handle the mod defines is replaced
+  by a fresh seeded GUID, and references to them are rewritten to match
+- ``RootTemplate`` lines binding a vanilla template are dropped, since a
+  template may only back one stats entry
+- the order of entries in each stats file and of strings in each
+  localization file is shuffled
+
+References to vanilla names, effects and icons are kept, so every copy
+resolves the same way the real mod does and carries the same reference
+density. Copy ``n`` depends only on the seed, not on the scale, so a 10×
+corpus is a prefix of the 100× one.
+
+Layout of the output directory (mirroring a workspace checkout):
+
+    Public/<Mod>/                                 the real mod (copy 0)
+    Public/<Mod>/Stats/.../Synthetic/Copy0001/    stats files of copy 1, next to the originals
+    Public/<Mod>/RootTemplates/Synthetic_0001_*   root templates of copy 1
+    Public/Game/GUI/                              shared DDS icons, if present
+    Localization/English/Synthetic_0001_*         strings of copy 1, next to the real ones
+    Mods/<Mod>/                                   the real mod metadata
+
+Usage:
+    python3 synthetic_corpus.py <path_to_mod_directory> <output_directory> [--scale N] [--seed N]
+
+Example:
+    python3 synthetic_corpus.py Public/EldertideArmament/ /tmp/corpus_100x --scale 100
+    python3 eldertide_validate.py /tmp/corpus_100x/Public/EldertideArmament/
+"""
+
+import argparse
+import os
+import random
+import re
+import shutil
+import sys
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from validate_localization import mod_localization_dirs
+
+# Block starts: every stats definition except treasure subtables, which stay
+# with the table they belong to
+_BLOCK_PATTERN = re.compile(r'^new (?!subtable\b)', re.MULTILINE)
+_DEFINITION_PATTERN = re.compile(r'^new (?!subtable\b)\w+ "([^"\n]+)"', re.MULTILINE)
+_MAPKEY_PATTERN = re.compile(r'<attribute id="MapKey" type="FixedString" value="([0-9a-fA-F-]{36})"')
+_CONTENT_PATTERN = re.compile(r'^\s*<content contentuid="(h[0-9a-g]{36})"', re.MULTILINE)
+_ROOT_TEMPLATE_PATTERN = re.compile(r'^[ \t]*data "RootTemplate" "([^"\n]*)"[^\n]*\n', re.MULTILINE)
+
+# A GUID or a single identifier; everything between two tokens is copied as is
+_TOKEN_PATTERN = re.compile(
+    r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|\w+'
+)
+
+# Treasure tables refer to items and tables through these prefixes
+_REFERENCE_PREFIXES = ("I_", "T_")
+
+DEFAULT_SEED = 1
+
+NAME, GUID, HANDLE = "name", "guid", "handle"
+
+# A compiled text: literal strings and (kind, original) slots to substitute
+Pieces = List[Union[str, Tuple[str, str]]]
+
+
+class CorpusTemplate:
+    """The rewritable parts of a mod, compiled once and rendered per copy.
+
+    Each file is split into a header and blocks (stats entries or
+    localization strings), and each block into literal text and slots for
+    the names, MapKeys and handles the mod defines. Rendering a copy only
+    joins pieces, so a large corpus costs one tokenizer pass over the mod.
+    """
+
+    def __init__(self, mod_dir: Union[str, Path]):
+        self.mod_dir = Path(mod_dir)
+        self.names: Set[str] = set()
+        self.guids: Set[str] = set()
+        self.handles: Set[str] = set()
+
+        stats_paths = sorted((self.mod_dir / "Stats").rglob("*.txt"))
+        template_paths = sorted(self.mod_dir.glob("RootTemplates/*.lsx"))
+        loca_paths = [p for d in mod_localization_dirs(self.mod_dir) for p in sorted(d.rglob("*.loca.xml"))]
+
+        texts = {path: path.read_text(encoding="utf-8") for path in [*stats_paths, *template_paths, *loca_paths]}
+        for path in stats_paths:
+            self.names.update(_DEFINITION_PATTERN.findall(texts[path]))
+        for path in template_paths:
+            self.guids.update(g.lower() for g in _MAPKEY_PATTERN.findall(texts[path]))
+        for path in stats_paths:
+            texts[path] = _ROOT_TEMPLATE_PATTERN.sub(
+                lambda m: m.group() if m.group(1).lower() in self.guids else "", texts[path])
+        for path in loca_paths:
+            self.handles.update(_CONTENT_PATTERN.findall(texts[path]))
+
+        # source path -> compiled text; stats and localization files as
+        # (header, blocks, footer) so each copy can shuffle the blocks
+        self.stats: Dict[Path, Tuple[Pieces, List[Pieces], Pieces]] = {
+            path: self._split(texts[path], _BLOCK_PATTERN, (NAME, GUID, HANDLE)) for path in stats_paths
+        }
+        self.templates: Dict[Path, Pieces] = {
+            path: self._compile(texts[path], (NAME, GUID, HANDLE)) for path in template_paths
+        }
+        self.loca: Dict[Path, Tuple[Pieces, List[Pieces], Pieces]] = {
+            path: self._split_lines(texts[path]) for path in loca_paths
+        }
+
+    def _compile(self, text: str, kinds: Sequence[str]) -> Pieces:
+        """Split ``text`` into literal runs and slots for the given kinds of symbol."""
+        pieces: Pieces = []
+        literal_start = 0
+
+        for match in _TOKEN_PATTERN.finditer(text):
+            token = match.group()
+            slot = None
+            if NAME in kinds and token in self.names:
+                slot, start = (NAME, token), match.start()
+            elif NAME in kinds and token[:2] in _REFERENCE_PREFIXES and token[2:] in self.names:
+                slot, start = (NAME, token[2:]), match.start() + 2
+            elif GUID in kinds and token.lower() in self.guids:
+                slot, start = (GUID, token.lower()), match.start()
+            elif HANDLE in kinds and token in self.handles:
+                slot, start = (HANDLE, token), match.start()
+            if slot is None:
+                continue
+            if start > literal_start:
+                pieces.append(text[literal_start:start])
+            pieces.append(slot)
+            literal_start = match.end()
+
+        if literal_start < len(text):
+            pieces.append(text[literal_start:])
+        return pieces
+
+    def _split(self, text: str, pattern: "re.Pattern", kinds: Sequence[str]) -> Tuple[Pieces, List[Pieces], Pieces]:
+        """Split a stats file at each definition into (header, blocks, footer)."""
+        starts = [m.start() for m in pattern.finditer(text)]
+        if not starts:
+            return self._compile(text, kinds), [], []
+        blocks = []
+        for start, end in zip(starts, starts[1:] + [len(text)]):
+            block = text[start:end]
+            blocks.append(self._compile(block if block.endswith("\n") else block + "\n", kinds))
+        return self._compile(text[:starts[0]], kinds), blocks, []
+
+    def _split_lines(self, text: str) -> Tuple[Pieces, List[Pieces], Pieces]:
+        """Split a localization file into (header, one block per string, footer)."""
+        lines = text.splitlines(keepends=True)
+        content = [i for i, line in enumerate(lines) if _CONTENT_PATTERN.match(line)]
+        if not content:
+            return self._compile(text, (HANDLE,)), [], []
+        first, last = content[0], content[-1]
+        return (self._compile("".join(lines[:first]), (HANDLE,)),
+                [self._compile(line, (HANDLE,)) for line in lines[first:last + 1]],
+                self._compile("".join(lines[last + 1:]), (HANDLE,)))
+
+    def render_copy(self, output_dir: Path, copy: int, seed: int = DEFAULT_SEED) -> None:
+        """Write mutated copy number ``copy`` (1 or more) into the corpus at ``output_dir``."""
+        rng = random.Random(f"{seed}:{copy}")
+        names = {name: rename(name, copy) for name in self.names}
+        guids = {g: str(uuid.UUID(int=rng.getrandbits(128), version=4)) for g in sorted(self.guids)}
+        handles = {h: "h" + str(uuid.UUID(int=rng.getrandbits(128), version=4)).replace("-", "g")
+                   for h in sorted(self.handles)}
+
+        def render(pieces: Pieces, out: List[str]) -> None:
+            for piece in pieces:
+                if type(piece) is str:
+                    out.append(piece)
+                elif piece[0] == NAME:
+                    out.append(names[piece[1]])
+                elif piece[0] == GUID:
+                    out.append(guids[piece[1]])
+                else:
+                    out.append(handles[piece[1]])
+
+        def render_file(header: Pieces, blocks: List[Pieces], footer: Pieces) -> str:
+            order = list(range(len(blocks)))
+            rng.shuffle(order)
+            out: List[str] = []
+            render(header, out)
+            for i in order:
+                render(blocks[i], out)
+            render(footer, out)
+            return "".join(out)
+
+        output_mod_dir = output_dir / "Public" / self.mod_dir.name
+        prefix = f"Synthetic_{copy:04d}_"
+        for path, parts in self.stats.items():
+            relative = path.relative_to(self.mod_dir)
+            _write(output_mod_dir / relative.parent / "Synthetic" / f"Copy{copy:04d}" / path.name,
+                   render_file(*parts))
+        for path, pieces in self.templates.items():
+            out: List[str] = []
+            render(pieces, out)
+            _write(output_mod_dir / path.relative_to(self.mod_dir).parent / (prefix + path.name), "".join(out))
+        for path, parts in self.loca.items():
+            _write(output_dir / "Localization" / path.parent.name / (prefix + path.name), render_file(*parts))
+
+
+def rename(name: str, copy: int) -> str:
+    """Return the name of stats entry ``name`` in copy number ``copy``."""
+    tag = f"S{copy:04d}"
+    head, sep, tail = name.partition("_")
+    return f"{head}_{tag}_{tail}" if sep else f"{tag}_{name}"
+
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def generate_corpus(mod_dir: Union[str, Path], output_dir: Union[str, Path], scale: int,
+                    seed: int = DEFAULT_SEED, template: Optional["CorpusTemplate"] = None) -> Path:
+    """Write a corpus ``scale`` times the size of ``mod_dir`` into ``output_dir``.
+
+    ``template`` lets callers generating several scales compile the mod once.
+
+    Returns:
+        The corpus's mod directory, to validate or benchmark
+
+    Raises:
+        ValueError: If ``scale`` is below 1.
+        FileExistsError: If ``output_dir`` exists and is not empty.
+    """
+    if scale < 1:
+        raise ValueError(f"Scale must be at least 1, got {scale}")
+    mod_dir = Path(mod_dir).resolve()
+    output_dir = Path(output_dir)
+    if output_dir.exists() and any(output_dir.iterdir()):
+        raise FileExistsError(f"Output directory is not empty: {output_dir}")
+    if template is None:
+        template = CorpusTemplate(mod_dir)
+
+    output_mod_dir = output_dir / "Public" / mod_dir.name
+    shutil.copytree(mod_dir, output_mod_dir)
+
+    workspace = mod_dir.parent.parent if mod_dir.parent.name == "Public" else None
+    if workspace is not None:
+        for source, target in ((mod_dir.parent / "Game" / "GUI", output_dir / "Public" / "Game" / "GUI"),
+                               (workspace / "Localization", output_dir / "Localization"),
+                               (workspace / "Mods" / mod_dir.name, output_dir / "Mods" / mod_dir.name)):
+            if source.is_dir():
+                shutil.copytree(source, target, dirs_exist_ok=True)
+
+    for copy in range(1, scale):
+        template.render_copy(output_dir, copy, seed)
+
+    return output_mod_dir
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    parser = argparse.ArgumentParser(description="Synthetic Mod Corpus Generator")
+    parser.add_argument("target", help="Path to the mod directory to clone")
+    parser.add_argument("output", help="Directory to write the corpus to (must be empty or missing)")
+    parser.add_argument("--scale", type=int, default=10,
+                        help="Size of the corpus as a multiple of the mod (default: 10).")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED,
+                        help=f"Seed for renamed GUIDs and shuffled order (default: {DEFAULT_SEED}).")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.target):
+        print(f"❌ Error: Path must be a directory: {args.target}")
+        sys.exit(1)
+
+    try:
+        corpus = generate_corpus(args.target, args.output, args.scale, args.seed)
+    except (ValueError, FileExistsError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    size = sum(p.stat().st_size for p in Path(args.output).rglob("*") if p.is_file())
+    print(f"✅ Generated {args.scale}× corpus ({size / 1024 / 1024:.1f} MB, seed {args.seed})")
+    print(f"   Mod directory: {corpus}")
+
+
+if __name__ == "__main__":
+    main()
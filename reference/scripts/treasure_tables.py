@@ -0,0 +1,554 @@
+#!/usr/bin/env python3
+"""
+BG3 Treasure Table Parser and Drop Simulator
+
+Parses ``Stats/Generated/TreasureTable.txt`` files into tables, subtables and
+objects, merges them in load order (a later ``new treasuretable`` with
+``CanMerge 1`` appends its subtables to an existing table of the same name,
+without it the table is replaced) and estimates per-item drop probabilities
+by Monte Carlo simulation.
+
+How a table is rolled:
+
+- every subtable of the table is rolled independently
+- ``new subtable "0,5;1,1"`` lists ``amount,weight`` pairs: the number of
+  objects dropped is drawn with those weights (here 0 with weight 5 and 1 with
+  weight 1, i.e. one object in 1 of 6 rolls)
+- ``new subtable "-N"`` drops every object of the subtable N times
+- each drawn object is picked by its frequency (the first number after the
+  name); ``I_<stats entry>`` is an item, ``T_<table>`` rolls that table, any
+  other name is a generated item category and is reported as is
+- ``StartLevel``/``EndLevel`` limit a subtable to a level range
+
+With NumPy installed all rolls of a subtable are drawn at once, so millions of
+rolls take seconds; without it the same model runs roll by roll in pure Python.
+
+Usage:
+    python3 treasure_tables.py <path_to_mod_directory> [--include DIR ...]
+                               [--table NAME ...] [--rolls N] [--seed N] [--level N]
+
+Example:
+    python3 treasure_tables.py Public/EldertideArmament/
+    python3 treasure_tables.py Public/EldertideArmament/ --table ELDER_Consumables_Pool --rolls 1000000
+    python3 treasure_tables.py Public/EldertideArmament/ --table DEN_BardChest --seed 7 --level 4
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
+
+import profiling
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+# Name prefixes of object categories
+ITEM_PREFIX = "I_"
+TABLE_PREFIX = "T_"
+
+# Number of comma-separated fields after an object's name (frequency + 7 rarity counts)
+OBJECT_FIELDS = 8
+
+DEFAULT_ROLLS = 100_000
+
+_TABLE_PATTERN = re.compile(r'new treasuretable "([^"]+)"\s*$')
+_SUBTABLE_PATTERN = re.compile(r'new subtable "([^"]*)"\s*$')
+_OBJECT_PATTERN = re.compile(r'object category "([^"]+)",(.*)$')
+_LEVEL_PATTERN = re.compile(r'(StartLevel|EndLevel) "([^"]*)"\s*$')
+_CAN_MERGE_PATTERN = re.compile(r'CanMerge (\d+)\s*$')
+_IGNORED_PREFIXES = ("//", "- -", "treasure itemtypes ")
+
+
+class TreasureObject(NamedTuple):
+    """One ``object category`` line."""
+    name: str
+    frequency: int
+    line: int
+
+
+class TreasureSubtable:
+    """One ``new subtable`` block.
+
+    ``drops`` holds the ``(amount, weight)`` pairs of the drop spec and
+    ``repeat`` is N for a ``"-N"`` spec (0 otherwise). An invalid spec leaves
+    both empty, so the subtable never drops anything.
+    """
+
+    __slots__ = ("spec", "drops", "repeat", "start_level", "end_level", "objects", "line", "path")
+
+    def __init__(self, spec: str, line: int, path: str):
+        self.spec = spec
+        self.drops: Tuple[Tuple[int, int], ...] = ()
+        self.repeat = 0
+        self.start_level: Optional[int] = None
+        self.end_level: Optional[int] = None
+        self.objects: List[TreasureObject] = []
+        self.line = line
+        self.path = path
+
+    def __repr__(self) -> str:
+        return f"TreasureSubtable({self.spec!r} @ {self.path}:{self.line})"
+
+    def active_at(self, level: Optional[int]) -> bool:
+        """Whether the subtable is rolled at ``level`` (None: any level)."""
+        if level is None:
+            return True
+        if self.start_level is not None and level < self.start_level:
+            return False
+        if self.end_level is not None and level > self.end_level:
+            return False
+        return True
+
+
+class TreasureTable:
+    """One ``new treasuretable`` block, or the merge of several."""
+
+    __slots__ = ("name", "can_merge", "subtables", "path", "line")
+
+    def __init__(self, name: str, line: int, path: str):
+        self.name = name
+        self.can_merge = False
+        self.subtables: List[TreasureSubtable] = []
+        self.line = line
+        self.path = path
+
+    def __repr__(self) -> str:
+        return f"TreasureTable({self.name!r} @ {self.path}:{self.line})"
+
+    def objects(self) -> Iterable[TreasureObject]:
+        for subtable in self.subtables:
+            yield from subtable.objects
+
+
+class TreasureFile:
+    """The tables of one TreasureTable.txt, in file order.
+
+    ``problems`` lists ``(line, text, message)`` for every line that could not
+    be read.
+    """
+
+    __slots__ = ("path", "tables", "problems")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tables: List[TreasureTable] = []
+        self.problems: List[Tuple[int, str, str]] = []
+
+
+def object_kind(name: str) -> str:
+    """Return "item", "table" or "category" for an object category name."""
+    if name.startswith(ITEM_PREFIX):
+        return "item"
+    if name.startswith(TABLE_PREFIX):
+        return "table"
+    return "category"
+
+
+def parse_drop_spec(spec: str) -> Tuple[Tuple[Tuple[int, int], ...], int]:
+    """Parse a subtable spec into ``(amount, weight)`` pairs and a repeat count.
+
+    Raises:
+        ValueError: If the spec is malformed or its weights sum to zero.
+    """
+    text = spec.strip()
+    if text.startswith("-"):
+        if not text[1:].isdigit() or int(text[1:]) == 0:
+            raise ValueError(f"'{spec}' is not a valid '-N' drop-all count")
+        return (), int(text[1:])
+
+    drops = []
+    for pair in text.split(";"):
+        fields = [field.strip() for field in pair.split(",")]
+        if len(fields) != 2 or not all(field.isdigit() for field in fields):
+            raise ValueError(f"'{pair.strip()}' is not an 'amount,weight' pair")
+        drops.append((int(fields[0]), int(fields[1])))
+    if not sum(weight for _, weight in drops):
+        raise ValueError("Drop weights sum to zero")
+    return tuple(drops), 0
+
+
+def parse_treasure_text(text: str, path: str = "") -> TreasureFile:
+    """Parse the contents of a TreasureTable.txt into a :class:`TreasureFile`."""
+    result = TreasureFile(path)
+    problems = result.problems
+    table: Optional[TreasureTable] = None
+    subtable: Optional[TreasureSubtable] = None
+
+    for line_num, raw in enumerate(text.splitlines(), 1):
+        line = raw.strip()
+        if not line or line.startswith(_IGNORED_PREFIXES):
+            continue
+
+        match = _OBJECT_PATTERN.match(line)
+        if match:
+            fields = [field.strip() for field in match.group(2).split(",")]
+            if len(fields) != OBJECT_FIELDS or not all(field.isdigit() for field in fields):
+                problems.append((line_num, line, f"Expected {OBJECT_FIELDS} whole numbers after the name"))
+            elif subtable is None:
+                problems.append((line_num, line, "Object outside of any subtable"))
+            else:
+                subtable.objects.append(TreasureObject(match.group(1), int(fields[0]), line_num))
+            continue
+
+        match = _SUBTABLE_PATTERN.match(line)
+        if match:
+            if table is None:
+                problems.append((line_num, line, "Subtable outside of any treasure table"))
+                subtable = None
+                continue
+            subtable = TreasureSubtable(match.group(1), line_num, path)
+            try:
+                subtable.drops, subtable.repeat = parse_drop_spec(match.group(1))
+            except ValueError as e:
+                problems.append((line_num, line, f"Invalid drop spec: {e}"))
+            table.subtables.append(subtable)
+            continue
+
+        match = _TABLE_PATTERN.match(line)
+        if match:
+            table = TreasureTable(match.group(1), line_num, path)
+            subtable = None
+            result.tables.append(table)
+            continue
+
+        match = _LEVEL_PATTERN.match(line)
+        if match and subtable is not None:
+            if not match.group(2).isdigit():
+                problems.append((line_num, line, f"{match.group(1)} must be a whole number"))
+            elif match.group(1) == "StartLevel":
+                subtable.start_level = int(match.group(2))
+            else:
+                subtable.end_level = int(match.group(2))
+            continue
+
+        match = _CAN_MERGE_PATTERN.match(line)
+        if match and table is not None:
+            table.can_merge = match.group(1) == "1"
+            continue
+
+        problems.append((line_num, line, "Unrecognised treasure table line"))
+
+    return result
+
+
+def load_treasure_file(path: Union[str, Path]) -> TreasureFile:
+    """Parse one TreasureTable.txt.
+
+    Raises:
+        OSError: If the file cannot be read.
+        UnicodeDecodeError: If the file is not valid UTF-8.
+    """
+    with open(path, "r", encoding="utf-8-sig") as f:
+        return parse_treasure_text(f.read(), str(path))
+
+
+def find_treasure_files(directory: Union[str, Path]) -> List[Path]:
+    """Return every TreasureTable.txt under ``directory``, in load order."""
+    return sorted(Path(directory).rglob("TreasureTable.txt"))
+
+
+class TreasureTables:
+    """Every table of a set of TreasureTable.txt files, merged in load order.
+
+    ``definitions`` keeps each ``new treasuretable`` block by name, ``tables``
+    the merged view the game rolls.
+    """
+
+    def __init__(self, files: Sequence[TreasureFile]):
+        self.files = list(files)
+        self.definitions: Dict[str, List[TreasureTable]] = defaultdict(list)
+        self.tables: Dict[str, TreasureTable] = {}
+        for treasure_file in self.files:
+            for table in treasure_file.tables:
+                self.definitions[table.name].append(table)
+                existing = self.tables.get(table.name)
+                if existing is not None and table.can_merge:
+                    merged = TreasureTable(existing.name, existing.line, existing.path)
+                    merged.can_merge = existing.can_merge
+                    merged.subtables = existing.subtables + table.subtables
+                    self.tables[table.name] = merged
+                else:
+                    self.tables[table.name] = table
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.tables
+
+    def __len__(self) -> int:
+        return len(self.tables)
+
+    def get(self, name: str) -> Optional[TreasureTable]:
+        """Return the merged table ``name`` (with or without the ``T_`` prefix)."""
+        table = self.tables.get(name)
+        if table is None and name.startswith(TABLE_PREFIX):
+            table = self.tables.get(name[len(TABLE_PREFIX):])
+        return table
+
+    def dropped_items(self) -> Set[str]:
+        """Stats names (without ``I_``) of every item some table drops."""
+        return {
+            obj.name[len(ITEM_PREFIX):]
+            for table in self.tables.values()
+            for obj in table.objects()
+            if obj.name.startswith(ITEM_PREFIX)
+        }
+
+    def referenced_tables(self) -> Set[str]:
+        """Names (without ``T_``) of every table some object refers to."""
+        return {
+            obj.name[len(TABLE_PREFIX):]
+            for table in self.tables.values()
+            for obj in table.objects()
+            if obj.name.startswith(TABLE_PREFIX)
+        }
+
+
+@profiling.phase("parse:treasure")
+def load_treasure_tables(directories: Sequence[Union[str, Path]]) -> TreasureTables:
+    """Load the treasure tables under some directories, in load order.
+
+    Files that cannot be read are skipped.
+    """
+    files = []
+    for directory in directories:
+        for file_path in find_treasure_files(directory):
+            try:
+                files.append(load_treasure_file(file_path))
+            except (OSError, UnicodeDecodeError):
+                continue
+    return TreasureTables(files)
+
+
+# ============================================================================
+# Simulation
+# ============================================================================
+
+class DropRate(NamedTuple):
+    """Simulated outcome for one dropped name."""
+    chance: float  # share of rolls that drop it at least once
+    mean: float    # average number dropped per roll
+
+
+def _pickable(subtable: TreasureSubtable) -> List[TreasureObject]:
+    return [obj for obj in subtable.objects if obj.frequency > 0]
+
+
+def _cumulative(weights: Sequence[int]) -> List[int]:
+    total = 0
+    cumulative = []
+    for weight in weights:
+        total += weight
+        cumulative.append(total)
+    return cumulative
+
+
+def _nested(tables: TreasureTables, obj: TreasureObject, stack: Tuple[str, ...]) -> Optional[TreasureTable]:
+    """Return the table an object rolls, or None when it drops as a name."""
+    if not obj.name.startswith(TABLE_PREFIX):
+        return None
+    table = tables.get(obj.name)
+    if table is not None and table.name in stack:
+        raise ValueError("Treasure table cycle: " + " -> ".join(stack + (table.name,)))
+    return table
+
+
+def _roll_python(tables: TreasureTables, table: TreasureTable, rng: random.Random,
+                 level: Optional[int], stack: Tuple[str, ...], drops: List[str]) -> None:
+    stack = stack + (table.name,)
+    for subtable in table.subtables:
+        if not subtable.active_at(level):
+            continue
+        objects = _pickable(subtable)
+        if not objects:
+            continue
+        if subtable.repeat:
+            picked = objects * subtable.repeat
+        else:
+            amounts = [amount for amount, _ in subtable.drops]
+            count = rng.choices(amounts, cum_weights=_cumulative([w for _, w in subtable.drops]))[0] if amounts else 0
+            picked = rng.choices(objects, cum_weights=_cumulative([o.frequency for o in objects]), k=count)
+        for obj in picked:
+            nested = _nested(tables, obj, stack)
+            if nested is None:
+                drops.append(obj.name)
+            else:
+                _roll_python(tables, nested, rng, level, stack, drops)
+
+
+def _simulate_python(tables: TreasureTables, table: TreasureTable, rolls: int,
+                     seed: Optional[int], level: Optional[int]) -> Dict[str, DropRate]:
+    rng = random.Random(seed)
+    hits: Dict[str, int] = defaultdict(int)
+    totals: Dict[str, int] = defaultdict(int)
+    for _ in range(rolls):
+        drops: List[str] = []
+        _roll_python(tables, table, rng, level, (), drops)
+        for name in drops:
+            totals[name] += 1
+        for name in set(drops):
+            hits[name] += 1
+    return {name: DropRate(hits[name] / rolls, totals[name] / rolls) for name in totals}
+
+
+def _roll_numpy(tables: TreasureTables, table: TreasureTable, roll_ids, rng,
+                level: Optional[int], stack: Tuple[str, ...], drops: Dict[str, list]) -> None:
+    """Roll ``table`` once for every entry of ``roll_ids`` (ids may repeat)."""
+    stack = stack + (table.name,)
+    for subtable in table.subtables:
+        if not subtable.active_at(level) or not roll_ids.size:
+            continue
+        objects = _pickable(subtable)
+        if not objects:
+            continue
+
+        if subtable.repeat:
+            picked_ids = np.repeat(roll_ids, subtable.repeat)
+            groups = [picked_ids] * len(objects)
+        else:
+            if not subtable.drops:
+                continue
+            amounts = np.array([amount for amount, _ in subtable.drops])
+            cumulative = np.cumsum([weight for _, weight in subtable.drops])
+            draws = rng.random(roll_ids.size) * cumulative[-1]
+            counts = amounts[np.searchsorted(cumulative, draws, side="right")]
+            picked_ids = np.repeat(roll_ids, counts)
+            if len(objects) == 1:
+                groups = [picked_ids]
+            else:
+                cumulative = np.cumsum([obj.frequency for obj in objects])
+                choice = np.searchsorted(cumulative, rng.random(picked_ids.size) * cumulative[-1], side="right")
+                order = np.argsort(choice, kind="stable")
+                bounds = np.searchsorted(choice[order], np.arange(len(objects) + 1))
+                picked_ids = picked_ids[order]
+                groups = [picked_ids[bounds[i]:bounds[i + 1]] for i in range(len(objects))]
+
+        for obj, ids in zip(objects, groups):
+            if not ids.size:
+                continue
+            nested = _nested(tables, obj, stack)
+            if nested is None:
+                drops[obj.name].append(ids)
+            else:
+                _roll_numpy(tables, nested, ids, rng, level, stack, drops)
+
+
+def _simulate_numpy(tables: TreasureTables, table: TreasureTable, rolls: int,
+                    seed: Optional[int], level: Optional[int]) -> Dict[str, DropRate]:
+    rng = np.random.default_rng(seed)
+    drops: Dict[str, list] = defaultdict(list)
+    _roll_numpy(tables, table, np.arange(rolls), rng, level, (), drops)
+    # A scatter into one flag per roll is linear, where np.unique has to sort
+    seen = np.zeros(rolls, dtype=bool)
+    rates = {}
+    for name, chunks in drops.items():
+        seen[:] = False
+        total = 0
+        for ids in chunks:
+            seen[ids] = True
+            total += ids.size
+        rates[name] = DropRate(np.count_nonzero(seen) / rolls, total / rolls)
+    return rates
+
+
+def simulate(tables: TreasureTables, name: str, rolls: int = DEFAULT_ROLLS, seed: Optional[int] = None,
+             level: Optional[int] = None, vectorized: Optional[bool] = None) -> Dict[str, DropRate]:
+    """Estimate how often each item of a table drops.
+
+    Args:
+        tables: Merged treasure tables
+        name: Table to roll (with or without the ``T_`` prefix)
+        rolls: Number of independent rolls of the table
+        seed: Random seed; the NumPy and pure-Python paths draw different streams
+        level: Only roll subtables active at this level (None: all)
+        vectorized: Force (True) or disable (False) the NumPy path; by default
+                    it is used when NumPy is installed
+
+    Returns:
+        Dropped name -> DropRate. Names are ``I_`` items, generated item
+        categories and ``T_`` tables that are not defined in ``tables``.
+
+    Raises:
+        KeyError: If the table does not exist.
+        ValueError: If the table reaches itself through ``T_`` objects.
+    """
+    table = tables.get(name)
+    if table is None:
+        raise KeyError(name)
+    if vectorized is None:
+        vectorized = NUMPY_AVAILABLE
+    if vectorized and not NUMPY_AVAILABLE:
+        raise ValueError("NumPy is not installed")
+    if vectorized:
+        return _simulate_numpy(tables, table, rolls, seed, level)
+    return _simulate_python(tables, table, rolls, seed, level)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    from validate_references import DEFAULT_INCLUDE_DIRS
+
+    parser = argparse.ArgumentParser(description="BG3 Treasure Table Parser and Drop Simulator")
+    parser.add_argument("target", help="Mod directory (or any directory with TreasureTable.txt files)")
+    parser.add_argument(
+        "--include",
+        nargs="*",
+        default=[d for d in DEFAULT_INCLUDE_DIRS if os.path.isdir(d)],
+        help="Directories whose treasure tables load before the target's. Defaults to the bundled reference dumps.",
+    )
+    parser.add_argument("--table", nargs="+", default=[], help="Tables to simulate (default: list the target's tables).")
+    parser.add_argument("--rolls", type=int, default=DEFAULT_ROLLS, help=f"Rolls per table (default: {DEFAULT_ROLLS}).")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible runs.")
+    parser.add_argument("--level", type=int, default=None, help="Only roll subtables active at this level.")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.target):
+        print(f"❌ Error: Path must be a directory: {args.target}")
+        sys.exit(1)
+
+    tables = load_treasure_tables([d for d in args.include if os.path.isdir(d)] + [args.target])
+    target_tables = load_treasure_tables([args.target])
+    print(f"💰 Treasure tables: {len(tables)} ({len(target_tables)} in {args.target})")
+    print(f"   Simulator: {'NumPy (vectorized)' if NUMPY_AVAILABLE else 'pure Python (install NumPy for speed)'}")
+    print()
+
+    if not args.table:
+        for table in target_tables.tables.values():
+            merged = tables.get(table.name)
+            print(f"   {table.name}: {len(merged.subtables)} subtable(s)")
+        return
+
+    for name in args.table:
+        start = time.perf_counter()
+        try:
+            rates = simulate(tables, name, args.rolls, args.seed, args.level)
+        except KeyError:
+            print(f"❌ Error: Unknown treasure table: {name}")
+            sys.exit(1)
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+        elapsed = time.perf_counter() - start
+
+        print("=" * 70)
+        print(f"{name} ({args.rolls:,} rolls in {elapsed:.2f}s)")
+        print("=" * 70)
+        print(f"   {'Chance':>8}  {'Mean':>7}  Drop")
+        for drop, rate in sorted(rates.items(), key=lambda item: (-item[1].chance, item[0])):
+            print(f"   {rate.chance:8.2%}  {rate.mean:7.3f}  {drop}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,488 @@
+#!/usr/bin/env python3
+"""
+BG3 Item Combination (Recipe) Validator
+
+Builds the recipe graph of ``Stats/Generated/ItemCombos.txt``: every
+``new ItemCombination "X"`` lists its ingredients (``Type N``, ``Object N``,
+``Transform N``) and is paired by name with ``new ItemCombinationResult
+"X_1"``, whose ``Result N`` entries are what the recipe produces. Checks:
+
+- every ``Object N`` of type ``Object``, every ``Result N`` and every
+  ``PreviewStatsID`` names an item stats entry of the mod or the included
+  dumps, or a base-game item the dumps' treasure tables or recipes use
+- ingredient types and transforms are valid and ingredient numbers have no gaps
+- every combination has a result and every result has a combination
+- no two combinations take the same ingredients
+- every result of the mod can actually be crafted: each ingredient is a
+  base-game item, drops from a treasure table, has its RootTemplate used by a
+  stats property (e.g. ``Summon``), or is itself the result of such a recipe
+
+All files are read in one pass into hash maps and every check is a join over
+them, so the cost grows linearly with the number of recipes.
+
+Usage:
+    python3 validate_combos.py <path_to_mod_directory> [--include DIR ...]
+
+Example:
+    python3 validate_combos.py Public/EldertideArmament/
+    python3 validate_combos.py Public/EldertideArmament/ --include reference/vanilla_data
+"""
+
+import argparse
+import os
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
+
+import profiling
+from stats_parser import find_stats_files, load_stats_file
+from stats_resolver import StatsResolver, build_resolver
+from treasure_tables import load_treasure_tables
+from validate_references import DEFAULT_INCLUDE_DIRS
+from validate_treasure import ITEM_TYPES
+
+_UUID_PATTERN = re.compile(r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}')
+_NUMBERED_KEY = re.compile(r'(Type|Object|Transform|Combine|Result|ResultAmount) (\d+)$')
+
+COMBINATION_KIND = "ItemCombination"
+RESULT_KIND = "ItemCombinationResult"
+
+# Base-game items missing from the partial reference dumps and not used by them
+_EXTERNAL_ITEMS = frozenset({
+    "ALCH_Ingredient_Loot_UnicornHorn",
+    "ALCH_Ingredient_Loot_YellowMuskCreeper",
+    "CONS_Mushrooms_DragonEggMushroom",
+    "CONS_Mushrooms_SilvanTruffle",
+})
+
+VALID_INGREDIENT_TYPES = {"Object", "Category"}
+VALID_TRANSFORMS = {"None", "Consume", "Transform", "Dye"}
+
+
+class ComboError:
+    def __init__(self, file_path: str, line_num: int, entry_name: str,
+                 property_name: str, value: str, message: str, severity: str = "error"):
+        self.file_path = file_path
+        self.line_num = line_num
+        self.entry_name = entry_name
+        self.property_name = property_name
+        self.value = value
+        self.message = message
+        self.severity = severity  # "error" or "warning"
+
+    def __str__(self) -> str:
+        icon = "❌" if self.severity == "error" else "⚠️"
+        return (f"{icon} {self.file_path}:{self.line_num} - {self.entry_name}\n"
+                f"   Property: {self.property_name}\n"
+                f"   Value: {self.value}\n"
+                f"   {self.severity.title()}: {self.message}\n")
+
+
+class Ingredient(NamedTuple):
+    index: int
+    type: str
+    name: str
+    transform: str
+    line: int  # Line of the Object field; Type and Transform keep their own
+    type_line: int
+    transform_line: int
+
+
+class Combination(NamedTuple):
+    """One ``new ItemCombination`` block."""
+    name: str
+    ingredients: Tuple[Ingredient, ...]
+    path: str
+    line: int
+    mod: bool
+
+
+class CombinationResult(NamedTuple):
+    """One ``new ItemCombinationResult`` block; ``results`` holds ``(index, stats name, line)``."""
+    name: str
+    results: Tuple[Tuple[int, str, int], ...]
+    preview: Optional[Tuple[str, int]]
+    path: str
+    line: int
+    mod: bool
+
+
+def find_combo_files(directory: Union[str, Path]) -> List[Path]:
+    """Return every ItemCombos.txt under ``directory``, in load order."""
+    return sorted(Path(directory).rglob("ItemCombos.txt"))
+
+
+class RecipeGraph:
+    """Combinations and results of a set of ItemCombos.txt files.
+
+    Later files override earlier definitions of the same name, like stats
+    entries. ``duplicates`` collects names the mod defines more than once.
+    """
+
+    def __init__(self):
+        self.combinations: Dict[str, Combination] = {}
+        self.results: Dict[str, CombinationResult] = {}
+        self.duplicates: List[Union[Combination, CombinationResult]] = []
+        self.problems: List[ComboError] = []
+        self._mod_names: Set[Tuple[str, str]] = set()
+
+    def add_file(self, file_path: Union[str, Path], mod: bool) -> None:
+        """Read one ItemCombos.txt; format problems of mod files go to ``problems``."""
+        try:
+            stats = load_stats_file(file_path)
+        except (OSError, UnicodeDecodeError) as e:
+            if mod:
+                self.problems.append(ComboError(str(file_path), 0, "", "", "", f"Failed to read file: {e}"))
+            return
+
+        file_str = str(file_path)
+        for entry in stats.entries:
+            numbered: Dict[int, Dict[str, Tuple[str, int]]] = defaultdict(dict)
+            preview = None
+            for key, value, line_num in entry.items():
+                match = _NUMBERED_KEY.match(key)
+                if match:
+                    numbered[int(match.group(2))][match.group(1)] = (value, line_num)
+                elif key == "PreviewStatsID":
+                    preview = (value, line_num)
+
+            if entry.kind == COMBINATION_KIND:
+                ingredients = []
+                for index in sorted(numbered):
+                    fields = numbered[index]
+                    type_name, type_line = fields.get("Type", ("", entry.line))
+                    name, line_num = fields.get("Object", ("", type_line))
+                    transform, transform_line = fields.get("Transform", ("None", line_num))
+                    ingredients.append(Ingredient(index, type_name, name, transform, line_num,
+                                                  type_line, transform_line))
+                record = Combination(entry.name, tuple(ingredients), file_str, entry.line, mod)
+                table = self.combinations
+            elif entry.kind == RESULT_KIND:
+                results = tuple(
+                    (index, numbered[index]["Result"][0], numbered[index]["Result"][1])
+                    for index in sorted(numbered) if "Result" in numbered[index]
+                )
+                record = CombinationResult(entry.name, results, preview, file_str, entry.line, mod)
+                table = self.results
+            else:
+                continue
+
+            if mod:
+                if (entry.kind, entry.name) in self._mod_names:
+                    self.duplicates.append(record)
+                self._mod_names.add((entry.kind, entry.name))
+            table[entry.name] = record
+
+    def result_of(self, combination: Combination) -> Optional[CombinationResult]:
+        return self.results.get(f"{combination.name}_1")
+
+    def combination_of(self, result: CombinationResult) -> Optional[Combination]:
+        base, _, suffix = result.name.rpartition("_")
+        return self.combinations.get(base) if suffix.isdigit() else None
+
+    def items(self, mod: bool) -> Set[str]:
+        """Every item used as an ingredient or result by the mod's or the dumps' recipes."""
+        names = {ingredient.name for combination in self.combinations.values() if combination.mod == mod
+                 for ingredient in combination.ingredients if ingredient.type == "Object"}
+        names.update(item for result in self.results.values() if result.mod == mod for _, item, _ in result.results)
+        return names
+
+
+def build_recipe_graph(directory: Union[str, Path], include_dirs: Sequence[Union[str, Path]] = ()) -> RecipeGraph:
+    """Read the ItemCombos.txt files of the included dumps, then of the mod."""
+    graph = RecipeGraph()
+    for include in include_dirs:
+        for file_path in find_combo_files(include):
+            graph.add_file(file_path, mod=False)
+    for file_path in find_combo_files(directory):
+        graph.add_file(file_path, mod=True)
+    return graph
+
+
+def _obtainable_sources(directory: Union[str, Path], resolver: StatsResolver, mod_items: Set[str]) -> Set[str]:
+    """Mod items players can get without crafting: the mod's treasure drops and summoned/created templates."""
+    sources = load_treasure_tables([directory]).dropped_items() & mod_items
+
+    used_templates: Set[str] = set()
+    for file_path in find_stats_files(directory):
+        try:
+            stats = load_stats_file(file_path)
+        except (OSError, UnicodeDecodeError):
+            continue
+        for entry in stats.entries:
+            if entry.kind != "entry":
+                continue
+            for key, value, _ in entry.items():
+                if key != "RootTemplate" and "-" in value:
+                    used_templates.update(uuid.lower() for uuid in _UUID_PATTERN.findall(value))
+
+    for name in mod_items:
+        template = resolver.resolve(name).get("RootTemplate")
+        if template and template.lower() in used_templates:
+            sources.add(name)
+    return sources
+
+
+def craftable_combinations(graph: RecipeGraph, obtainable: Set[str], mod_items: Set[str]) -> Set[str]:
+    """Names of the combinations whose ingredients can all be obtained.
+
+    A worklist over the graph: each combination waits on its ``Object``
+    ingredients that are not yet obtainable, and crafting it makes its results
+    obtainable, which may release further combinations. Items the mod does not
+    define (base game) and category ingredients are always obtainable.
+    """
+    obtainable = set(obtainable)
+    waiting: Dict[str, int] = {}
+    waiters: Dict[str, List[str]] = defaultdict(list)
+    ready: List[str] = []
+    for combination in graph.combinations.values():
+        missing = {ingredient.name for ingredient in combination.ingredients
+                   if ingredient.type == "Object" and ingredient.name not in obtainable
+                   and ingredient.name in mod_items}
+        waiting[combination.name] = len(missing)
+        for name in missing:
+            waiters[name].append(combination.name)
+        if not missing:
+            ready.append(combination.name)
+
+    craftable: Set[str] = set()
+    while ready:
+        name = ready.pop()
+        craftable.add(name)
+        result = graph.result_of(graph.combinations[name])
+        for _, item, _ in (result.results if result else ()):
+            if item in obtainable:
+                continue
+            obtainable.add(item)
+            for waiter in waiters.pop(item, ()):
+                waiting[waiter] -= 1
+                if not waiting[waiter]:
+                    ready.append(waiter)
+    return craftable
+
+
+def validate_combos(directory: Union[str, Path], resolver: StatsResolver,
+                    include_dirs: Sequence[Union[str, Path]] = ()) -> List[ComboError]:
+    """Check the mod's item combinations and their results.
+
+    Args:
+        directory: Mod directory (ItemCombos.txt, stats and treasure tables are found under it)
+        resolver: Resolver over the included dumps and the mod, for stats lookups
+        include_dirs: Dumps whose combinations and treasure tables count as existing
+
+    Returns:
+        Errors first, then warnings, each in file order
+    """
+    graph = build_recipe_graph(directory, include_dirs)
+    errors: List[ComboError] = list(graph.problems)
+    warnings: List[ComboError] = []
+    entries = resolver.entries
+    # Base-game items outside the dumps are still known by the dumps using them
+    external_items = (_EXTERNAL_ITEMS | graph.items(mod=False)
+                      | load_treasure_tables(include_dirs).dropped_items())
+
+    mod_items: Set[str] = set()
+    for file_path in find_stats_files(directory):
+        try:
+            stats = load_stats_file(file_path)
+        except (OSError, UnicodeDecodeError):
+            continue
+        mod_items.update(name for name, entry in stats.by_name.items() if entry.type in ITEM_TYPES)
+
+    def check_item(record, property_name: str, name: str, line_num: int) -> None:
+        entry = entries.get(name)
+        if entry is None:
+            if name in external_items:
+                return
+            errors.append(ComboError(record.path, line_num, record.name, property_name, name,
+                                     f"No item stats entry named '{name}'"))
+        elif entry.type not in ITEM_TYPES:
+            errors.append(ComboError(record.path, line_num, record.name, property_name, name,
+                                     f"'{name}' is a {entry.type or 'untyped'} entry, not an item "
+                                     f"({', '.join(ITEM_TYPES)})"))
+
+    for record in graph.duplicates:
+        errors.append(ComboError(record.path, record.line, record.name, "new", record.name,
+                                 f"{type(record).__name__} defined more than once in the mod"))
+
+    # Ingredients, and combinations sharing the same ingredient set
+    by_ingredients: Dict[Tuple[Tuple[str, str], ...], List[Combination]] = defaultdict(list)
+    for combination in graph.combinations.values():
+        key = tuple(sorted((ingredient.type, ingredient.name) for ingredient in combination.ingredients))
+        by_ingredients[key].append(combination)
+        if not combination.mod:
+            continue
+
+        if len(combination.ingredients) < 2:
+            errors.append(ComboError(combination.path, combination.line, combination.name, "Object 1",
+                                     str(len(combination.ingredients)), "A combination needs at least 2 ingredients"))
+        for position, ingredient in enumerate(combination.ingredients, 1):
+            if ingredient.index != position:
+                errors.append(ComboError(combination.path, ingredient.line, combination.name,
+                                         f"Object {ingredient.index}", ingredient.name,
+                                         f"Ingredient {position} is missing; ingredients must be numbered from 1 without gaps"))
+            if ingredient.type not in VALID_INGREDIENT_TYPES:
+                errors.append(ComboError(combination.path, ingredient.type_line, combination.name,
+                                         f"Type {ingredient.index}", ingredient.type,
+                                         f"Invalid ingredient type. Valid: {', '.join(sorted(VALID_INGREDIENT_TYPES))}"))
+            if ingredient.transform not in VALID_TRANSFORMS:
+                errors.append(ComboError(combination.path, ingredient.transform_line, combination.name,
+                                         f"Transform {ingredient.index}", ingredient.transform,
+                                         f"Invalid transform. Valid: {', '.join(sorted(VALID_TRANSFORMS))}"))
+            if not ingredient.name:
+                errors.append(ComboError(combination.path, ingredient.line, combination.name,
+                                         f"Object {ingredient.index}", "", "Ingredient has no Object"))
+            elif ingredient.type == "Object":
+                check_item(combination, f"Object {ingredient.index}", ingredient.name, ingredient.line)
+
+        if graph.result_of(combination) is None:
+            errors.append(ComboError(combination.path, combination.line, combination.name, RESULT_KIND,
+                                     f"{combination.name}_1", "Combination has no result entry"))
+
+    for combinations in by_ingredients.values():
+        if len(combinations) < 2 or not any(c.mod for c in combinations):
+            continue
+        for combination in combinations:
+            if not combination.mod:
+                continue
+            others = ", ".join(c.name for c in combinations if c is not combination)
+            severity = "error" if all(c.mod for c in combinations) else "warning"
+            warnings_or_errors = errors if severity == "error" else warnings
+            warnings_or_errors.append(ComboError(
+                combination.path, combination.line, combination.name, "ingredients",
+                " + ".join(ingredient.name for ingredient in combination.ingredients),
+                f"Same ingredients as {others}; only one recipe can apply", severity,
+            ))
+
+    # Results
+    for result in graph.results.values():
+        if not result.mod:
+            continue
+        combination = graph.combination_of(result)
+        if combination is None:
+            errors.append(ComboError(result.path, result.line, result.name, COMBINATION_KIND,
+                                     result.name.rpartition("_")[0] or result.name,
+                                     "Result has no combination (results are named <combination>_<n>)"))
+        for index, item, line_num in result.results:
+            check_item(result, f"Result {index}", item, line_num)
+        if result.preview is not None and result.preview[0]:
+            check_item(result, "PreviewStatsID", result.preview[0], result.preview[1])
+        dyes = combination is not None and any(i.transform == "Dye" for i in combination.ingredients)
+        if not result.results and not dyes:
+            warnings.append(ComboError(result.path, result.line, result.name, "Result 1", "",
+                                       "Result entry produces nothing"))
+
+    # Reachability of the mod's recipes
+    obtainable = _obtainable_sources(directory, resolver, mod_items)
+    craftable = craftable_combinations(graph, obtainable, mod_items)
+    for combination in graph.combinations.values():
+        if not combination.mod or combination.name in craftable or graph.result_of(combination) is None:
+            continue
+        blocked = [ingredient.name for ingredient in combination.ingredients
+                   if ingredient.type == "Object" and ingredient.name in mod_items
+                   and ingredient.name not in obtainable]
+        warnings.append(ComboError(
+            combination.path, combination.line, combination.name, "ingredients", ", ".join(blocked),
+            "Result can never be crafted: no treasure table, template use or craftable recipe provides "
+            "these ingredients", "warning",
+        ))
+
+    return errors + warnings
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    parser = argparse.ArgumentParser(description="BG3 Item Combination Validator")
+    parser.add_argument("target", help="Path to mod directory to validate")
+    parser.add_argument(
+        "--include",
+        nargs="*",
+        default=[d for d in DEFAULT_INCLUDE_DIRS if os.path.isdir(d)],
+        help=(
+            "Directories whose items, combinations and treasure tables count as existing (vanilla dumps, "
+            "compatibility mods). Defaults to the bundled reference dumps; pass --include with no "
+            "directories to disable."
+        ),
+    )
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.start_from_args(args)
+
+    target = args.target
+
+    if not os.path.exists(target):
+        print(f"❌ Error: Path does not exist: {target}")
+        sys.exit(1)
+
+    if not os.path.isdir(target):
+        print(f"❌ Error: Path must be a directory: {target}")
+        sys.exit(1)
+
+    print("=" * 70)
+    print("BG3 Item Combination Validator")
+    print("=" * 70)
+    print()
+
+    include_dirs = []
+    for extra in args.include:
+        if not os.path.isdir(extra):
+            print(f"⚠️  Skipping include dir (not found): {extra}")
+            continue
+        print(f"➕ Including definitions from: {extra}")
+        include_dirs.append(extra)
+    print()
+
+    resolver = build_resolver(target, include_dirs)
+    diagnostics = validate_combos(target, resolver, include_dirs)
+
+    errors = [d for d in diagnostics if d.severity == "error"]
+    warnings = [d for d in diagnostics if d.severity == "warning"]
+
+    if errors:
+        print("=" * 70)
+        print("ERRORS")
+        print("=" * 70)
+        print()
+        for error in errors:
+            print(error)
+
+    if warnings:
+        print("=" * 70)
+        print("WARNINGS")
+        print("=" * 70)
+        print()
+        for warning in warnings:
+            print(warning)
+
+    print("=" * 70)
+    print("VALIDATION SUMMARY")
+    print("=" * 70)
+
+    by_property = defaultdict(int)
+    for diagnostic in diagnostics:
+        by_property[diagnostic.property_name] += 1
+    for property_name, count in sorted(by_property.items()):
+        print(f"   {property_name}: {count} issue(s)")
+
+    print(f"\n❌ Total errors: {len(errors)}")
+    print(f"⚠️  Total warnings: {len(warnings)}")
+    print()
+
+    if errors:
+        print("❌ Validation FAILED")
+        sys.exit(1)
+    elif warnings:
+        print("⚠️  Validation PASSED with warnings")
+        sys.exit(0)
+    else:
+        print("✅ Validation PASSED")
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+BG3 MultiEffectInfo Validator
+
+Stats entries play visual effects through MultiEffectInfo UUIDs
+(``data "CastEffect" "<uuid>"``, ``StatusEffect``, ``TargetEffect``, ...),
+and each ``MultiEffectInfos/<Name>_<uuid>.lsf.lsx`` file defines one of them.
+This module indexes the header of every such file (UUID, Name and the number
+of ``EffectResourceGuid`` attributes) and checks:
+
+- every effect UUID in the mod's stats names a MultiEffectInfo of the mod or
+  of the included dumps, a base-game effect the dumps' stats use, or one
+  recorded in the base-game effect baseline
+- every MultiEffectInfo of the mod is used by some stats entry
+- headers have a UUID, the file name carries it, no UUID is defined twice and
+  every MultiEffectInfo lists at least one effect resource
+
+Only the header of each file is searched for the UUID and Name (it sits in the
+first few hundred bytes), and resources are counted as raw bytes through
+``mmap``, so no file is decoded or parsed as XML.
+
+The reference dumps carry no MultiEffectInfos, so base-game effects the mod
+uses but the dumps' stats do not are kept in ``reference/vanilla_effects_baseline.json``;
+``--update-baseline`` records the UUIDs that currently resolve nowhere.
+
+Usage:
+    python3 validate_effects.py <path_to_mod_directory> [--include DIR ...] [--baseline FILE [--update-baseline]]
+
+Example:
+    python3 validate_effects.py Public/EldertideArmament/
+    python3 validate_effects.py Public/EldertideArmament/ --baseline reference/vanilla_effects_baseline.json --update-baseline
+"""
+
+import argparse
+import json
+import mmap
+import os
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Sequence, Set, Tuple, Union
+
+import profiling
+from stats_parser import find_stats_files, load_stats_file
+from symbol_index import EFFECT_KEYS, EFFECT_TYPE, SymbolIndex, open_symbol_index
+from validate_references import DEFAULT_INCLUDE_DIRS
+
+# Bytes searched for the header first; the UUID and Name attributes follow the
+# XML prolog, so the whole file is only searched when this finds no header end
+HEADER_BYTES = 512
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent.parent / "vanilla_effects_baseline.json"
+
+_HEADER_END = b"<children>"
+_HEADER_UUID = re.compile(rb'<attribute id="UUID" type="guid" value="([^"]*)"')
+_HEADER_NAME = re.compile(rb'<attribute id="Name" type="LSString" value="([^"]*)"')
+_RESOURCE_ATTRIBUTE = b'<attribute id="EffectResourceGuid"'
+
+_UUID_PATTERN = re.compile(r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}')
+
+
+class MultiEffectInfo(NamedTuple):
+    """Header of one ``MultiEffectInfos/*.lsf.lsx`` file."""
+    uuid: str  # lower case, "" when the header has none
+    name: str
+    resources: int  # EffectResourceGuid attributes
+    path: str
+
+
+class EffectError:
+    def __init__(self, file_path: str, line_num: int, entry_name: str,
+                 property_name: str, value: str, message: str, severity: str = "error"):
+        self.file_path = file_path
+        self.line_num = line_num
+        self.entry_name = entry_name
+        self.property_name = property_name
+        self.value = value
+        self.message = message
+        self.severity = severity  # "error" or "warning"
+
+    def __str__(self) -> str:
+        icon = "❌" if self.severity == "error" else "⚠️"
+        return (f"{icon} {self.file_path}:{self.line_num} - {self.entry_name}\n"
+                f"   Property: {self.property_name}\n"
+                f"   Value: {self.value}\n"
+                f"   {self.severity.title()}: {self.message}\n")
+
+
+def read_effect_header(path: Union[str, Path]) -> MultiEffectInfo:
+    """Read the UUID, Name and resource count of one MultiEffectInfo file."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return MultiEffectInfo("", "", 0, str(path))
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = mm.find(_HEADER_END, 0, HEADER_BYTES)
+            if end < 0:
+                end = mm.find(_HEADER_END)
+            header = mm[:end if end >= 0 else len(mm)]
+
+            resources = 0
+            pos = mm.find(_RESOURCE_ATTRIBUTE, max(end, 0))
+            while pos >= 0:
+                resources += 1
+                pos = mm.find(_RESOURCE_ATTRIBUTE, pos + len(_RESOURCE_ATTRIBUTE))
+
+    uuid = _HEADER_UUID.search(header)
+    name = _HEADER_NAME.search(header)
+    return MultiEffectInfo(
+        uuid.group(1).decode("ascii", "replace").lower() if uuid else "",
+        name.group(1).decode("utf-8", "replace") if name else "",
+        resources,
+        str(path),
+    )
+
+
+def find_effect_files(directory: Union[str, Path]) -> List[Path]:
+    """Return every ``MultiEffectInfos/*.lsx`` file under ``directory``."""
+    return sorted(Path(directory).rglob("MultiEffectInfos/*.lsx"))
+
+
+def load_baseline(path: Union[str, Path]) -> Set[str]:
+    with open(path, "r", encoding="utf-8") as f:
+        return set(json.load(f)["effects"])
+
+
+def save_baseline(path: Union[str, Path], uuids: Sequence[str]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"effects": sorted(set(uuids))}, f, indent=1)
+        f.write("\n")
+
+
+def effect_references(directory: Union[str, Path]) -> List[Tuple[str, int, str, str, str]]:
+    """Return ``(file, line, entry, property, uuid)`` for every effect UUID in the stats."""
+    references = []
+    for file_path in find_stats_files(directory):
+        try:
+            stats = load_stats_file(file_path)
+        except (OSError, UnicodeDecodeError):
+            continue
+        file_str = str(file_path)
+        for entry in stats.entries:
+            if entry.kind != "entry":
+                continue
+            for key, value, line_num in entry.items(EFFECT_KEYS):
+                if value:
+                    for uuid in _UUID_PATTERN.findall(value):
+                        references.append((file_str, line_num, entry.name, key, uuid.lower()))
+    return references
+
+
+def unresolved_effects(directory: Union[str, Path], include_dirs: Sequence[Union[str, Path]] = (),
+                       indexes: Sequence[SymbolIndex] = ()) -> Set[str]:
+    """Return the effect UUIDs of the mod's stats that resolve nowhere, ignoring any baseline."""
+    defined = set()
+    for root in [directory, *include_dirs]:
+        for file_path in find_effect_files(root):
+            try:
+                defined.add(read_effect_header(file_path).uuid)
+            except OSError:
+                continue
+    missing = {uuid for _, _, _, _, uuid in effect_references(directory)} - defined
+    for index in indexes:
+        missing.difference_update(index.lookup_many(missing, (EFFECT_TYPE,)))
+    return missing
+
+
+def validate_effects(directory: Union[str, Path], include_dirs: Sequence[Union[str, Path]] = (),
+                     indexes: Sequence[SymbolIndex] = (), known: Set[str] = frozenset()) -> List[EffectError]:
+    """Check the MultiEffectInfos of a mod and the effect UUIDs its stats use.
+
+    Args:
+        directory: Mod directory (MultiEffectInfos and stats are found under it)
+        include_dirs: Dumps whose MultiEffectInfos count as existing
+        indexes: Symbol indexes of the same dumps, for effects their stats use
+        known: Base-game effect UUIDs from the baseline
+
+    Returns:
+        Errors first, then warnings, each in file order
+    """
+    errors: List[EffectError] = []
+    warnings: List[EffectError] = []
+
+    effects: Dict[str, MultiEffectInfo] = {}
+    for root in include_dirs:
+        for file_path in find_effect_files(root):
+            try:
+                info = read_effect_header(file_path)
+            except OSError:
+                continue
+            if info.uuid:
+                effects[info.uuid] = info
+
+    mod_effects: Dict[str, MultiEffectInfo] = {}
+    for file_path in find_effect_files(directory):
+        file_str = str(file_path)
+        try:
+            info = read_effect_header(file_path)
+        except OSError as e:
+            errors.append(EffectError(file_str, 0, "", "", "", f"Failed to read file: {e}"))
+            continue
+        if not info.uuid:
+            errors.append(EffectError(
+                file_str, 0, info.name, "UUID", "", "MultiEffectInfos header has no UUID attribute",
+            ))
+            continue
+        if info.uuid in mod_effects:
+            errors.append(EffectError(
+                file_str, 0, info.name, "UUID", info.uuid,
+                f"UUID is also defined by {mod_effects[info.uuid].path}",
+            ))
+            continue
+        mod_effects[info.uuid] = info
+        effects[info.uuid] = info
+
+        if info.uuid not in file_path.name.lower():
+            warnings.append(EffectError(
+                file_str, 0, info.name, "UUID", info.uuid, "File name does not carry the MultiEffectInfo UUID",
+                "warning",
+            ))
+        if not info.resources:
+            warnings.append(EffectError(
+                file_str, 0, info.name, "EffectResourceGuid", "0",
+                "MultiEffectInfo lists no EffectResourceGuid, so it plays nothing", "warning",
+            ))
+
+    references = effect_references(directory)
+    missing = {uuid for _, _, _, _, uuid in references} - set(effects) - known
+    for index in indexes:
+        if not missing:
+            break
+        missing.difference_update(index.lookup_many(missing, (EFFECT_TYPE,)))
+
+    for file_str, line_num, entry_name, key, uuid in references:
+        if uuid in missing:
+            errors.append(EffectError(
+                file_str, line_num, entry_name, key, uuid,
+                "No MultiEffectInfo with this UUID in the mod or the included dumps, and not a known base-game effect",
+            ))
+
+    used = {uuid for _, _, _, _, uuid in references}
+    for uuid, info in mod_effects.items():
+        if uuid not in used:
+            warnings.append(EffectError(
+                info.path, 0, info.name, "UUID", uuid, "No stats entry uses this MultiEffectInfo", "warning",
+            ))
+
+    return errors + warnings
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    parser = argparse.ArgumentParser(description="BG3 MultiEffectInfo Validator")
+    parser.add_argument("target", help="Path to mod directory to validate")
+    parser.add_argument(
+        "--include",
+        nargs="*",
+        default=[d for d in DEFAULT_INCLUDE_DIRS if os.path.isdir(d)],
+        help=(
+            "Directories whose MultiEffectInfos and stats effects count as existing (vanilla dumps, "
+            "compatibility mods). Defaults to the bundled reference dumps; pass --include with no "
+            "directories to disable."
+        ),
+    )
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE),
+                        help="JSON file of known base-game effect UUIDs (default: %(default)s).")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Write the effect UUIDs that resolve nowhere to --baseline instead of checking.")
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.start_from_args(args)
+
+    target = args.target
+
+    if not os.path.exists(target):
+        print(f"❌ Error: Path does not exist: {target}")
+        sys.exit(1)
+
+    if not os.path.isdir(target):
+        print(f"❌ Error: Path must be a directory: {target}")
+        sys.exit(1)
+
+    print("=" * 70)
+    print("BG3 MultiEffectInfo Validator")
+    print("=" * 70)
+    print()
+
+    include_dirs = []
+    for extra in args.include:
+        if not os.path.isdir(extra):
+            print(f"⚠️  Skipping include dir (not found): {extra}")
+            continue
+        print(f"➕ Including definitions from: {extra}")
+        include_dirs.append(extra)
+    print()
+
+    indexes = [open_symbol_index(extra) for extra in include_dirs]
+    if args.update_baseline:
+        missing = unresolved_effects(target, include_dirs, indexes)
+        for index in indexes:
+            index.close()
+        save_baseline(args.baseline, sorted(missing))
+        print(f"✅ Wrote {len(missing)} base-game effect UUID(s) to {args.baseline}")
+        sys.exit(0)
+
+    known: Set[str] = set()
+    if os.path.isfile(args.baseline):
+        known = load_baseline(args.baseline)
+        print(f"📋 Baseline: {len(known)} known base-game effect(s) from {args.baseline}")
+        print()
+
+    diagnostics = validate_effects(target, include_dirs, indexes, known)
+    for index in indexes:
+        index.close()
+
+    errors = [d for d in diagnostics if d.severity == "error"]
+    warnings = [d for d in diagnostics if d.severity == "warning"]
+
+    if errors:
+        print("=" * 70)
+        print("ERRORS")
+        print("=" * 70)
+        print()
+        for error in errors:
+            print(error)
+
+    if warnings:
+        print("=" * 70)
+        print("WARNINGS")
+        print("=" * 70)
+        print()
+        for warning in warnings:
+            print(warning)
+
+    print("=" * 70)
+    print("VALIDATION SUMMARY")
+    print("=" * 70)
+
+    by_property = defaultdict(int)
+    for diagnostic in diagnostics:
+        by_property[diagnostic.property_name] += 1
+    for property_name, count in sorted(by_property.items()):
+        print(f"   {property_name}: {count} issue(s)")
+
+    print(f"\n❌ Total errors: {len(errors)}")
+    print(f"⚠️  Total warnings: {len(warnings)}")
+    print()
+
+    if errors:
+        print("❌ Validation FAILED")
+        sys.exit(1)
+    elif warnings:
+        print("⚠️  Validation PASSED with warnings")
+        sys.exit(0)
+    else:
+        print("✅ Validation PASSED")
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
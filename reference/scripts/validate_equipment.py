@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+BG3 Equipment and Spell Set Validator
+
+Checks a mod's ``Stats/Generated/Equipment.txt`` (``new equipment`` blocks of
+``add equipmentgroup`` / ``add equipment entry`` lines) and
+``Stats/Generated/SpellSet.txt`` (``new spellset`` blocks of ``add spell``
+lines) against its stats entries and the symbol indexes of the included
+reference dumps:
+
+- every ``add equipment entry`` names an item stats entry (Armor, Weapon,
+  Object) of the mod or of the dumps, or a base-game item the dumps' equipment
+  sets list
+- every ``add spell`` names a SpellData entry of the mod or of the dumps, or a
+  base-game spell the dumps' spell sets list
+- ``add initialweaponset`` is ``Melee`` or ``Ranged``, entries follow an
+  ``add equipmentgroup`` and no other ``add`` line appears
+- no set is defined twice in the mod, no equipment set repeats an Armor group
+  (repeated weapon and Object groups dual-wield or stack) and no group or
+  spell set lists a name twice
+- sets and groups that list nothing
+
+The names of all sets are collected first and looked up in a few batched
+queries per index rather than one query per line.
+
+Usage:
+    python3 validate_equipment.py <path_to_mod_directory> [--include DIR ...]
+
+Example:
+    python3 validate_equipment.py Public/EldertideArmament/
+    python3 validate_equipment.py Public/EldertideArmament/ --include reference/vanilla_data
+"""
+
+import argparse
+import os
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set, Tuple, Union
+
+import profiling
+from stats_parser import StatsEntry, find_stats_files, load_stats_file
+from symbol_index import EQUIPMENT_ENTRY_TYPE, SPELLSET_SPELL_TYPE, SymbolIndex, open_symbol_index
+from validate_references import DEFAULT_INCLUDE_DIRS
+
+# Stats types an ``add equipment entry`` may name
+ITEM_TYPES = ("Armor", "Weapon", "Object")
+
+# Stats types an ``add spell`` may name
+SPELL_TYPES = ("SpellData",)
+
+INITIAL_WEAPON_SETS = ("Melee", "Ranged")
+
+# ``add`` lines each kind of set may contain
+SET_KEYS = {
+    "equipment": ("initialweaponset", "equipmentgroup", "equipment entry"),
+    "spellset": ("spell",),
+}
+
+# Base-game names the partial reference dumps neither define nor list in a set
+_EXTERNAL_NAMES = frozenset({
+    "ARM_Leather_Body_2",
+    "Shout_Hide",
+    "Projectile_Jump_Panther",
+})
+
+
+class EquipmentError:
+    def __init__(self, file_path: str, line_num: int, entry_name: str,
+                 property_name: str, value: str, message: str, severity: str = "error"):
+        self.file_path = file_path
+        self.line_num = line_num
+        self.entry_name = entry_name
+        self.property_name = property_name
+        self.value = value
+        self.message = message
+        self.severity = severity  # "error" or "warning"
+
+    def __str__(self) -> str:
+        icon = "❌" if self.severity == "error" else "⚠️"
+        return (f"{icon} {self.file_path}:{self.line_num} - {self.entry_name}\n"
+                f"   Property: {self.property_name}\n"
+                f"   Value: {self.value}\n"
+                f"   {self.severity.title()}: {self.message}\n")
+
+
+def _known_types(names: Set[str], member_type: str, mod_types: Dict[str, str],
+                 indexes: Sequence[SymbolIndex]) -> Dict[str, str]:
+    """Map each name to the stats type defining it.
+
+    Names only the dumps' sets list (base-game names missing from the dumps)
+    map to ``member_type``. Every index answers in two batched queries.
+    """
+    types: Dict[str, str] = {}
+    for index in indexes:
+        for name, symbol in index.lookup_many(names).items():
+            types[name] = symbol.type
+    types.update((name, mod_types[name]) for name in names if name in mod_types)
+
+    missing = names.difference(types)
+    for index in indexes:
+        if not missing:
+            break
+        listed = index.lookup_many(missing, (member_type,))
+        types.update(dict.fromkeys(listed, member_type))
+        missing.difference_update(listed)
+    return types
+
+
+def _check_name(name: str, types: Dict[str, str], wanted: Tuple[str, ...], member_type: str,
+                label: str, article: str) -> Optional[str]:
+    """Return why ``name`` is not a valid ``label`` reference, or None."""
+    stats_type = types.get(name)
+    if stats_type is None:
+        if name in _EXTERNAL_NAMES:
+            return None
+        return f"No {label} stats entry named '{name}'"
+    if stats_type in wanted or stats_type == member_type:
+        return None
+    return f"'{name}' is a {stats_type or 'untyped'} entry, not {article} {label} ({', '.join(wanted)})"
+
+
+def _check_equipment(file_str: str, entry: StatsEntry, item_types: Dict[str, str],
+                     errors: List[EquipmentError], warnings: List[EquipmentError]) -> None:
+    allowed = SET_KEYS["equipment"]
+    groups: List[Tuple[int, List[str]]] = []  # (line, item names) per equipmentgroup
+
+    for key, value, line_num in entry.items():
+        if key not in allowed:
+            errors.append(EquipmentError(
+                file_str, line_num, entry.name, f"add {key}", value,
+                f"Not an equipment line (expected {', '.join('add ' + k for k in allowed)})",
+            ))
+        elif key == "initialweaponset":
+            if value not in INITIAL_WEAPON_SETS:
+                errors.append(EquipmentError(
+                    file_str, line_num, entry.name, "add initialweaponset", value,
+                    f"Initial weapon set must be one of: {', '.join(INITIAL_WEAPON_SETS)}",
+                ))
+        elif key == "equipmentgroup":
+            groups.append((line_num, []))
+        elif not groups:
+            errors.append(EquipmentError(
+                file_str, line_num, entry.name, "add equipment entry", value,
+                "Entry comes before the first 'add equipmentgroup'",
+            ))
+        else:
+            group = groups[-1][1]
+            if value in group:
+                warnings.append(EquipmentError(
+                    file_str, line_num, entry.name, "add equipment entry", value,
+                    "Item is already in this equipment group", "warning",
+                ))
+                continue
+            group.append(value)
+            message = _check_name(value, item_types, ITEM_TYPES, EQUIPMENT_ENTRY_TYPE, "item", "an")
+            if message:
+                errors.append(EquipmentError(file_str, line_num, entry.name, "add equipment entry", value, message))
+
+    if not groups:
+        warnings.append(EquipmentError(
+            file_str, entry.line, entry.name, "add equipmentgroup", "", "Equipment set has no groups", "warning",
+        ))
+    first_group: Dict[FrozenSet[str], int] = {}
+    for line_num, names in groups:
+        if not names:
+            warnings.append(EquipmentError(
+                file_str, line_num, entry.name, "add equipmentgroup", "", "Equipment group has no entries", "warning",
+            ))
+            continue
+        items = frozenset(names)
+        # A repeated weapon group dual-wields and a repeated Object group stacks;
+        # a repeated Armor group is almost always a copy-paste slip
+        if items in first_group and all(item_types.get(name) == "Armor" for name in names):
+            warnings.append(EquipmentError(
+                file_str, line_num, entry.name, "add equipmentgroup", ", ".join(names),
+                f"Same armor as the group at line {first_group[items]}", "warning",
+            ))
+        else:
+            first_group.setdefault(items, line_num)
+
+
+def _check_spellset(file_str: str, entry: StatsEntry, spell_types: Dict[str, str],
+                    errors: List[EquipmentError], warnings: List[EquipmentError]) -> None:
+    spells: Dict[str, int] = {}
+    for key, value, line_num in entry.items():
+        if key != "spell":
+            errors.append(EquipmentError(
+                file_str, line_num, entry.name, f"add {key}", value, "Not a spell set line (expected add spell)",
+            ))
+        elif value in spells:
+            warnings.append(EquipmentError(
+                file_str, line_num, entry.name, "add spell", value,
+                f"Spell is already in this set at line {spells[value]}", "warning",
+            ))
+        else:
+            spells[value] = line_num
+            message = _check_name(value, spell_types, SPELL_TYPES, SPELLSET_SPELL_TYPE, "spell", "a")
+            if message:
+                errors.append(EquipmentError(file_str, line_num, entry.name, "add spell", value, message))
+
+    if not spells:
+        warnings.append(EquipmentError(
+            file_str, entry.line, entry.name, "add spell", "", "Spell set has no spells", "warning",
+        ))
+
+
+def validate_equipment(directory: Union[str, Path], indexes: Sequence[SymbolIndex] = ()) -> List[EquipmentError]:
+    """Check the equipment sets and spell sets of a mod.
+
+    Args:
+        directory: Mod directory (sets and stats are found under it)
+        indexes: Symbol indexes of the included dumps
+
+    Returns:
+        Errors first, then warnings, each in file order
+    """
+    sets: List[Tuple[str, StatsEntry]] = []
+    mod_types: Dict[str, str] = {}
+    for file_path in find_stats_files(directory):
+        try:
+            stats = load_stats_file(file_path)
+        except (OSError, UnicodeDecodeError):
+            continue
+        for entry in stats.entries:
+            if entry.kind == "entry":
+                mod_types[entry.name] = entry.type or ""
+            elif entry.kind in SET_KEYS:
+                sets.append((str(file_path), entry))
+
+    # Every name any set lists, resolved in one batch per kind
+    items: Set[str] = set()
+    spells: Set[str] = set()
+    for _, entry in sets:
+        for key, value, _ in entry.items():
+            if key == "equipment entry" and value:
+                items.add(value)
+            elif key == "spell" and value:
+                spells.add(value)
+    item_types = _known_types(items, EQUIPMENT_ENTRY_TYPE, mod_types, indexes)
+    spell_types = _known_types(spells, SPELLSET_SPELL_TYPE, mod_types, indexes)
+
+    errors: List[EquipmentError] = []
+    warnings: List[EquipmentError] = []
+    first_definition: Dict[Tuple[str, str], Tuple[str, int]] = {}
+    for file_str, entry in sets:
+        earlier = first_definition.setdefault((entry.kind, entry.name), (file_str, entry.line))
+        if earlier != (file_str, entry.line):
+            errors.append(EquipmentError(
+                file_str, entry.line, entry.name, f"new {entry.kind}", entry.name,
+                f"Already defined at {earlier[0]}:{earlier[1]}; this definition replaces it",
+            ))
+        if entry.kind == "equipment":
+            _check_equipment(file_str, entry, item_types, errors, warnings)
+        else:
+            _check_spellset(file_str, entry, spell_types, errors, warnings)
+
+    return errors + warnings
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    parser = argparse.ArgumentParser(description="BG3 Equipment and Spell Set Validator")
+    parser.add_argument("target", help="Path to mod directory to validate")
+    parser.add_argument(
+        "--include",
+        nargs="*",
+        default=[d for d in DEFAULT_INCLUDE_DIRS if os.path.isdir(d)],
+        help=(
+            "Directories whose items, spells and sets count as existing (vanilla dumps, "
+            "compatibility mods). Defaults to the bundled reference dumps; pass --include with no "
+            "directories to disable."
+        ),
+    )
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.start_from_args(args)
+
+    target = args.target
+
+    if not os.path.exists(target):
+        print(f"❌ Error: Path does not exist: {target}")
+        sys.exit(1)
+
+    if not os.path.isdir(target):
+        print(f"❌ Error: Path must be a directory: {target}")
+        sys.exit(1)
+
+    print("=" * 70)
+    print("BG3 Equipment and Spell Set Validator")
+    print("=" * 70)
+    print()
+
+    include_dirs = []
+    for extra in args.include:
+        if not os.path.isdir(extra):
+            print(f"⚠️  Skipping include dir (not found): {extra}")
+            continue
+        print(f"➕ Including definitions from: {extra}")
+        include_dirs.append(extra)
+    print()
+
+    indexes = [open_symbol_index(extra) for extra in include_dirs]
+    diagnostics = validate_equipment(target, indexes)
+    for index in indexes:
+        index.close()
+
+    errors = [d for d in diagnostics if d.severity == "error"]
+    warnings = [d for d in diagnostics if d.severity == "warning"]
+
+    if errors:
+        print("=" * 70)
+        print("ERRORS")
+        print("=" * 70)
+        print()
+        for error in errors:
+            print(error)
+
+    if warnings:
+        print("=" * 70)
+        print("WARNINGS")
+        print("=" * 70)
+        print()
+        for warning in warnings:
+            print(warning)
+
+    print("=" * 70)
+    print("VALIDATION SUMMARY")
+    print("=" * 70)
+
+    by_property = defaultdict(int)
+    for diagnostic in diagnostics:
+        by_property[diagnostic.property_name] += 1
+    for property_name, count in sorted(by_property.items()):
+        print(f"   {property_name}: {count} issue(s)")
+
+    print(f"\n❌ Total errors: {len(errors)}")
+    print(f"⚠️  Total warnings: {len(warnings)}")
+    print()
+
+    if errors:
+        print("❌ Validation FAILED")
+        sys.exit(1)
+    elif warnings:
+        print("⚠️  Validation PASSED with warnings")
+        sys.exit(0)
+    else:
+        print("✅ Validation PASSED")
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+BG3 Boost/Functor Semantic Validator
+
+Parses every functor-list property (``Boosts``, ``SpellProperties``,
+``StatsFunctors``, ``TickFunctors``, ...) with functor_parser.py and checks
+each call against a declarative signature table: argument counts, enum
+arguments (abilities, skills, damage types, resistance levels, roll types),
+integer arguments (``AC``), dice notation in damage and healing amounts, and
+``ApplyStatus`` chance and duration ranges. Values that do not parse at all
+are reported too.
+
+Results are cached per unique string, so a pass over the whole
+``reference/vanilla_data`` dump checks each distinct expression once. With
+``--baseline`` only diagnostics missing from a recorded baseline fail the
+run, which turns the vanilla dump into a regression oracle for CI.
+
+Usage:
+    python3 validate_functors.py <file_or_directory> [--baseline FILE [--update-baseline]]
+
+Example:
+    python3 validate_functors.py Public/EldertideArmament/
+    python3 validate_functors.py reference/vanilla_data --baseline reference/vanilla_functors_baseline.json
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
+
+import profiling
+from functor_parser import (
+    AST_CACHE_SIZE, FUNCTOR_KEYS, BinaryOp, Call, Dice, Empty, Name, Number, ParseError, String,
+    UnaryOp, iter_calls, parse_functors, to_source,
+)
+from stats_parser import find_stats_files, load_stats_file
+from validate_items import VALID_ABILITIES
+from validate_spells import VALID_DAMAGE_TYPES
+
+# Pre-compiled regex patterns for better performance
+_COMMA_SEPARATOR_ERROR = re.compile(r'\),\s*\w+\(')
+_DICE_LIKE = re.compile(r'\d+d\d+')
+
+# Valid values from BG3 vanilla data
+VALID_SKILLS = {
+    "Acrobatics", "AnimalHandling", "Arcana", "Athletics", "Deception", "History",
+    "Insight", "Intimidation", "Investigation", "Medicine", "Nature", "Perception",
+    "Performance", "Persuasion", "Religion", "SleightOfHand", "Stealth", "Survival",
+}
+
+VALID_RESISTANCE_LEVELS = {
+    "Resistant", "Immune", "Vulnerable",
+    "ResistantToMagical", "ImmuneToMagical", "VulnerableToMagical",
+    "ResistantToNonMagical", "ImmuneToNonMagical", "VulnerableToNonMagical",
+}
+
+VALID_ROLL_TYPES = {
+    "Attack", "MeleeWeaponAttack", "RangedWeaponAttack", "MeleeSpellAttack", "RangedSpellAttack",
+    "MeleeUnarmedAttack", "RangedUnarmedAttack", "MeleeOffHandWeaponAttack", "RangedOffHandWeaponAttack",
+    "SkillCheck", "SavingThrow", "RawAbility", "Damage", "DeathSavingThrow",
+}
+
+VALID_DAMAGE_FLAGS = {"Magical", "Nonmagical", "Nonlethal", "NonLethal"}
+
+VALID_DICE_SIDES = {4, 6, 8, 10, 12, 20, 100}
+
+# Properties only used to fill in tooltip text; their findings are warnings
+DISPLAY_KEYS = frozenset({
+    "DescriptionParams", "ExtraDescriptionParams", "TooltipUpcastDescriptionParams",
+    "TooltipDamage", "TooltipDamageList", "TooltipConditionalDamage", "TooltipStatusApply",
+})
+
+# Leading arguments that pick who a functor acts on rather than what it does
+TARGET_KEYWORDS = frozenset({
+    "SELF", "TARGET", "SOURCE", "SWAP", "OBSERVER_OBSERVER", "OBSERVER_SOURCE", "OBSERVER_TARGET",
+})
+
+
+class Signature(NamedTuple):
+    """Parameter kinds of one boost or functor.
+
+    A kind ending in ``?`` is optional (it may be omitted or left empty) and
+    ``*`` accepts any further arguments unchecked. With ``target`` a leading
+    target keyword (``SELF``, ``SWAP``, ...) is accepted before the parameters,
+    as is an entity getter such as ``GetItemInEquipmentSlot(...)`` when the
+    first parameter is a name and so cannot be a call.
+    """
+    params: Tuple[str, ...]
+    target: bool = False
+
+
+# Boosts and functors with a known argument layout, checked call by call
+SIGNATURES: Dict[str, Signature] = {
+    # Functors
+    "ApplyStatus": Signature(("status", "chance?", "duration?", "*"), target=True),
+    "RemoveStatus": Signature(("status", "*"), target=True),
+    "DealDamage": Signature(("amount", "damage_type", "damage_flag?", "*"), target=True),
+    "RegainHitPoints": Signature(("amount", "*"), target=True),
+    # Boosts
+    "UnlockSpell": Signature(("spell", "*")),
+    "Resistance": Signature(("resistance_type", "resistance_level", "*")),
+    "AC": Signature(("int",)),
+    "RollBonus": Signature(("roll_type", "amount", "ability_or_skill?")),
+    "Ability": Signature(("ability", "int", "int?", "bool?")),
+    "Skill": Signature(("skill", "amount")),
+    "ProficiencyBonus": Signature(("proficiency_type", "ability_or_skill")),
+    "DamageBonus": Signature(("amount", "damage_type?", "bool?")),
+    "WeaponDamage": Signature(("amount", "damage_type", "bool?")),
+    "CharacterWeaponDamage": Signature(("amount", "damage_type?", "damage_flag?")),
+    "CharacterUnarmedDamage": Signature(("amount", "damage_type?", "damage_flag?")),
+    "IncreaseMaxHP": Signature(("amount",)),
+    "TemporaryHP": Signature(("amount", "bool?")),
+    "StatusImmunity": Signature(("name", "*")),
+}
+
+
+class FunctorError:
+    def __init__(self, file_path: str, line_num: int, entry_name: str,
+                 property_name: str, value: str, message: str, severity: str = "error"):
+        self.file_path = file_path
+        self.line_num = line_num
+        self.entry_name = entry_name
+        self.property_name = property_name
+        self.value = value
+        self.message = message
+        self.severity = severity  # "error" or "warning"
+
+    def __str__(self) -> str:
+        icon = "❌" if self.severity == "error" else "⚠️"
+        return (f"{icon} {self.file_path}:{self.line_num} - {self.entry_name}\n"
+                f"   Property: {self.property_name}\n"
+                f"   Value: {self.value}\n"
+                f"   {self.severity.title()}: {self.message}\n")
+
+
+# ============================================================================
+# Argument kinds
+# ============================================================================
+
+# A finding about one argument: (severity, message), or None when it is fine
+Finding = Optional[Tuple[str, str]]
+
+
+def _enum(valid: Set[str], label: str):
+    valid_str = ", ".join(sorted(valid))
+
+    def check(arg) -> Finding:
+        if isinstance(arg, Name) and arg.name in valid:
+            return None
+        return "error", f"Invalid {label} '{to_source(arg)}'. Valid: {valid_str}"
+    return check
+
+
+def _check_amount(arg) -> Finding:
+    """Damage, healing and bonus amounts: numbers, dice and formulas of them."""
+    if isinstance(arg, (String, Empty)):
+        return "error", f"Expected an amount, got '{to_source(arg)}'"
+    stack = [arg]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Dice):
+            if node.count < 1:
+                return "error", f"Dice '{to_source(node)}' rolls no dice"
+            if node.sides not in VALID_DICE_SIDES:
+                return "warning", f"Unusual die 'd{node.sides}'"
+        elif isinstance(node, Name):
+            if _DICE_LIKE.search(node.name):
+                return "error", f"Malformed dice notation '{node.name}'"
+        elif isinstance(node, BinaryOp):
+            stack.extend((node.left, node.right))
+        elif isinstance(node, UnaryOp):
+            stack.append(node.operand)
+        elif isinstance(node, Call):
+            stack.extend(node.args)
+    return None
+
+
+def _check_int(arg) -> Finding:
+    if isinstance(arg, Number) and isinstance(arg.value, int) and not arg.percent:
+        return None
+    return "error", f"Expected an integer, got '{to_source(arg)}'"
+
+
+def _check_bool(arg) -> Finding:
+    if isinstance(arg, Name) and arg.name in ("true", "false"):
+        return None
+    return "error", f"Expected true or false, got '{to_source(arg)}'"
+
+
+def _check_identifier(arg) -> Finding:
+    if isinstance(arg, (Name, String)) and to_source(arg).strip("'"):
+        return None
+    return "error", f"Expected a name, got '{to_source(arg)}'"
+
+
+def _check_chance(arg) -> Finding:
+    if not isinstance(arg, Number):
+        return None
+    if not 0 <= arg.value <= 100:
+        return "error", f"Chance {to_source(arg)} is outside 0-100"
+    return None
+
+
+def _check_duration(arg) -> Finding:
+    if not isinstance(arg, Number):
+        return None
+    if not isinstance(arg.value, int) or arg.value < -1:
+        return "error", f"Duration {to_source(arg)} must be a whole number of turns, or -1 for permanent"
+    return None
+
+
+def _check_damage_type(arg) -> Finding:
+    # Weapon-derived types such as MainMeleeWeaponDamageType are resolved in game
+    if isinstance(arg, Name) and (arg.name in VALID_DAMAGE_TYPES or arg.name.endswith("DamageType")):
+        return None
+    return "error", f"Invalid damage type '{to_source(arg)}'. Valid: {', '.join(sorted(VALID_DAMAGE_TYPES))}"
+
+
+_IDENTIFIER_KINDS = frozenset({"status", "spell", "name"})
+
+# Parameter kind -> check of one argument
+KIND_CHECKS = {
+    "status": _check_identifier,
+    "spell": _check_identifier,
+    "name": _check_identifier,
+    "int": _check_int,
+    "bool": _check_bool,
+    "amount": _check_amount,
+    "chance": _check_chance,
+    "duration": _check_duration,
+    "damage_type": _check_damage_type,
+    "damage_flag": _enum(VALID_DAMAGE_FLAGS, "damage flag"),
+    "resistance_type": _enum(VALID_DAMAGE_TYPES | {"All"}, "damage type"),
+    "resistance_level": _enum(VALID_RESISTANCE_LEVELS, "resistance level"),
+    "roll_type": _enum(VALID_ROLL_TYPES, "roll type"),
+    "ability": _enum(VALID_ABILITIES, "ability"),
+    "skill": _enum(VALID_SKILLS, "skill"),
+    "ability_or_skill": _enum(VALID_ABILITIES | VALID_SKILLS, "ability or skill"),
+    "proficiency_type": _enum({"SavingThrow", "Skill"}, "proficiency type"),
+}
+
+
+# ============================================================================
+# Checks
+# ============================================================================
+
+def check_call(call: Call) -> List[Tuple[str, str]]:
+    """Check one call against its signature.
+
+    Returns:
+        (severity, message) findings; empty for calls without a signature
+    """
+    signature = SIGNATURES.get(call.name)
+    if signature is None:
+        return []
+
+    args = call.args
+    if signature.target and args:
+        first = args[0]
+        if ((isinstance(first, Name) and first.name in TARGET_KEYWORDS)
+                or (isinstance(first, Call) and signature.params[0] in _IDENTIFIER_KINDS)):
+            args = args[1:]
+
+    findings: List[Tuple[str, str]] = []
+    params = signature.params
+    variadic = params[-1] == "*"
+    if variadic:
+        params = params[:-1]
+    required = sum(1 for kind in params if not kind.endswith("?"))
+
+    if len(args) < required:
+        findings.append(("error", f"{call.name} takes at least {required} argument(s), got {len(args)}"))
+    elif len(args) > len(params) and not variadic:
+        findings.append(("error", f"{call.name} takes at most {len(params)} argument(s), got {len(args)}"))
+
+    for kind, arg in zip(params, args):
+        optional = kind.endswith("?")
+        if isinstance(arg, Empty):
+            if not optional:
+                findings.append(("error", f"{call.name} is missing its {kind.rstrip('?')} argument"))
+            continue
+        finding = KIND_CHECKS[kind.rstrip("?")](arg)
+        if finding is not None:
+            findings.append(finding)
+    return findings
+
+
+@lru_cache(maxsize=AST_CACHE_SIZE)
+def check_functor_value(value: str) -> Tuple[Tuple[str, str, str], ...]:
+    """Check a functor-list value; cached by the raw string.
+
+    Returns:
+        (severity, offending text, message) findings
+    """
+    try:
+        parsed = parse_functors(value)
+    except ParseError as error:
+        if _COMMA_SEPARATOR_ERROR.search(value):
+            message = "Use semicolons (;) not commas (,) to separate multiple boosts/functors"
+        else:
+            message = f"Could not parse: {error}"
+        return (("error", value, message),)
+
+    findings = []
+    for call in iter_calls(parsed):
+        for severity, message in check_call(call):
+            findings.append((severity, to_source(call), message))
+    return tuple(findings)
+
+
+def validate_functor_file(file_path: Union[str, Path]) -> List[FunctorError]:
+    """Check every functor-list property of one stats file, as written.
+
+    Inherited values are checked where they are defined, so each value is
+    reported once however many entries inherit it. Findings in tooltip-only
+    properties (``DISPLAY_KEYS``) are downgraded to warnings.
+    """
+    try:
+        stats = load_stats_file(file_path)
+    except (OSError, UnicodeDecodeError) as e:
+        return [FunctorError(str(file_path), 0, "", "", "", f"Failed to read file: {e}")]
+
+    errors: List[FunctorError] = []
+    file_str = str(file_path)
+    for entry in stats.entries:
+        if entry.kind != "entry":
+            continue
+        for key, value, line_num in entry.items(FUNCTOR_KEYS):
+            if not value:
+                continue
+            display = key in DISPLAY_KEYS
+            for severity, text, message in check_functor_value(value):
+                if display:
+                    severity = "warning"
+                errors.append(FunctorError(file_str, line_num, entry.name, key, text, message, severity))
+    return errors
+
+
+def find_functor_files(target: Union[str, Path]) -> List[Path]:
+    """Return the stats files to check for a file or directory target."""
+    path = Path(target)
+    if path.is_file():
+        return [path] if path.suffix == ".txt" else []
+    return find_stats_files(path)
+
+
+def validate_functors(target: Union[str, Path]) -> List[FunctorError]:
+    """Check every functor-list property under a file or directory.
+
+    Returns:
+        Errors first, then warnings, each in file order
+    """
+    diagnostics: List[FunctorError] = []
+    for file_path in find_functor_files(target):
+        diagnostics.extend(validate_functor_file(file_path))
+    errors = [d for d in diagnostics if d.severity == "error"]
+    warnings = [d for d in diagnostics if d.severity != "error"]
+    return errors + warnings
+
+
+# ============================================================================
+# Baselines
+# ============================================================================
+
+def baseline_key(diagnostic: FunctorError, root: Union[str, Path]) -> str:
+    """Identify a diagnostic independently of line numbers and checkout path."""
+    rel = os.path.relpath(diagnostic.file_path, root)
+    return "|".join((Path(rel).as_posix(), diagnostic.entry_name, diagnostic.property_name,
+                     diagnostic.value, diagnostic.message))
+
+
+def load_baseline(path: Union[str, Path]) -> Set[str]:
+    with open(path, "r", encoding="utf-8") as f:
+        return set(json.load(f)["diagnostics"])
+
+
+def save_baseline(path: Union[str, Path], keys: Sequence[str]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"diagnostics": sorted(set(keys))}, f, indent=1)
+        f.write("\n")
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    parser = argparse.ArgumentParser(description="BG3 Boost/Functor Semantic Validator")
+    parser.add_argument("target", help="Stats file or directory to validate")
+    parser.add_argument("--baseline", help="JSON file of known diagnostics; only new ones fail the run.")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Write the current diagnostics to --baseline instead of comparing.")
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.start_from_args(args)
+
+    target = args.target
+
+    if not os.path.exists(target):
+        print(f"❌ Error: Path does not exist: {target}")
+        sys.exit(1)
+
+    if args.update_baseline and not args.baseline:
+        print("❌ Error: --update-baseline needs --baseline")
+        sys.exit(1)
+
+    print("=" * 70)
+    print("BG3 Boost/Functor Validator")
+    print("=" * 70)
+    print()
+
+    start = time.perf_counter()
+    diagnostics = validate_functors(target)
+    elapsed = time.perf_counter() - start
+
+    root = target if os.path.isdir(target) else os.path.dirname(target)
+    if args.update_baseline:
+        save_baseline(args.baseline, [baseline_key(d, root) for d in diagnostics])
+        print(f"✅ Wrote {len(diagnostics)} diagnostic(s) to {args.baseline}")
+        sys.exit(0)
+
+    known: Set[str] = set()
+    if args.baseline:
+        if not os.path.isfile(args.baseline):
+            print(f"❌ Error: Baseline does not exist: {args.baseline}")
+            sys.exit(1)
+        known = load_baseline(args.baseline)
+        print(f"📋 Baseline: {len(known)} known diagnostic(s) from {args.baseline}")
+        print()
+
+    new = [d for d in diagnostics if baseline_key(d, root) not in known]
+    errors = [d for d in new if d.severity == "error"]
+    warnings = [d for d in new if d.severity == "warning"]
+
+    if errors:
+        print("=" * 70)
+        print("ERRORS")
+        print("=" * 70)
+        print()
+        for error in errors:
+            print(error)
+
+    if warnings:
+        print("=" * 70)
+        print("WARNINGS")
+        print("=" * 70)
+        print()
+        for warning in warnings:
+            print(warning)
+
+    print("=" * 70)
+    print("VALIDATION SUMMARY")
+    print("=" * 70)
+
+    by_property = defaultdict(int)
+    for diagnostic in new:
+        by_property[diagnostic.property_name] += 1
+    for property_name, count in sorted(by_property.items()):
+        print(f"   {property_name}: {count} issue(s)")
+
+    if args.baseline:
+        print(f"\n📋 Known (baseline): {len(diagnostics) - len(new)}")
+    print(f"\n❌ Total errors: {len(errors)}")
+    print(f"⚠️  Total warnings: {len(warnings)}")
+    print(f"⏱️  Checked in {elapsed:.3f}s")
+    print()
+
+    if errors:
+        print("❌ Validation FAILED")
+        sys.exit(1)
+    elif warnings:
+        print("⚠️  Validation PASSED with warnings")
+        sys.exit(0)
+    else:
+        print("✅ Validation PASSED")
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+"""
+BG3 Icon Atlas Validator
+
+Icons reach the game two ways: the texture atlas described by
+``GUI/Icons_*.lsx`` (``IconUV`` nodes mapping a ``MapKey`` to a UV rectangle
+of the atlas texture) and the standalone ``.DDS`` files under
+``Public/Game/GUI/Assets`` (controller UI and tooltip icons). This module
+checks:
+
+- every stats ``Icon`` names an atlas ``MapKey`` or a DDS icon, or a base-game
+  icon the included dumps' stats use
+- every UV rectangle lies inside the atlas, on the icon grid given by
+  ``TextureAtlasIconSize``, is one icon large and shares no cell with another
+- no ``MapKey`` other than ``PLACEHOLDER`` (reserved empty slots) repeats
+- every DDS file has a valid header, the dimensions its folder expects
+  (144 px controller icons, 380 px tooltip icons), a known pixel format and
+  at least the bytes its header promises; the atlas texture, when present,
+  matches ``TextureAtlasTextureSize``
+- controller and tooltip icons come in pairs
+
+DDS files are mapped with ``mmap`` and only their 128/148-byte headers are
+read, so no pixel data is decoded.
+
+Usage:
+    python3 validate_icons.py <path_to_mod_directory> [--include DIR ...]
+
+Example:
+    python3 validate_icons.py Public/EldertideArmament/
+"""
+
+import argparse
+import mmap
+import os
+import re
+import struct
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
+
+import profiling
+from stats_parser import find_stats_files, load_stats_file
+from symbol_index import ICON_TYPE, SymbolIndex, open_symbol_index
+from validate_references import DEFAULT_INCLUDE_DIRS
+
+# Atlas key the icon sheet uses for reserved, empty slots
+PLACEHOLDER_KEY = "PLACEHOLDER"
+
+# Expected edge length of the DDS icons per asset folder
+DDS_SIZES = {
+    "ControllerUIIcons": 144,
+    "Tooltips": 380,
+}
+
+# Folders holding the controller and the tooltip version of the same icons
+DDS_PAIRS = (
+    ("ControllerUIIcons/items_png", "Tooltips/ItemIcons"),
+    ("ControllerUIIcons/skills_png", "Tooltips/Icons"),
+)
+
+# Pixel formats: FourCC / DXGI code -> (name, bytes per 4x4 block); uncompressed
+# DXGI formats map to (name, bits per pixel) instead
+_FOURCC_FORMATS = {
+    b"DXT1": ("BC1", 8), b"DXT3": ("BC2", 16), b"DXT5": ("BC3", 16),
+    b"ATI1": ("BC4", 8), b"BC4U": ("BC4", 8), b"ATI2": ("BC5", 16), b"BC5U": ("BC5", 16),
+}
+_DXGI_FORMATS = {
+    71: ("BC1_UNORM", 8), 72: ("BC1_UNORM_SRGB", 8), 74: ("BC2_UNORM", 16), 75: ("BC2_UNORM_SRGB", 16),
+    77: ("BC3_UNORM", 16), 78: ("BC3_UNORM_SRGB", 16), 80: ("BC4_UNORM", 8), 81: ("BC4_SNORM", 8),
+    83: ("BC5_UNORM", 16), 84: ("BC5_SNORM", 16), 95: ("BC6H_UF16", 16), 96: ("BC6H_SF16", 16),
+    98: ("BC7_UNORM", 16), 99: ("BC7_UNORM_SRGB", 16),
+}
+_DXGI_UNCOMPRESSED = {28: ("R8G8B8A8_UNORM", 32), 29: ("R8G8B8A8_UNORM_SRGB", 32), 87: ("B8G8R8A8_UNORM", 32)}
+
+_DDS_MAGIC = b"DDS "
+_DDS_HEADER_SIZE = 124
+_DX10_HEADER_SIZE = 20
+_DDPF_FOURCC = 0x4
+
+# Base-game icons the partial reference dumps never use
+_EXTERNAL_ICONS = frozenset({
+    "Action_Barbarian_Rage_BearTotem", "Action_Barbarian_Rage_EagleTotem", "Action_Cat_Claws",
+    "Action_DippedFire_Melee", "Action_Dragonborn_BreathWeapon_Acid", "Action_Dragonborn_BreathWeapon_Cold",
+    "Action_Dragonborn_BreathWeapon_FireCone", "Action_Dragonborn_BreathWeapon_Lightning",
+    "Action_Dragonborn_BreathWeapon_Poison", "Action_Mag_Bloodfeeding_ScarletRegeneration",
+    "PassiveFeature_ArmorOfAgathys", "PassiveFeature_BeguilingDefenses", "PassiveFeature_BloodMerchant_ExplosiveBlood",
+    "PassiveFeature_DivineHealth", "PassiveFeature_Evasion", "PassiveFeature_HeartOfTheStorm_Lightning",
+    "PassiveFeature_LandsStride_DifficultTerrain", "PassiveFeature_Lifedrinker", "PassiveFeature_MageSlayer_Advantage",
+    "PassiveFeature_PeaceBreaker", "PassiveFeature_ShieldMaster_Dodge", "PassiveFeature_ThoughtShield_PsychicResistance",
+    "PassiveFeature_WarPriest", "PassiveFeature_WildMagicSurge",
+    "Skill_Druid_WildShape_Heal",
+    "Spell_Evocation_FireShield_Warm", "Spell_Evocation_IceStorm", "Spell_Evocation_SearingSmite",
+    "Spell_Necromancy_FalseLife", "Spell_Transmutation_Enlarge",
+    "Status_Acid", "Status_Frozen", "Status_Petrified", "Status_Shocked",
+    "TadpoleSuperPower_BlackHole", "TadpoleSuperPower_MindBlast", "TadpoleSuperPower_MindSanctuary",
+})
+
+_ICON_UV = re.compile(r'<node id="IconUV">(.*?)</node>', re.DOTALL)
+_ATTRIBUTE = re.compile(r'<attribute id="(\w+)" type="\w+" value="([^"]*)"')
+_SIZE_NODE = re.compile(r'<node id="(TextureAtlasIconSize|TextureAtlasTextureSize)">(.*?)</node>', re.DOTALL)
+_ATLAS_PATH = re.compile(r'<attribute id="Path" type="\w+" value="([^"]*)"')
+
+
+class IconError:
+    def __init__(self, file_path: str, line_num: int, entry_name: str,
+                 property_name: str, value: str, message: str, severity: str = "error"):
+        self.file_path = file_path
+        self.line_num = line_num
+        self.entry_name = entry_name
+        self.property_name = property_name
+        self.value = value
+        self.message = message
+        self.severity = severity  # "error" or "warning"
+
+    def __str__(self) -> str:
+        icon = "❌" if self.severity == "error" else "⚠️"
+        return (f"{icon} {self.file_path}:{self.line_num} - {self.entry_name}\n"
+                f"   Property: {self.property_name}\n"
+                f"   Value: {self.value}\n"
+                f"   {self.severity.title()}: {self.message}\n")
+
+
+class DdsInfo(NamedTuple):
+    """What a DDS header says about the image."""
+    width: int
+    height: int
+    mipmaps: int
+    format: str  # "" when unrecognised
+    data_size: int  # bytes of the top mip level, 0 when the format is unrecognised
+    data_offset: int
+    file_size: int
+
+
+class IconUV(NamedTuple):
+    key: str
+    u1: float
+    u2: float
+    v1: float
+    v2: float
+    line: int
+
+
+class IconAtlas(NamedTuple):
+    """One ``GUI/Icons_*.lsx`` file."""
+    path: str
+    texture: str  # TextureAtlasPath, relative to the mod directory
+    icon_size: Tuple[int, int]  # (width, height) in pixels
+    texture_size: Tuple[int, int]
+    icons: List[IconUV]
+    problems: List[Tuple[int, str, str]]  # (line, value, message)
+
+
+def read_dds_header(path: Union[str, Path]) -> DdsInfo:
+    """Read the header of a DDS file without touching its pixel data.
+
+    Raises:
+        ValueError: The file is not a DDS file or its header is truncated
+    """
+    with open(path, "rb") as f:
+        file_size = os.fstat(f.fileno()).st_size
+        if file_size < 4 + _DDS_HEADER_SIZE:
+            raise ValueError(f"File is too short for a DDS header ({file_size} bytes)")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            header = mm[:4 + _DDS_HEADER_SIZE + _DX10_HEADER_SIZE]
+
+    magic, size, _, height, width, _, _, mipmaps = struct.unpack_from("<4s7I", header)
+    if magic != _DDS_MAGIC or size != _DDS_HEADER_SIZE:
+        raise ValueError("Not a DDS file (bad magic or header size)")
+    pf_flags, fourcc, bit_count = struct.unpack_from("<I4sI", header, 80)
+
+    data_offset = 4 + _DDS_HEADER_SIZE
+    name, block_bytes, bits = "", 0, 0
+    if pf_flags & _DDPF_FOURCC and fourcc == b"DX10":
+        if len(header) < data_offset + _DX10_HEADER_SIZE:
+            raise ValueError("DX10 header is truncated")
+        data_offset += _DX10_HEADER_SIZE
+        dxgi = struct.unpack_from("<I", header, 4 + _DDS_HEADER_SIZE)[0]
+        if dxgi in _DXGI_FORMATS:
+            name, block_bytes = _DXGI_FORMATS[dxgi]
+        elif dxgi in _DXGI_UNCOMPRESSED:
+            name, bits = _DXGI_UNCOMPRESSED[dxgi]
+    elif pf_flags & _DDPF_FOURCC:
+        if fourcc in _FOURCC_FORMATS:
+            name, block_bytes = _FOURCC_FORMATS[fourcc]
+    elif bit_count:
+        name, bits = f"RGB{bit_count}", bit_count
+
+    if block_bytes:
+        data_size = max(1, (width + 3) // 4) * max(1, (height + 3) // 4) * block_bytes
+    else:
+        data_size = width * height * bits // 8
+    return DdsInfo(width, height, max(mipmaps, 1), name, data_size, data_offset, file_size)
+
+
+def _line_at(text: str, pos: int) -> int:
+    return text.count("\n", 0, pos) + 1
+
+
+def load_icon_atlas(path: Union[str, Path]) -> Optional[IconAtlas]:
+    """Parse a ``GUI/*.lsx`` icon atlas; None when the file describes no atlas."""
+    with open(path, "r", encoding="utf-8-sig") as f:
+        text = f.read()
+    if 'id="IconUVList"' not in text:
+        return None
+
+    problems: List[Tuple[int, str, str]] = []
+    sizes: Dict[str, Tuple[int, int]] = {}
+    for match in _SIZE_NODE.finditer(text):
+        attributes = dict(_ATTRIBUTE.findall(match.group(2)))
+        try:
+            sizes[match.group(1)] = (int(attributes["Width"]), int(attributes["Height"]))
+        except (KeyError, ValueError):
+            problems.append((_line_at(text, match.start()), match.group(1), "Width and Height must be integers"))
+    for node in ("TextureAtlasIconSize", "TextureAtlasTextureSize"):
+        if node not in sizes and not any(value == node for _, value, _ in problems):
+            problems.append((1, node, f"Atlas has no {node} node"))
+    texture = _ATLAS_PATH.search(text)
+
+    icons: List[IconUV] = []
+    for match in _ICON_UV.finditer(text):
+        line_num = _line_at(text, match.start())
+        attributes = dict(_ATTRIBUTE.findall(match.group(1)))
+        key = attributes.get("MapKey", "")
+        try:
+            icons.append(IconUV(key, float(attributes["U1"]), float(attributes["U2"]),
+                                float(attributes["V1"]), float(attributes["V2"]), line_num))
+        except (KeyError, ValueError):
+            problems.append((line_num, key, "IconUV needs numeric U1, U2, V1 and V2 attributes"))
+
+    return IconAtlas(str(path), texture.group(1) if texture else "",
+                     sizes.get("TextureAtlasIconSize", (0, 0)), sizes.get("TextureAtlasTextureSize", (0, 0)),
+                     icons, problems)
+
+
+def find_atlas_files(directory: Union[str, Path]) -> List[Path]:
+    return sorted(Path(directory).rglob("GUI/*.lsx"))
+
+
+def dds_dirs(directory: Union[str, Path]) -> List[Path]:
+    """Return the directories holding a mod's DDS icons: the mod and the sibling ``Public/Game/GUI``."""
+    directory = Path(directory)
+    return [root for root in (directory, directory.parent / "Game" / "GUI") if root.is_dir()]
+
+
+def find_dds_files(directory: Union[str, Path]) -> List[Path]:
+    found = set()
+    for root in dds_dirs(directory):
+        found.update(p for p in root.rglob("*") if p.suffix.lower() == ".dds")
+    return sorted(found)
+
+
+def _check_atlas(atlas: IconAtlas, errors: List[IconError], warnings: List[IconError]) -> None:
+    file_str = atlas.path
+    for line_num, value, message in atlas.problems:
+        errors.append(IconError(file_str, line_num, "", "atlas", value, message))
+
+    (icon_w, icon_h), (tex_w, tex_h) = atlas.icon_size, atlas.texture_size
+    if not (icon_w and icon_h and tex_w and tex_h):
+        return
+    if tex_w % icon_w or tex_h % icon_h:
+        errors.append(IconError(
+            file_str, 1, "", "TextureAtlasIconSize", f"{icon_w}x{icon_h}",
+            f"Icons do not tile the {tex_w}x{tex_h} atlas",
+        ))
+
+    first_key: Dict[str, int] = {}
+    cells: Dict[Tuple[int, int], IconUV] = {}
+    for icon in atlas.icons:
+        if icon.key != PLACEHOLDER_KEY:
+            if icon.key in first_key:
+                errors.append(IconError(
+                    file_str, icon.line, icon.key, "MapKey", icon.key,
+                    f"MapKey is already mapped at line {first_key[icon.key]}",
+                ))
+            else:
+                first_key[icon.key] = icon.line
+
+        rect = f"U {icon.u1}-{icon.u2}, V {icon.v1}-{icon.v2}"
+        if not (0.0 <= icon.u1 < icon.u2 <= 1.0 and 0.0 <= icon.v1 < icon.v2 <= 1.0):
+            errors.append(IconError(file_str, icon.line, icon.key, "IconUV", rect, "Rectangle is empty or outside the atlas"))
+            continue
+        # Pixel edges; UVs are stored as decimal fractions, so allow rounding
+        x1, x2, y1, y2 = icon.u1 * tex_w, icon.u2 * tex_w, icon.v1 * tex_h, icon.v2 * tex_h
+        on_grid = all(abs(edge - round(edge / step) * step) < 0.01
+                      for edge, step in ((x1, icon_w), (x2, icon_w), (y1, icon_h), (y2, icon_h)))
+        if not on_grid:
+            errors.append(IconError(
+                file_str, icon.line, icon.key, "IconUV", rect,
+                f"Rectangle is not on the {icon_w}x{icon_h} icon grid",
+            ))
+            continue
+        if round(x2 - x1) != icon_w or round(y2 - y1) != icon_h:
+            warnings.append(IconError(
+                file_str, icon.line, icon.key, "IconUV", rect,
+                f"Rectangle is {round(x2 - x1)}x{round(y2 - y1)} px, not one {icon_w}x{icon_h} icon", "warning",
+            ))
+        overlap = None
+        for cx in range(round(x1 / icon_w), round(x2 / icon_w)):
+            for cy in range(round(y1 / icon_h), round(y2 / icon_h)):
+                other = cells.setdefault((cx, cy), icon)
+                if other is not icon and overlap is None:
+                    overlap = (other, cx, cy)
+        if overlap:
+            other, cx, cy = overlap
+            errors.append(IconError(
+                file_str, icon.line, icon.key, "IconUV", rect,
+                f"Overlaps '{other.key}' at line {other.line} (cell {cx},{cy})",
+            ))
+
+
+def _check_dds(path: Path, expected: Optional[Tuple[int, int]],
+               errors: List[IconError], warnings: List[IconError]) -> Optional[DdsInfo]:
+    file_str = str(path)
+    try:
+        info = read_dds_header(path)
+    except (OSError, ValueError) as e:
+        errors.append(IconError(file_str, 0, path.stem, "DDS header", "", str(e)))
+        return None
+
+    size = f"{info.width}x{info.height}"
+    if expected and (info.width, info.height) != expected:
+        errors.append(IconError(
+            file_str, 0, path.stem, "DDS size", size, f"Expected {expected[0]}x{expected[1]} px",
+        ))
+    if not info.format:
+        warnings.append(IconError(
+            file_str, 0, path.stem, "DDS format", "", "Unrecognised pixel format", "warning",
+        ))
+    elif info.file_size < info.data_offset + info.data_size:
+        errors.append(IconError(
+            file_str, 0, path.stem, "DDS size", size,
+            f"File has {info.file_size} bytes but a {size} {info.format} image needs "
+            f"{info.data_offset + info.data_size}",
+        ))
+    return info
+
+
+def validate_icons(directory: Union[str, Path], indexes: Sequence[SymbolIndex] = ()) -> List[IconError]:
+    """Check the icon atlases, DDS icons and stats ``Icon`` names of a mod.
+
+    Args:
+        directory: Mod directory (``Public/<Mod>``; DDS icons are also looked
+            up under the sibling ``Public/Game/GUI``)
+        indexes: Symbol indexes of the included dumps, for base-game icons
+
+    Returns:
+        Errors first, then warnings, each in file order
+    """
+    directory = Path(directory)
+    errors: List[IconError] = []
+    warnings: List[IconError] = []
+
+    known: Set[str] = set()
+    for file_path in find_atlas_files(directory):
+        try:
+            atlas = load_icon_atlas(file_path)
+        except (OSError, UnicodeDecodeError) as e:
+            errors.append(IconError(str(file_path), 0, "", "", "", f"Failed to read file: {e}"))
+            continue
+        if atlas is None:
+            continue
+        _check_atlas(atlas, errors, warnings)
+        known.update(icon.key for icon in atlas.icons)
+
+        texture = directory / atlas.texture if atlas.texture else None
+        if texture is not None and texture.is_file():
+            info = _check_dds(texture, atlas.texture_size, errors, warnings)
+            if info and info.mipmaps > 1:
+                warnings.append(IconError(
+                    str(texture), 0, texture.stem, "DDS mipmaps", str(info.mipmaps),
+                    "Atlas texture has mipmaps; neighbouring icons bleed into each other at lower levels",
+                    "warning",
+                ))
+
+    folders: Dict[str, Set[str]] = defaultdict(set)
+    for file_path in find_dds_files(directory):
+        parts = file_path.parts
+        size = next((DDS_SIZES[part] for part in parts if part in DDS_SIZES), None)
+        _check_dds(file_path, (size, size) if size else None, errors, warnings)
+        known.add(file_path.stem)
+        folders[file_path.parent.as_posix()].add(file_path.stem)
+
+    for controller, tooltip in DDS_PAIRS:
+        sides = [(folder, names) for folder, names in folders.items()
+                 if folder.endswith(controller) or folder.endswith(tooltip)]
+        pair = {suffix: set().union(*(names for folder, names in sides if folder.endswith(suffix)))
+                for suffix in (controller, tooltip)}
+        if not pair[controller] and not pair[tooltip]:
+            continue
+        for has, lacks in ((controller, tooltip), (tooltip, controller)):
+            for name in sorted(pair[has] - pair[lacks]):
+                warnings.append(IconError(
+                    next(folder for folder, names in sides if name in names and folder.endswith(has)), 0, name,
+                    "DDS icon", name, f"Icon is in {has} but not in {lacks}", "warning",
+                ))
+
+    references = []
+    for file_path in find_stats_files(directory):
+        try:
+            stats = load_stats_file(file_path)
+        except (OSError, UnicodeDecodeError):
+            continue
+        for entry in stats.entries:
+            if entry.kind != "entry":
+                continue
+            for _, value, line_num in entry.items((ICON_TYPE,)):
+                if value:
+                    references.append((str(file_path), line_num, entry.name, value))
+
+    missing = {value for _, _, _, value in references} - known - _EXTERNAL_ICONS
+    for index in indexes:
+        if not missing:
+            break
+        missing.difference_update(index.lookup_many(missing, (ICON_TYPE,)))
+    for file_str, line_num, entry_name, value in references:
+        if value in missing:
+            errors.append(IconError(
+                file_str, line_num, entry_name, "Icon", value,
+                "No atlas MapKey or DDS icon with this name, and not a known base-game icon",
+            ))
+
+    return errors + warnings
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    parser = argparse.ArgumentParser(description="BG3 Icon Atlas Validator")
+    parser.add_argument("target", help="Path to mod directory to validate")
+    parser.add_argument(
+        "--include",
+        nargs="*",
+        default=[d for d in DEFAULT_INCLUDE_DIRS if os.path.isdir(d)],
+        help=(
+            "Directories whose stats icons count as existing (vanilla dumps, compatibility mods). "
+            "Defaults to the bundled reference dumps; pass --include with no directories to disable."
+        ),
+    )
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.start_from_args(args)
+
+    target = args.target
+
+    if not os.path.exists(target):
+        print(f"❌ Error: Path does not exist: {target}")
+        sys.exit(1)
+
+    if not os.path.isdir(target):
+        print(f"❌ Error: Path must be a directory: {target}")
+        sys.exit(1)
+
+    print("=" * 70)
+    print("BG3 Icon Atlas Validator")
+    print("=" * 70)
+    print()
+
+    include_dirs = []
+    for extra in args.include:
+        if not os.path.isdir(extra):
+            print(f"⚠️  Skipping include dir (not found): {extra}")
+            continue
+        print(f"➕ Including definitions from: {extra}")
+        include_dirs.append(extra)
+    print()
+
+    indexes = [open_symbol_index(extra) for extra in include_dirs]
+    diagnostics = validate_icons(target, indexes)
+    for index in indexes:
+        index.close()
+
+    errors = [d for d in diagnostics if d.severity == "error"]
+    warnings = [d for d in diagnostics if d.severity == "warning"]
+
+    if errors:
+        print("=" * 70)
+        print("ERRORS")
+        print("=" * 70)
+        print()
+        for error in errors:
+            print(error)
+
+    if warnings:
+        print("=" * 70)
+        print("WARNINGS")
+        print("=" * 70)
+        print()
+        for warning in warnings:
+            print(warning)
+
+    print("=" * 70)
+    print("VALIDATION SUMMARY")
+    print("=" * 70)
+
+    by_property = defaultdict(int)
+    for diagnostic in diagnostics:
+        by_property[diagnostic.property_name] += 1
+    for property_name, count in sorted(by_property.items()):
+        print(f"   {property_name}: {count} issue(s)")
+
+    print(f"\n❌ Total errors: {len(errors)}")
+    print(f"⚠️  Total warnings: {len(warnings)}")
+    print()
+
+    if errors:
+        print("❌ Validation FAILED")
+        sys.exit(1)
+    elif warnings:
+        print("⚠️  Validation PASSED with warnings")
+        sys.exit(0)
+    else:
+        print("✅ Validation PASSED")
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,34 +6,47 @@ This script validates item and armor definitions in BG3 mod files against known
 valid values and patterns from vanilla Baldur's Gate 3 data.
 
 Usage:
-    python3 validate_items.py <path_to_item_files_or_directory>
+    python3 validate_items.py <path_to_item_files_or_directory> [--include DIR ...] [--jobs N]
 
 Example:
     python3 validate_items.py Public/EldertideArmament/Stats/Generated/Data/
     python3 validate_items.py Public/EldertideArmament/Stats/Generated/Data/Armor.txt
+    python3 validate_items.py Public/EldertideArmament/Stats/Generated/Data/ --include reference/vanilla_data
+    python3 validate_items.py reference/vanilla_data/GustavDev/ --jobs 4
+
+Boosts syntax (e.g. commas between boosts) and argument values (e.g. unknown
+ability names) are checked by validate_functors.py, not here; run it too, or
+run eldertide_validate.py for both:
+    python3 validate_functors.py Public/EldertideArmament/
 """
 
+import argparse
 import sys
 import os
 import re
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Sequence, Tuple, Optional
+
+import profiling
+from functor_parser import Number, ParseError, iter_calls, parse_functors, to_source
+from stats_parser import load_stats_file
+from parallel_validation import map_files, resolve_jobs
+from stats_resolver import StatsResolver, build_resolver
+from stats_rules import DiagnosticSink, RuleSet, one_of
 
 # Try to import caching module (optional dependency)
 try:
-    from validation_cache import ValidationCache
+    from validation_cache import ValidationCache, rules_fingerprint
     CACHING_AVAILABLE = True
 except ImportError:
     CACHING_AVAILABLE = False
     ValidationCache = None  # For type hints when not available
 
+# Printed after the summary: Boosts syntax and values are not checked here
+_FUNCTORS_HINT = "ℹ️  Boosts syntax and argument values are checked by validate_functors.py"
+
 # Pre-compiled regex patterns for better performance
-_ENTRY_PATTERN = re.compile(r'new entry "([^"]+)"')
-_USING_PATTERN = re.compile(r'using "([^"]+)"')
-_DATA_PATTERN = re.compile(r'data "([^"]+)" "([^"]*)"')
 _UUID_FORMAT = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', re.IGNORECASE)
-_ABILITY_BOOST_PATTERN = re.compile(r'Ability\((\w+),\s*(\d+),\s*(\d+)\)')
-_COMMA_SEPARATOR_ERROR = re.compile(r'\),\s*\w+\(')
 
 # Configuration constants
 MAX_ABILITY_CAP = 30  # Maximum reasonable ability score cap
@@ -62,7 +75,6 @@ VALID_ABILITIES = {
 _VALID_USING_TYPES_STR = ', '.join(sorted(VALID_USING_TYPES))
 _VALID_OBJECT_CATEGORIES_STR = ', '.join(sorted(VALID_OBJECT_CATEGORIES))
 _VALID_RARITIES_STR = ', '.join(sorted(VALID_RARITIES))
-_VALID_ABILITIES_STR = ', '.join(sorted(VALID_ABILITIES))
 
 class ValidationError:
     def __init__(self, file_path: str, line_num: int, entry_name: str, 
@@ -82,304 +94,209 @@ class ValidationError:
                 f"   Value: {self.value}\n"
                 f"   {self.severity.title()}: {self.message}\n")
 
-def parse_item_entry(lines: List[str], start_idx: int) -> Tuple[Dict[str, str], int]:
-    """Parse a single item entry and return properties dict and end index."""
-    entry = {}
-    entry_name = ""
-    i = start_idx
-    
-    # Get entry name - use pre-compiled pattern
-    match = _ENTRY_PATTERN.match(lines[i])
-    if match:
-        entry_name = match.group(1)
-        entry["_name"] = entry_name
-        entry["_start_line"] = i + 1
-    
-    i += 1
-    
-    # Parse properties until next entry or end
-    while i < len(lines):
-        line = lines[i].strip()
-        
-        # Check for next entry
-        if line.startswith("new entry"):
-            break
-            
-        # Parse using line - use pre-compiled pattern
-        match = _USING_PATTERN.match(line)
-        if match:
-            entry["using"] = match.group(1)
+# Suggested value ranges by rarity (these are guidelines)
+RARITY_VALUE_RANGES = {
+    "Common": (1, 50),
+    "Uncommon": (40, 200),
+    "Rare": (150, 600),
+    "VeryRare": (500, 2000),
+    "Legendary": (1000, 5000),
+}
+
+# Property checks; each runs only for entries that have its property
+ITEM_RULES = RuleSet()
+
+ITEM_RULES.add("using", one_of(
+    VALID_USING_TYPES, f"Invalid base type. Valid options: {_VALID_USING_TYPES_STR}", "error"))
+
+@ITEM_RULES.rule("RootTemplate")
+def check_uuid(uuid: str, entry: Dict[str, str], sink: DiagnosticSink) -> None:
+    """Validate RootTemplate UUID format."""
+    # Use pre-compiled UUID pattern
+    if not _UUID_FORMAT.match(uuid):
+        sink.report(uuid, "Invalid UUID format. Should be: xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx", "error")
+
+ITEM_RULES.add("ObjectCategory", one_of(
+    VALID_OBJECT_CATEGORIES, f"Invalid ObjectCategory. Valid options: {_VALID_OBJECT_CATEGORIES_STR}", "error"))
+
+ITEM_RULES.add("Rarity", one_of(
+    VALID_RARITIES, f"Invalid Rarity. Valid options: {_VALID_RARITIES_STR}", "error"))
+
+@ITEM_RULES.rule("Boosts")
+def check_boosts(boosts_str: str, entry: Dict[str, str], sink: DiagnosticSink) -> None:
+    """Flag unbalanced ability boosts.
+
+    Syntax, argument counts and enum values of every boost are checked by
+    validate_functors.py; this only applies item balance guidelines.
+    """
+    try:
+        boosts = parse_functors(boosts_str)
+    except ParseError:
+        return
+    
+    for call in iter_calls(boosts):
+        if call.name != "Ability" or len(call.args) < 2:
+            continue
+        bonus = call.args[1]
+        cap = call.args[2] if len(call.args) > 2 else None
         
-        # Parse data line - use pre-compiled pattern
-        match = _DATA_PATTERN.match(line)
-        if match:
-            key = match.group(1)
-            value = match.group(2)
-            entry[key] = value
+        if isinstance(cap, Number) and cap.value > MAX_ABILITY_CAP:
+            sink.report(to_source(call),
+                        f"Ability cap {cap.value} exceeds reasonable maximum ({MAX_ABILITY_CAP}). Consider balance.",
+                        "warning")
         
-        i += 1
-    
-    return entry, i
+        if isinstance(bonus, Number) and bonus.value > MAX_ABILITY_BONUS:
+            sink.report(to_source(call), f"Ability bonus +{bonus.value} is very high. Consider balance.", "warning")
 
-def validate_using_clause(entry: Dict[str, str], file_path: str) -> List[ValidationError]:
-    """Validate using clause."""
-    errors = []
-    
-    if "using" in entry:
-        using = entry["using"]
-        if using not in VALID_USING_TYPES:
-            # Cache dict lookups for performance
-            entry_name = entry["_name"]
-            entry_line = entry["_start_line"]
-            errors.append(ValidationError(
-                file_path, entry_line, entry_name,
-                "using", using,
-                f"Invalid base type. Valid options: {_VALID_USING_TYPES_STR}",
-                "error"
-            ))
-    
-    return errors
-
-def validate_uuid(entry: Dict[str, str], file_path: str) -> List[ValidationError]:
-    """Validate RootTemplate UUID format."""
-    errors = []
+@ITEM_RULES.rule("ValueOverride", requires=("Rarity",))
+def check_value(value_str: str, entry: Dict[str, str], sink: DiagnosticSink) -> None:
+    """Validate ValueOverride is reasonable for rarity."""
+    try:
+        value = int(value_str)
+    except ValueError:
+        sink.report(value_str, "ValueOverride should be a number", "error")
+        return
+    
+    rarity = entry["Rarity"]
+    if rarity in RARITY_VALUE_RANGES:
+        min_val, max_val = RARITY_VALUE_RANGES[rarity]
+        if value < min_val or value > max_val:
+            sink.report(str(value), f"{rarity} items typically valued {min_val}-{max_val}. Current: {value}",
+                        "warning")
+
+def validate_item_file(file_path: str, cache: Optional[ValidationCache] = None,
+                       resolver: Optional[StatsResolver] = None) -> Tuple[int, List[ValidationError]]:
+    """Validate a single item file.
     
-    if "RootTemplate" in entry:
-        uuid = entry["RootTemplate"]
-        # Use pre-compiled UUID pattern
-        if not _UUID_FORMAT.match(uuid):
-            # Cache dict lookups for performance
-            entry_name = entry["_name"]
-            entry_line = entry["_start_line"]
-            errors.append(ValidationError(
-                file_path, entry_line, entry_name,
-                "RootTemplate", uuid,
-                "Invalid UUID format. Should be: xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx",
-                "error"
-            ))
-    
-    return errors
-
-def validate_object_category(entry: Dict[str, str], file_path: str) -> List[ValidationError]:
-    """Validate ObjectCategory."""
-    errors = []
+    Entries are checked with their effective values, i.e. including every
+    property inherited through ``using``. Without a resolver only parents
+    defined in the same file are followed.
+    """
     
-    if "ObjectCategory" in entry:
-        category = entry["ObjectCategory"]
-        if category not in VALID_OBJECT_CATEGORIES:
-            # Cache dict lookups for performance
-            entry_name = entry["_name"]
-            entry_line = entry["_start_line"]
-            errors.append(ValidationError(
-                file_path, entry_line, entry_name,
-                "ObjectCategory", category,
-                f"Invalid ObjectCategory. Valid options: {_VALID_OBJECT_CATEGORIES_STR}",
-                "error"
-            ))
-    
-    return errors
-
-def validate_rarity(entry: Dict[str, str], file_path: str) -> List[ValidationError]:
-    """Validate Rarity."""
-    errors = []
+    valid_count = 0
     
-    if "Rarity" in entry:
-        rarity = entry["Rarity"]
-        if rarity not in VALID_RARITIES:
-            # Cache dict lookups for performance
-            entry_name = entry["_name"]
-            entry_line = entry["_start_line"]
-            errors.append(ValidationError(
-                file_path, entry_line, entry_name,
-                "Rarity", rarity,
-                f"Invalid Rarity. Valid options: {_VALID_RARITIES_STR}",
-                "error"
-            ))
-    
-    return errors
-
-def validate_boosts(entry: Dict[str, str], file_path: str) -> List[ValidationError]:
-    """Validate Boosts property format and values."""
-    errors = []
+    # Results also depend on every file `using` parents may come from: the
+    # include dirs plus the path and stat of each stats file in load order, so
+    # a parent added or overridden in another file invalidates this result
+    variant = (f"{';'.join(resolver.directories)}@{resolver.load_order_digest()}"
+               if resolver is not None else "")
     
-    if "Boosts" in entry:
-        boosts = entry["Boosts"]
-        
-        # Cache dict lookups for performance
-        entry_name = entry["_name"]
-        entry_line = entry["_start_line"]
-        
-        # Check for comma instead of semicolon (common mistake) - use pre-compiled pattern
-        if _COMMA_SEPARATOR_ERROR.search(boosts):
-            errors.append(ValidationError(
-                file_path, entry_line, entry_name,
-                "Boosts", boosts[:50] + "...",
-                "Boosts should use semicolons (;) not commas (,) to separate multiple boosts",
-                "error"
-            ))
-        
-        # Validate ability boosts - use pre-compiled pattern
-        for match in _ABILITY_BOOST_PATTERN.finditer(boosts):
-            ability = match.group(1)
-            bonus = int(match.group(2))
-            cap = int(match.group(3))
-            
-            if ability not in VALID_ABILITIES:
-                errors.append(ValidationError(
-                    file_path, entry_line, entry_name,
-                    "Boosts", match.group(0),
-                    f"Invalid ability '{ability}'. Valid: {_VALID_ABILITIES_STR}",
-                    "error"
-                ))
-            
-            if cap > MAX_ABILITY_CAP:
-                errors.append(ValidationError(
-                    file_path, entry_line, entry_name,
-                    "Boosts", match.group(0),
-                    f"Ability cap {cap} exceeds reasonable maximum ({MAX_ABILITY_CAP}). Consider balance.",
-                    "warning"
-                ))
-            
-            if bonus > MAX_ABILITY_BONUS:
-                errors.append(ValidationError(
-                    file_path, entry_line, entry_name,
-                    "Boosts", match.group(0),
-                    f"Ability bonus +{bonus} is very high. Consider balance.",
-                    "warning"
-                ))
-    
-    return errors
-
-def validate_value(entry: Dict[str, str], file_path: str) -> List[ValidationError]:
-    """Validate ValueOverride is reasonable for rarity."""
-    errors = []
-    
-    if "ValueOverride" in entry and "Rarity" in entry:
-        value_str = entry["ValueOverride"]
-        rarity = entry["Rarity"]
-        
-        # Cache dict lookups for performance
-        entry_name = entry["_name"]
-        entry_line = entry["_start_line"]
-        
-        try:
-            value = int(value_str)
-            
-            # Suggested value ranges by rarity (these are guidelines)
-            rarity_ranges = {
-                "Common": (1, 50),
-                "Uncommon": (40, 200),
-                "Rare": (150, 600),
-                "VeryRare": (500, 2000),
-                "Legendary": (1000, 5000),
-            }
-            
-            if rarity in rarity_ranges:
-                min_val, max_val = rarity_ranges[rarity]
-                if value < min_val or value > max_val:
-                    errors.append(ValidationError(
-                        file_path, entry_line, entry_name,
-                        "ValueOverride", str(value),
-                        f"{rarity} items typically valued {min_val}-{max_val}. Current: {value}",
-                        "warning"
-                    ))
-        except ValueError:
-            errors.append(ValidationError(
-                file_path, entry_line, entry_name,
-                "ValueOverride", value_str,
-                "ValueOverride should be a number",
-                "error"
-            ))
-    
-    return errors
-
-def validate_item_file(file_path: str, cache: Optional[ValidationCache] = None) -> Tuple[int, List[ValidationError]]:
-    """Validate a single item file."""
-    
-    # Try to load from cache if available
+    # Try to load from cache first; a hit only stats the files above, the
+    # file itself and the parents' files recorded with it, reading none of them
     if cache and CACHING_AVAILABLE:
-        cached = cache.load_cached_results(file_path)
+        cached = cache.load_cached_results(file_path, variant=variant)
         if cached is not None:
-            return cached
-    
-    errors = []
-    valid_count = 0
-    entry_errors = {}  # Track errors per entry name
+            valid_count, cached_errors = cached
+            return valid_count, [ValidationError(**e) for e in cached_errors]
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        stats = load_stats_file(file_path)
     except Exception as e:
-        errors.append(ValidationError(
-            file_path, 0, "", "", "", f"Failed to read file: {e}", "error"
-        ))
-        return 0, errors
-    
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
+        return 0, [ValidationError(file_path, 0, "", "", "", f"Failed to read file: {e}", "error")]
+    
+    if resolver is None:
+        resolver = StatsResolver()
+        resolver.add_file(stats)
+    
+    # Results depend on every file that defines an inherited parent
+    dependencies = resolver.ancestor_files(stats.entries) - {stats.path}
+    
+    # Every rule reports into this one sink for the whole file
+    sink = DiagnosticSink(ValidationError, file_path)
+    errors = sink.items
+    for item in stats.of_type("Armor"):
+        first = ITEM_RULES.run(resolver.effective(item), sink)
         
-        # Find item entry (Armor type) - optimized to avoid unnecessary string joining
-        if line.startswith('new entry'):
-            # Check next few lines for type without joining (more efficient)
-            # Ensure we don't go beyond array bounds
-            max_lookahead = min(5, len(lines) - i)
-            is_armor_type = any('type "Armor"' in lines[i+j] for j in range(max_lookahead))
-            
-            if is_armor_type:
-                entry, next_i = parse_item_entry(lines, i)
-                entry_name = entry.get("_name", "")
-                
-                # Run all validations and collect errors for this entry
-                entry_errors[entry_name] = []
-                entry_errors[entry_name].extend(validate_using_clause(entry, file_path))
-                entry_errors[entry_name].extend(validate_uuid(entry, file_path))
-                entry_errors[entry_name].extend(validate_object_category(entry, file_path))
-                entry_errors[entry_name].extend(validate_rarity(entry, file_path))
-                entry_errors[entry_name].extend(validate_boosts(entry, file_path))
-                entry_errors[entry_name].extend(validate_value(entry, file_path))
-                
-                # Add entry errors to global list
-                errors.extend(entry_errors[entry_name])
-                
-                # Count as valid if no errors (warnings OK)
-                has_errors = any(e.severity == "error" for e in entry_errors[entry_name])
-                if not has_errors:
-                    valid_count += 1
-                
-                i = next_i
-            else:
-                i += 1
+        # Count as valid if no errors (warnings OK)
+        for i in range(first, len(errors)):
+            if errors[i].severity == "error":
+                break
         else:
-            i += 1
+            valid_count += 1
     
     results = (valid_count, errors)
     
-    # Save to cache if available
+    # Save to cache if available (errors are stored as plain dicts)
     if cache and CACHING_AVAILABLE:
-        cache.save_cached_results(file_path, results)
+        cache.save_cached_results(file_path, [valid_count, [vars(e) for e in errors]], dependencies, variant)
     
     return results
 
-def validate_directory(directory: str) -> Tuple[int, List[ValidationError]]:
-    """Validate all item files in a directory."""
+def find_item_files(directory: str) -> List[Path]:
+    """Return the item files to validate for a file or directory target."""
+    path = Path(directory)
+    if path.is_file():
+        if path.suffix == ".txt":
+            return [path]
+        return []
+    # Look for Armor.txt, Object.txt, etc.
+    item_files = list(path.glob("**/Armor.txt"))
+    item_files.extend(path.glob("**/Object.txt"))
+    return item_files
+
+def create_cache() -> Optional[ValidationCache]:
+    """Return this validator's result cache, or None if caching is unavailable.
+    
+    Results are keyed by a fingerprint of this module and the stats parser and
+    resolver, so editing the rules here only invalidates cached items results.
+    """
+    if not CACHING_AVAILABLE:
+        return None
+    fingerprint = rules_fingerprint(__name__, "stats_parser", "stats_resolver", "stats_rules", "functor_parser")
+    return ValidationCache(namespace="items", fingerprint=fingerprint)
+
+# Per-process state for --jobs workers (set by _init_worker)
+_worker_resolver: Optional[StatsResolver] = None
+_worker_use_cache = False
+
+def _init_worker(resolver: StatsResolver, use_cache: bool) -> None:
+    """Pool initializer: share the parent's resolver with each worker."""
+    global _worker_resolver, _worker_use_cache
+    _worker_resolver = resolver
+    _worker_use_cache = use_cache
+
+def _validate_in_worker(file_path: str):
+    """Validate one file in a pool worker; returns (results, cache stats)."""
+    cache = create_cache() if _worker_use_cache else None
+    results = validate_item_file(file_path, cache, _worker_resolver)
+    if cache is None:
+        return results, None
+    cache.close()
+    return results, cache.get_stats()
+
+def _print_file_result(valid: int, errors: List[ValidationError]) -> None:
+    """Print the per-file progress summary."""
+    # Count errors and warnings in a single pass with early exit optimization
+    error_count = sum(1 for e in errors if e.severity == "error")
+    warning_count = len(errors) - error_count  # More efficient than second iteration
+    
+    if error_count > 0:
+        print(f"   ❌ Found {error_count} error(s)")
+    if warning_count > 0:
+        print(f"   ⚠️  Found {warning_count} warning(s)")
+    if error_count == 0 and warning_count == 0:
+        print(f"   ✅ All {valid} item(s) valid")
+    print()
+
+def validate_directory(directory: str, include_dirs: Sequence[str] = (),
+                       jobs: int = 1) -> Tuple[int, List[ValidationError]]:
+    """Validate all item files in a directory.
+    
+    ``using`` parents are resolved across the whole target directory plus
+    ``include_dirs`` (vanilla dumps, compatibility mods). With ``jobs > 1``
+    files are validated in a process pool.
+    """
     all_errors = []
     total_valid = 0
     
     # Initialize cache if available
-    cache = ValidationCache() if CACHING_AVAILABLE else None
+    cache = create_cache()
     
-    path = Path(directory)
+    # Build the inheritance graph once; every file shares the memoized parents
+    resolver = build_resolver(directory, include_dirs)
     
     # Find all item files
-    item_files = []
-    if path.is_file():
-        if path.suffix == ".txt":
-            item_files = [path]
-    else:
-        # Look for Armor.txt, Object.txt, etc.
-        item_files = list(path.glob("**/Armor.txt"))
-        item_files.extend(path.glob("**/Object.txt"))
+    item_files = find_item_files(directory)
     
     if not item_files:
         print(f"❌ No item files found in {directory}")
@@ -391,25 +308,36 @@ def validate_directory(directory: str) -> Tuple[int, List[ValidationError]]:
     else:
         print()
     
-    # Process files with progress indication
-    for idx, item_file in enumerate(item_files, 1):
-        file_size = item_file.stat().st_size / 1024  # Size in KB
-        print(f"🔍 [{idx}/{len(item_files)}] Validating: {item_file.name} ({file_size:.1f} KB)")
-        valid, errors = validate_item_file(str(item_file), cache)
-        total_valid += valid
-        all_errors.extend(errors)
-        
-        # Count errors and warnings in a single pass with early exit optimization
-        error_count = sum(1 for e in errors if e.severity == "error")
-        warning_count = len(errors) - error_count  # More efficient than second iteration
+    if jobs > 1:
+        # Fan out to a process pool; progress streams in completion order while
+        # results are merged in file order so error output matches a serial run
+        def report(idx, file_path, result, completed):
+            (valid, errors), _ = result
+            file_size = item_files[idx].stat().st_size / 1024  # Size in KB
+            print(f"🔍 [{completed}/{len(item_files)}] Validated: {item_files[idx].name} ({file_size:.1f} KB)")
+            _print_file_result(valid, errors)
         
-        if error_count > 0:
-            print(f"   ❌ Found {error_count} error(s)")
-        if warning_count > 0:
-            print(f"   ⚠️  Found {warning_count} warning(s)")
-        if error_count == 0 and warning_count == 0:
-            print(f"   ✅ All {valid} item(s) valid")
-        print()
+        # Workers receive the resolver fully loaded rather than each parsing it
+        resolver.load()
+        results = map_files(
+            _validate_in_worker, [str(f) for f in item_files], jobs,
+            initializer=_init_worker, initargs=(resolver, cache is not None),
+            on_done=report,
+        )
+        for (valid, errors), cache_stats in results:
+            total_valid += valid
+            all_errors.extend(errors)
+            if cache and cache_stats:
+                cache.merge_stats(cache_stats)
+    else:
+        # Process files with progress indication
+        for idx, item_file in enumerate(item_files, 1):
+            file_size = item_file.stat().st_size / 1024  # Size in KB
+            print(f"🔍 [{idx}/{len(item_files)}] Validating: {item_file.name} ({file_size:.1f} KB)")
+            valid, errors = validate_item_file(str(item_file), cache, resolver)
+            total_valid += valid
+            all_errors.extend(errors)
+            _print_file_result(valid, errors)
     
     # Print cache stats if available
     if cache and CACHING_AVAILABLE:
@@ -422,7 +350,26 @@ def main():
         print(__doc__)
         sys.exit(1)
     
-    target = sys.argv[1]
+    parser = argparse.ArgumentParser(description="BG3 Item/Armor Definition Validator",
+                                     epilog="Boosts syntax and argument values are checked by validate_functors.py.")
+    parser.add_argument("target", help="Item file or directory to validate")
+    parser.add_argument(
+        "--include",
+        nargs="*",
+        default=[],
+        help="Optional additional directories to resolve inherited `using` parents from (vanilla dumps, compatibility mods).",
+    )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=1,
+        help="Validate files in N worker processes (0 = one per CPU).",
+    )
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.start_from_args(args)
+    
+    target = args.target
     
     if not os.path.exists(target):
         print(f"❌ Error: Path does not exist: {target}")
@@ -433,7 +380,7 @@ def main():
     print("=" * 70)
     print()
     
-    valid_count, all_errors = validate_directory(target)
+    valid_count, all_errors = validate_directory(target, args.include, resolve_jobs(args.jobs))
     
     # Separate errors and warnings in a single pass
     errors = []
@@ -477,6 +424,8 @@ def main():
     print(f"   Total errors: {len(errors)}")
     print(f"   Total warnings: {len(warnings)}")
     print()
+    print(_FUNCTORS_HINT)
+    print()
     
     if errors:
         print("❌ Validation FAILED (errors found)")
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+BG3 Localization Handle Validator
+
+Checks that every localization handle a mod uses resolves to text:
+
+- ``DisplayName``, ``Description`` and ``ExtraDescription`` of every stats entry
+- ``TranslatedString`` attributes in ``TooltipExtras/*.lsx`` and the
+  ``Localization/*.lsx`` resources of the mod (e.g. ``Generic_Books.lsf.lsx``)
+
+Each handle must exist in the mod's ``.loca.xml`` files (or those of the
+included dumps) and the version it asks for must match the localization.
+Handles the included dumps' own stats use are base-game text and are accepted
+without a version check, as the game's localization is not part of the dumps.
+
+The ``[1]``, ``[2]``, ... placeholders of each resolved description are also
+counted against the entry's ``DescriptionParams`` (inherited values included):
+a placeholder without a parameter renders as a broken tooltip, a parameter
+without a placeholder is never shown.
+
+The handle table is built by loca_index.py and cached with the symbol indexes,
+so each handle is resolved with one dict lookup.
+
+Usage:
+    python3 validate_localization.py <path_to_mod_directory> [--include DIR ...]
+
+Example:
+    python3 validate_localization.py Public/EldertideArmament/
+"""
+
+import argparse
+import os
+import re
+import sys
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+import profiling
+from loca_index import LocaIndex, find_loca_files, open_loca_index, split_handle
+from stats_parser import find_stats_files, load_stats_file
+from stats_resolver import StatsResolver, build_resolver
+from symbol_index import LOCA_TYPE, TRANSLATED_KEYS, SymbolIndex, open_symbol_index
+from validate_references import DEFAULT_INCLUDE_DIRS
+
+_HANDLE_PATTERN = re.compile(r'^h[0-9a-f]{8}g[0-9a-f]{4}g[0-9a-f]{4}g[0-9a-f]{4}g[0-9a-f]{12}$')
+_PLACEHOLDER_PATTERN = re.compile(r'\[(\d+)\]')
+
+# Text property -> property holding the values of its [N] placeholders
+DESCRIPTION_PARAMS = {
+    "Description": "DescriptionParams",
+    "ExtraDescription": "ExtraDescriptionParams",
+    "TooltipUpcastDescription": "TooltipUpcastDescriptionParams",
+}
+
+
+class LocalizationError:
+    def __init__(self, file_path: str, line_num: Optional[int], entry_name: str,
+                 property_name: str, value: str, message: str, severity: str = "error"):
+        self.file_path = file_path
+        self.line_num = line_num  # None for .lsx resources (iterparse has no line numbers)
+        self.entry_name = entry_name
+        self.property_name = property_name
+        self.value = value
+        self.message = message
+        self.severity = severity  # "error" or "warning"
+
+    def __str__(self) -> str:
+        icon = "❌" if self.severity == "error" else "⚠️"
+        location = self.file_path if self.line_num is None else f"{self.file_path}:{self.line_num}"
+        return (f"{icon} {location} - {self.entry_name}\n"
+                f"   Property: {self.property_name}\n"
+                f"   Value: {self.value}\n"
+                f"   {self.severity.title()}: {self.message}\n")
+
+
+def mod_localization_dirs(mod_dir: Union[str, Path]) -> List[Path]:
+    """Return the localization folders belonging to a mod.
+
+    For ``<root>/Public/<Mod>`` these are ``<root>/Localization`` and
+    ``<root>/Mods/<Mod>/Localization``; a ``Localization`` folder inside the
+    mod directory itself is used as well.
+    """
+    mod_dir = Path(mod_dir).resolve()
+    candidates = [mod_dir / "Localization"]
+    if mod_dir.parent.name == "Public":
+        root = mod_dir.parent.parent
+        candidates += [root / "Localization", root / "Mods" / mod_dir.name / "Localization"]
+    return [d for d in candidates if d.is_dir()]
+
+
+def localization_files(mod_dir: Union[str, Path], include_dirs: Sequence[str] = ()) -> List[Path]:
+    """Return the ``.loca.xml`` files to index, included dumps first so the mod's text wins."""
+    files: List[Path] = []
+    for directory in include_dirs:
+        files.extend(find_loca_files(directory))
+    for directory in mod_localization_dirs(mod_dir):
+        files.extend(find_loca_files(directory))
+    return files
+
+
+def find_translated_lsx_files(mod_dir: Union[str, Path]) -> List[Path]:
+    """Return the mod's ``.lsx`` resources that carry translated strings."""
+    files = sorted((Path(mod_dir) / "TooltipExtras").glob("*.lsx"))
+    for directory in mod_localization_dirs(mod_dir):
+        files.extend(sorted(directory.glob("*.lsx")))
+    return files
+
+
+def iter_translated_strings(path: Union[str, Path]) -> Iterator[Tuple[str, str, str, Optional[int]]]:
+    """Stream ``(node label, attribute id, handle, version)`` from an ``.lsx`` file.
+
+    The label is the node's ``UUID`` attribute when it has one, else its id.
+    """
+    for _, elem in ET.iterparse(str(path)):
+        if elem.tag != "node":
+            continue
+        label = elem.get("id", "")
+        translated = []
+        for attribute in elem.iterfind("attribute"):
+            if attribute.get("id") == "UUID":
+                label = attribute.get("value", label)
+            elif attribute.get("type") == "TranslatedString" and attribute.get("handle") is not None:
+                version = attribute.get("version", "")
+                translated.append((attribute.get("id", ""), attribute.get("handle"),
+                                   int(version) if version.isdigit() else None))
+        for attribute_id, handle, version in translated:
+            yield label, attribute_id, handle, version
+        # Child nodes were reported at their own end, so the subtree can go
+        elem.clear()
+
+
+def check_handle(loca: LocaIndex, external: Set[str], handle: str,
+                 version: Optional[int]) -> Optional[Tuple[str, str]]:
+    """Return ``(severity, message)`` for a handle that does not resolve cleanly."""
+    if not _HANDLE_PATTERN.match(handle):
+        return "error", "Value is not a localization handle"
+    found = loca.handles.get(handle)
+    if found is None:
+        if handle in external:
+            return None
+        return "error", "Handle does not exist in the localization files"
+    if version is not None and version != found[0]:
+        return "warning", f"Handle version {version} does not match localization version {found[0]}"
+    return None
+
+
+def validate_localization(directory: Union[str, Path], loca: LocaIndex,
+                          indexes: Sequence[SymbolIndex] = ()) -> List[LocalizationError]:
+    """Resolve every handle used by the mod's stats and ``.lsx`` resources.
+
+    Args:
+        directory: Mod directory
+        loca: Handle index of the mod's (and included dumps') localization
+        indexes: Symbol indexes of the included dumps; handles their stats use
+                 count as base-game text
+
+    Returns:
+        Errors first, then warnings, each in file order
+    """
+    external: Set[str] = set()
+    for index in indexes:
+        external |= index.names(LOCA_TYPE)
+
+    errors: List[LocalizationError] = []
+    warnings: List[LocalizationError] = []
+
+    def report(file_str, line_num, entry_name, property_name, value, handle, version):
+        problem = check_handle(loca, external, handle, version)
+        if problem is not None:
+            severity, message = problem
+            target = errors if severity == "error" else warnings
+            target.append(LocalizationError(file_str, line_num, entry_name, property_name,
+                                            value, message, severity))
+
+    for file_path in find_stats_files(directory):
+        try:
+            stats = load_stats_file(file_path)
+        except (OSError, UnicodeDecodeError):
+            continue
+        file_str = str(file_path)
+        for entry in stats.entries:
+            if entry.kind != "entry":
+                continue
+            for key, value, line_num in entry.items(TRANSLATED_KEYS):
+                if value:
+                    handle, version = split_handle(value)
+                    report(file_str, line_num, entry.name, key, value, handle, version)
+
+    for file_path in find_translated_lsx_files(directory):
+        file_str = str(file_path)
+        try:
+            for label, attribute_id, handle, version in iter_translated_strings(file_path):
+                value = handle if version is None else f"{handle};{version}"
+                report(file_str, None, label, attribute_id, value, handle, version)
+        except ET.ParseError as e:
+            errors.append(LocalizationError(file_str, None, file_path.name, "XML", "",
+                                            f"Could not parse file: {e}"))
+
+    return errors + warnings
+
+
+def split_params(value: str) -> List[str]:
+    """Split a ``DescriptionParams`` value on the semicolons outside parentheses."""
+    params: List[str] = []
+    depth = 0
+    start = 0
+    for i, char in enumerate(value):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == ";" and depth == 0:
+            params.append(value[start:i])
+            start = i + 1
+    params.append(value[start:])
+    return [param.strip() for param in params if param.strip()]
+
+
+def validate_description_params(directory: Union[str, Path], loca: LocaIndex,
+                                resolver: StatsResolver) -> List[LocalizationError]:
+    """Compare the placeholders of each description with its parameter count.
+
+    Every entry the mod defines is resolved through ``resolver`` (so inherited
+    descriptions and parameters count) and its text looked up in ``loca``;
+    descriptions whose handle is not in ``loca`` are skipped.
+
+    Returns:
+        Errors (placeholders without a parameter) first, then warnings
+        (parameters no placeholder uses)
+    """
+    # Mod entries and the line of each property they set themselves
+    entries: List[Tuple[str, str, int, Dict[str, int]]] = []
+    for file_path in find_stats_files(directory):
+        try:
+            stats = load_stats_file(file_path)
+        except (OSError, UnicodeDecodeError):
+            continue
+        file_str = str(file_path)
+        for entry in stats.entries:
+            if entry.kind == "entry":
+                lines = {key: line_num for key, value, line_num in entry.items()}
+                entries.append((file_str, entry.name, entry.line, lines))
+
+    errors: List[LocalizationError] = []
+    warnings: List[LocalizationError] = []
+    handles = loca.handles
+
+    for file_str, name, entry_line, lines in entries:
+        properties = resolver.resolve(name)
+        for text_key, params_key in DESCRIPTION_PARAMS.items():
+            value = properties.get(text_key)
+            if not value:
+                continue
+            found = handles.get(value.partition(";")[0])
+            if found is None:
+                continue
+
+            placeholders = {int(index) for index in _PLACEHOLDER_PATTERN.findall(found[1])}
+            highest = max(placeholders, default=0)
+            params_value = properties.get(params_key, "")
+            count = len(split_params(params_value))
+            if highest == count:
+                continue
+
+            line_num = lines.get(params_key, lines.get(text_key, entry_line))
+            if highest > count:
+                errors.append(LocalizationError(
+                    file_str, line_num, name, params_key, params_value,
+                    f"{text_key} text uses placeholder [{highest}] but only {count} parameter(s) are given",
+                ))
+            else:
+                if highest:
+                    message = f"{count} parameter(s) given but {text_key} text only uses up to [{highest}]"
+                else:
+                    message = f"{count} parameter(s) given but {text_key} text uses no placeholders"
+                warnings.append(LocalizationError(
+                    file_str, line_num, name, params_key, params_value, message, severity="warning",
+                ))
+
+    return errors + warnings
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    parser = argparse.ArgumentParser(description="BG3 Localization Handle Validator")
+    parser.add_argument("target", help="Path to mod directory to validate")
+    parser.add_argument(
+        "--include",
+        nargs="*",
+        default=[d for d in DEFAULT_INCLUDE_DIRS if os.path.isdir(d)],
+        help=(
+            "Additional directories whose localization and stats handles are accepted. "
+            "Defaults to the bundled reference dumps; pass --include with no directories to disable."
+        ),
+    )
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.start_from_args(args)
+
+    target = args.target
+
+    if not os.path.exists(target):
+        print(f"❌ Error: Path does not exist: {target}")
+        sys.exit(1)
+
+    if not os.path.isdir(target):
+        print(f"❌ Error: Path must be a directory: {target}")
+        sys.exit(1)
+
+    print("=" * 70)
+    print("BG3 Localization Handle Validator")
+    print("=" * 70)
+    print()
+
+    loca = open_loca_index(localization_files(target, args.include))
+    print(f"🌐 Loaded {len(loca)} handle(s) from {len(loca.files)} localization file(s)")
+    for extra in args.include:
+        print(f"➕ Including definitions from: {extra}")
+    print()
+
+    indexes = [open_symbol_index(d) for d in args.include]
+    try:
+        diagnostics = validate_localization(target, loca, indexes)
+        diagnostics += validate_description_params(target, loca, build_resolver(target, args.include))
+    finally:
+        for index in indexes:
+            index.close()
+
+    errors = [d for d in diagnostics if d.severity == "error"]
+    warnings = [d for d in diagnostics if d.severity == "warning"]
+
+    if errors:
+        print("=" * 70)
+        print("ERRORS")
+        print("=" * 70)
+        print()
+        for error in errors:
+            print(error)
+
+    if warnings:
+        print("=" * 70)
+        print("WARNINGS")
+        print("=" * 70)
+        print()
+        for warning in warnings:
+            print(warning)
+
+    print("=" * 70)
+    print("VALIDATION SUMMARY")
+    print("=" * 70)
+
+    by_property = defaultdict(int)
+    for diagnostic in diagnostics:
+        by_property[diagnostic.property_name] += 1
+    for property_name, count in sorted(by_property.items()):
+        print(f"   {property_name}: {count} issue(s)")
+
+    print(f"\n❌ Total errors: {len(errors)}")
+    print(f"⚠️  Total warnings: {len(warnings)}")
+    print()
+
+    if errors:
+        print("❌ Validation FAILED")
+        sys.exit(1)
+    elif warnings:
+        print("⚠️  Validation PASSED with warnings")
+        sys.exit(0)
+    else:
+        print("✅ Validation PASSED")
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,47 +7,53 @@ passive references, and status applications point to existing entries.
 """
 
 import argparse
+import hashlib
+import json
 import os
 import re
+import sqlite3
 import sys
 from collections import defaultdict
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
-# Pre-compiled regex patterns for better performance
-_ENTRY_PATTERN = re.compile(r'new entry "([^"]+)"')
-_UUID_PATTERN = re.compile(r'data "RootTemplate" "([^"]+)"')
+import profiling
+from functor_parser import CONDITION_KEYS, Call, Name, ParseError, String, iter_calls, parse_condition, parse_functors
+from stats_parser import StatsFile, find_stats_files, load_stats_file
+from stats_resolver import StatsResolver, build_resolver
+from symbol_index import SymbolIndex, open_symbol_index
+from validation_cache import DEFAULT_CACHE_DIR, rules_fingerprint
+
+# Loose patterns, only used for values the functor parser rejects
 _UNLOCK_SPELL_PATTERN = re.compile(r'UnlockSpell\(([^)]+)\)')
-_PASSIVES_ON_EQUIP_PATTERN = re.compile(r'data "PassivesOnEquip" "([^"]+)"')
-_STATUS_ON_EQUIP_PATTERN = re.compile(r'data "StatusOnEquip" "([^"]+)"')
 _APPLY_STATUS_PATTERN = re.compile(r'ApplyStatus\(([^,)]+)(?:,([^,)]+))?')
 
 # Constant set for ignored status target keywords (module level for performance)
 _IGNORE_TARGETS = frozenset({"SELF", "TARGET", "SOURCE", "SWAP", ""})
 
-# External definitions expected in base game or other modules; do not flag as missing
+# Bundled reference dumps used for external definitions when --include is not given
+_REFERENCE_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_INCLUDE_DIRS = [
+    str(_REFERENCE_ROOT / "vanilla_data"),
+    str(_REFERENCE_ROOT / "AI-Allies (Overhaul)"),
+]
+
+# Base-game names missing from the partial reference dumps; everything else is
+# resolved against the symbol index of the included dumps
 _EXTERNAL_SPELLS = frozenset({
     "Target_Darkness",
     "Target_FaerieFire",
-    "Target_GOB_GoblinKing_ForceAttack_WeaponAttack",
     "Shout_WildShape_Dismiss",
     "Shout_ELDR_Aard",
     "Shout_ELDR_Igni",
     "Shout_ELDR_Quen",
 })
 
-_EXTERNAL_PASSIVES = frozenset({
-    "MAG_Githborn_Mindcrusher_Greatsword_Passive",
-    "MAG_LowHP_TemporaryHP_Passive",
-    "MAG_Githborn_MagicEating_HalfPlate_Passive",
-})
-
 _EXTERNAL_STATUSES = frozenset({
     # Core combat statuses
-    "BURNING", "POISONED", "BLEEDING", "STUNNED", "PRONE", "PARALYZED",
+    "POISONED", "BLEEDING", "STUNNED", "PARALYZED",
     "CHARMED", "FRIGHTENED", "BLINDNESS", "FEARED", "RESURRECTING", "INVISIBILITY",
     # Boss / narrative statuses
-    "MOO_MAG_KETHERIC_HOWL_OF_THE_DEAD_AURA", "MOO_MAG_KETHERIC_STUPEFIED",
     "TAD_BLACK_HOLE_SLOW", "PRONE_THUNDEROUS_SMITE",
     # Spell/feature auras
     "PASSIVE_FIRE_SHIELD_WARM", "PASSIVE_FIRE_SHIELD_WARM_ATTACKER",
@@ -57,9 +63,9 @@ _EXTERNAL_STATUSES = frozenset({
     "WILDSHAPE_BADGER_REMOVE_VFX", "WILDSHAPE_CAT_REMOVE_VFX",
     "WILDSHAPE_SABERTOOTH_TIGER_REMOVE_VFX", "WILDSHAPE_OWLBEAR_REMOVE_VFX",
     "WILDSHAPE_BEAR_POLAR_REMOVE_VFX", "REGENERATION_SABERTOOTH",
-    # Crowd control / debuffs used by Eldertide spells
-    "PRONE", "PARALYZED", "PRONE_THUNDEROUS_SMITE",
 })
+
+
 class ParsedData:
     """Container for all parsed data from directory."""
 
@@ -73,84 +79,132 @@ class ParsedData:
         self.status_refs = []
 
 
-def parse_directory_single_pass(directory: str, collect_refs: bool = True, collect_uuids: bool = True) -> ParsedData:
-    """Parse all files once and extract required info."""
+# Stats entry type -> ParsedData attribute holding its definitions
+_DEFINITION_TYPES = {
+    "SpellData": "spells",
+    "PassiveData": "passives",
+    "StatusData": "statuses",
+}
 
-    data = ParsedData()
-    path = Path(directory)
-    txt_files = list(path.rglob("*.txt"))
-    total_files = len(txt_files)
-
-    if total_files == 0:
-        return data
 
-    print(f"📂 Parsing {total_files} file(s)...")
+def collect_stats_file(data: ParsedData, stats: StatsFile, file_str: str,
+                       collect_refs: bool = True, collect_uuids: bool = True) -> None:
+    """Add one parsed file's definitions, references and UUIDs to ``data``."""
+    for entry in stats.entries:
+        if entry.kind != "entry":
+            continue
 
-    for idx, file_path in enumerate(txt_files, 1):
-        if idx % 5 == 0 or idx == total_files:
-            print(f"   Progress: {idx}/{total_files} files processed...")
+        current_entry = entry.name
+        definitions = _DEFINITION_TYPES.get(entry.type)
+        if definitions is not None:
+            getattr(data, definitions)[current_entry] = (file_str, entry.line)
 
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
+        if not (collect_refs or collect_uuids):
+            continue
 
-            current_entry = ""
-            current_entry_line = 0
+        for key, value, line_num in entry.items():
+            if key == "RootTemplate":
+                if collect_uuids:
+                    data.uuids[value].append((file_str, line_num, current_entry))
+                continue
 
-            for i, line in enumerate(lines):
-                stripped = line.strip()
+            if not collect_refs:
+                continue
 
-                match = _ENTRY_PATTERN.match(stripped)
-                if match:
-                    current_entry = match.group(1)
-                    current_entry_line = i + 1
+            if key == "PassivesOnEquip":
+                if value:
+                    data.passive_refs.append((file_str, line_num, current_entry, value))
+                continue
 
-                    end_idx = min(i + 5, len(lines))
-                    for j in range(i, end_idx):
-                        line_content = lines[j]
-                        if 'type "SpellData"' in line_content:
-                            data.spells[current_entry] = (str(file_path), current_entry_line)
-                            break
-                        if 'type "PassiveData"' in line_content:
-                            data.passives[current_entry] = (str(file_path), current_entry_line)
-                            break
-                        if 'type "StatusData"' in line_content:
-                            data.statuses[current_entry] = (str(file_path), current_entry_line)
-                            break
+            if key == "StatusOnEquip":
+                if value:
+                    data.status_refs.append((file_str, line_num, current_entry, value))
+                continue
 
-                match = _UUID_PATTERN.match(stripped)
-                if match and collect_uuids:
-                    uuid = match.group(1)
-                    data.uuids[uuid].append((str(file_path), i + 1, current_entry))
+            if "(" not in value:
+                continue
 
-                if not collect_refs:
-                    continue
+            try:
+                parsed = parse_condition(value) if key in CONDITION_KEYS else parse_functors(value)
+            except ParseError:
+                # Malformed values still get a best-effort scan
+                _collect_with_patterns(data, value, file_str, line_num, current_entry)
+                continue
 
-                for spell_match in _UNLOCK_SPELL_PATTERN.finditer(line):
-                    spell_name = spell_match.group(1)
-                    data.spell_refs.append((str(file_path), i + 1, current_entry, spell_name))
+            for call in iter_calls(parsed):
+                if call.name == "UnlockSpell":
+                    spell_name = _literal_argument(call, 0)
+                    if spell_name:
+                        data.spell_refs.append((file_str, line_num, current_entry, spell_name))
+                elif call.name == "ApplyStatus":
+                    status_name = _applied_status(call)
+                    if status_name:
+                        data.status_refs.append((file_str, line_num, current_entry, status_name))
+
+
+def _literal_argument(call: Call, position: int) -> Optional[str]:
+    """Return the name or string at ``position`` of a call's arguments, if any."""
+    if position >= len(call.args):
+        return None
+    arg = call.args[position]
+    if isinstance(arg, Name):
+        return arg.name
+    if isinstance(arg, String):
+        return arg.value
+    return None
+
+
+def _applied_status(call: Call) -> Optional[str]:
+    """Return the status of ``ApplyStatus([target,] status, chance, duration)``.
+
+    The optional leading target is recognised by a name in second position,
+    where the one-target form has its chance.
+    """
+    first = _literal_argument(call, 0)
+    if first in _IGNORE_TARGETS or _literal_argument(call, 1) is not None:
+        return _literal_argument(call, 1)
+    return first
+
+
+def _collect_with_patterns(data: ParsedData, value: str, file_str: str, line_num: int, entry_name: str) -> None:
+    for spell_match in _UNLOCK_SPELL_PATTERN.finditer(value):
+        spell_name = spell_match.group(1)
+        data.spell_refs.append((file_str, line_num, entry_name, spell_name))
+
+    for apply_match in _APPLY_STATUS_PATTERN.finditer(value):
+        param1 = apply_match.group(1)
+        param2 = apply_match.group(2) if apply_match.lastindex and apply_match.lastindex >= 2 else None
+
+        data.status_refs.append((file_str, line_num, entry_name, param1))
+        if param2:
+            data.status_refs.append((file_str, line_num, entry_name, param2))
+
+
+def parse_directory_single_pass(directory: str, collect_refs: bool = True, collect_uuids: bool = True,
+                                verbose: bool = True) -> ParsedData:
+    """Parse all files once and extract required info."""
 
-                passive_match = _PASSIVES_ON_EQUIP_PATTERN.match(stripped)
-                if passive_match:
-                    passives_str = passive_match.group(1)
-                    data.passive_refs.append((str(file_path), i + 1, current_entry, passives_str))
+    data = ParsedData()
+    txt_files = find_stats_files(directory)
+    total_files = len(txt_files)
 
-                status_match = _STATUS_ON_EQUIP_PATTERN.match(stripped)
-                if status_match:
-                    status_name = status_match.group(1)
-                    data.status_refs.append((str(file_path), i + 1, current_entry, status_name))
+    if total_files == 0:
+        return data
 
-                for apply_match in _APPLY_STATUS_PATTERN.finditer(line):
-                    param1 = apply_match.group(1)
-                    param2 = apply_match.group(2) if apply_match.lastindex and apply_match.lastindex >= 2 else None
+    if verbose:
+        print(f"📂 Parsing {total_files} file(s)...")
 
-                    data.status_refs.append((str(file_path), i + 1, current_entry, param1))
-                    if param2:
-                        data.status_refs.append((str(file_path), i + 1, current_entry, param2))
+    for idx, file_path in enumerate(txt_files, 1):
+        if verbose and (idx % 5 == 0 or idx == total_files):
+            print(f"   Progress: {idx}/{total_files} files processed...")
 
+        try:
+            stats = load_stats_file(file_path)
         except Exception:
             continue
 
+        collect_stats_file(data, stats, str(file_path), collect_refs, collect_uuids)
+
     return data
 
 
@@ -205,8 +259,6 @@ def validate_passive_references(parsed_data: ParsedData) -> List[ReferenceError]
         for passive_name in passive_list:
             if not passive_name:
                 continue
-            if passive_name in _EXTERNAL_PASSIVES:
-                continue
             if passive_name not in parsed_data.passives:
                 errors.append(
                     ReferenceError(
@@ -267,25 +319,449 @@ def validate_uuid_uniqueness(parsed_data: ParsedData) -> List[ReferenceError]:
     return errors
 
 
-def merge_definitions(target: ParsedData, source: ParsedData) -> None:
-    target.spells.update(source.spells)
-    target.passives.update(source.passives)
-    target.statuses.update(source.statuses)
+def validate_inheritance(resolver: StatsResolver, names: Optional[Iterable[str]] = None) -> List[ReferenceError]:
+    errors: List[ReferenceError] = []
+
+    # Flattening every entry memoizes each shared parent once and records cycles
+    for name in list(resolver.entries if names is None else names):
+        resolver.resolve(name)
+
+    for cycle in resolver.cycles:
+        chain = " -> ".join(cycle + [cycle[0]])
+        for entry_name in cycle:
+            entry = resolver.entries[entry_name]
+            errors.append(
+                ReferenceError(
+                    entry.source.path,
+                    entry.line,
+                    entry_name,
+                    "Using",
+                    entry.using or "",
+                    f"Inheritance cycle: {chain}",
+                )
+            )
+
+    return errors
+
+
+def merge_index_definitions(target: ParsedData, index: SymbolIndex) -> None:
+    """Add external definitions from a symbol index without shadowing the mod's own."""
+    for stats_type, attr in _DEFINITION_TYPES.items():
+        definitions = getattr(target, attr)
+        for name, location in index.definitions(stats_type).items():
+            definitions.setdefault(name, location)
+
+
+# Reference kinds checked against definitions: (ParsedData definitions attr,
+# ParsedData refs attr, stats type in symbol indexes, check function). The
+# position doubles as the report order in the incremental store.
+_REFERENCE_CHECKS = (
+    ("spells", "spell_refs", "SpellData", validate_spell_references),
+    ("passives", "passive_refs", "PassiveData", validate_passive_references),
+    ("statuses", "status_refs", "StatusData", validate_status_references),
+)
+_USING_CHECK = len(_REFERENCE_CHECKS)
+_UUID_CHECK = _USING_CHECK + 1
+
+# Bump whenever the incremental store schema or the facts it records change
+_STORE_VERSION = 2
+
+_STORE_SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    inode INTEGER NOT NULL
+);
+CREATE TABLE definitions (
+    file TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    line INTEGER NOT NULL
+);
+CREATE TABLE entries (
+    file TEXT NOT NULL,
+    name TEXT NOT NULL,
+    parent TEXT,
+    line INTEGER NOT NULL
+);
+CREATE TABLE refs (
+    file TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    entry TEXT NOT NULL,
+    target TEXT NOT NULL,
+    raw TEXT NOT NULL
+);
+CREATE TABLE uuids (
+    file TEXT NOT NULL,
+    uuid TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    entry TEXT NOT NULL
+);
+CREATE TABLE errors (
+    check_order INTEGER NOT NULL,
+    file TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    entry TEXT NOT NULL,
+    ref_type TEXT NOT NULL,
+    ref_name TEXT NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX definitions_by_name ON definitions (kind, name);
+CREATE INDEX definitions_by_file ON definitions (file);
+CREATE INDEX entries_by_file ON entries (file);
+CREATE INDEX refs_by_target ON refs (kind, target);
+CREATE INDEX refs_by_file ON refs (file);
+CREATE INDEX uuids_by_uuid ON uuids (uuid);
+CREATE INDEX uuids_by_file ON uuids (file);
+CREATE INDEX errors_by_name ON errors (check_order, ref_name);
+CREATE INDEX errors_by_file ON errors (file);
+"""
+
+_PER_FILE_TABLES = ("definitions", "entries", "refs", "uuids", "errors", "files")
+
+
+def _find_cycles(parents: Dict[str, Optional[str]]) -> List[List[str]]:
+    """Return every cycle of a child -> parent map, each listed child first."""
+    cycles: List[List[str]] = []
+    done: Set[str] = set()
+    for start in parents:
+        path: List[str] = []
+        on_path: Dict[str, int] = {}
+        node: Optional[str] = start
+        while node is not None and node in parents and node not in done and node not in on_path:
+            on_path[node] = len(path)
+            path.append(node)
+            node = parents[node]
+        if node in on_path:
+            cycles.append(path[on_path[node]:])
+        done.update(path)
+    return cycles
+
+
+class ReferenceStore:
+    """Persistent definition table and reverse-dependency graph for one mod.
+
+    For every stats file of the mod the store keeps its stat tuple, the
+    definitions it contributes, the references it makes (indexed by target
+    name, so all sites referencing a name are found without reparsing), its
+    ``using`` edges and RootTemplate UUIDs, plus the diagnostics of the last
+    run. File paths are stored relative to the mod root.
+    """
+
+    def __init__(self, root: Path, db_path: Path):
+        self.root = root
+        self.db_path = db_path
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path)
+        try:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        except sqlite3.Error:
+            row = None
+        if row is None or row[0] != str(_STORE_VERSION):
+            self._reset()
+
+    @classmethod
+    def for_directory(cls, directory: str, cache_dir: Optional[str] = None) -> "ReferenceStore":
+        """Open the store for a mod directory (under reference/.validation_cache by default)."""
+        root = Path(directory).resolve()
+        cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        slug = hashlib.sha1(str(root).encode("utf-8")).hexdigest()[:12]
+        return cls(root, cache_dir / f"references-{root.name}-{slug}.v{_STORE_VERSION}.sqlite")
+
+    def __enter__(self) -> "ReferenceStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _reset(self) -> None:
+        conn = self._conn
+        for (table,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall():
+            conn.execute(f"DROP TABLE {table}")
+        conn.executescript(_STORE_SCHEMA)
+        conn.execute("INSERT INTO meta VALUES ('version', ?)", (str(_STORE_VERSION),))
+        conn.commit()
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    def commit(self) -> None:
+        self._conn.commit()
+
+    def scan(self, files: Iterable[Path]) -> Tuple[List[Tuple[Path, str, Tuple[int, int, int]]], List[str]]:
+        """Compare the mod's files with the store by stat tuple only.
+
+        Returns:
+            Tuple of (changed or new files as (path, relative path, stat tuple),
+            relative paths of files that no longer exist)
+        """
+        stored = {path: tuple(stat) for path, *stat in self._conn.execute(
+            "SELECT path, mtime_ns, size, inode FROM files")}
+        changed = []
+        for file_path in files:
+            rel = file_path.relative_to(self.root).as_posix()
+            st = file_path.stat()
+            stat_key = (st.st_mtime_ns, st.st_size, st.st_ino)
+            if stored.pop(rel, None) != stat_key:
+                changed.append((file_path, rel, stat_key))
+        return changed, sorted(stored)
+
+    def update(self, changed: Sequence[Tuple[Path, str, Tuple[int, int, int]]],
+               removed: Sequence[str]) -> Tuple[Dict[str, Set[str]], Set[str]]:
+        """Drop the facts of changed/removed files and reparse the changed ones.
+
+        Returns:
+            Tuple of (names defined before or after the update in the affected
+            files, per definitions kind; UUIDs used before or after)
+        """
+        conn = self._conn
+        touched: Dict[str, Set[str]] = defaultdict(set)
+        touched_uuids: Set[str] = set()
+
+        for rel in [rel for _, rel, _ in changed] + list(removed):
+            for kind, name in conn.execute("SELECT kind, name FROM definitions WHERE file = ?", (rel,)):
+                touched[kind].add(name)
+            touched_uuids.update(uuid for (uuid,) in conn.execute("SELECT uuid FROM uuids WHERE file = ?", (rel,)))
+            for table in _PER_FILE_TABLES:
+                column = "path" if table == "files" else "file"
+                conn.execute(f"DELETE FROM {table} WHERE {column} = ?", (rel,))
+
+        for file_path, rel, stat_key in changed:
+            try:
+                stats = load_stats_file(file_path)
+            except (OSError, UnicodeDecodeError):
+                # Not recorded, so it is retried on the next run
+                continue
+
+            data = ParsedData()
+            collect_stats_file(data, stats, rel)
+
+            for kind in _DEFINITION_TYPES.values():
+                definitions = getattr(data, kind)
+                touched[kind].update(definitions)
+                conn.executemany("INSERT INTO definitions VALUES (?, ?, ?, ?)",
+                                 [(rel, kind, name, line) for name, (_, line) in definitions.items()])
+
+            conn.executemany("INSERT INTO entries VALUES (?, ?, ?, ?)", [
+                (rel, entry.name, entry.using, entry.line) for entry in stats.entries if entry.kind == "entry"
+            ])
+
+            refs = [(rel, "spells", line, entry, name, name) for _, line, entry, name in data.spell_refs]
+            for _, line, entry, passives in data.passive_refs:
+                refs.extend((rel, "passives", line, entry, p.strip(), p.strip())
+                            for p in passives.split(";") if p.strip())
+            refs.extend((rel, "statuses", line, entry, raw.strip().strip("'\""), raw)
+                        for _, line, entry, raw in data.status_refs)
+            conn.executemany("INSERT INTO refs VALUES (?, ?, ?, ?, ?, ?)", refs)
+
+            for uuid, locations in data.uuids.items():
+                touched_uuids.add(uuid)
+                conn.executemany("INSERT INTO uuids VALUES (?, ?, ?, ?)",
+                                 [(rel, uuid, line, entry) for _, line, entry in locations])
+
+            conn.execute("INSERT INTO files VALUES (?, ?, ?, ?)", (rel, *stat_key))
+
+        return touched, touched_uuids
+
+    def _insert_errors(self, check_order: int, errors: Iterable[ReferenceError]) -> None:
+        self._conn.executemany("INSERT INTO errors VALUES (?, ?, ?, ?, ?, ?, ?)", [
+            (check_order, e.file_path, e.line_num, e.entry_name, e.ref_type, e.ref_name, e.message)
+            for e in errors
+        ])
+
+    def recheck_references(self, touched: Dict[str, Set[str]], changed_files: Iterable[str],
+                           indexes: Sequence[SymbolIndex], full: bool = False) -> int:
+        """Recheck references in changed files and those whose target was (un)defined.
+
+        With ``full`` every stored reference is rechecked against the whole
+        definition table.
+
+        Returns:
+            Number of references rechecked
+        """
+        conn = self._conn
+        changed_files = list(changed_files)
+        data = ParsedData()
+        columns = "SELECT file, line, entry, target, raw FROM refs"
+
+        if full:
+            for kind, name, file, line in conn.execute("SELECT kind, name, file, line FROM definitions"):
+                getattr(data, kind).setdefault(name, (file, line))
+            for index in indexes:
+                merge_index_definitions(data, index)
+
+        rechecked = 0
+        for check_order, (kind, refs_attr, stats_type, check) in enumerate(_REFERENCE_CHECKS):
+            if full:
+                conn.execute("DELETE FROM errors WHERE check_order = ?", (check_order,))
+                rows = conn.execute(f"{columns} WHERE kind = ? ORDER BY rowid", (kind,)).fetchall()
+            else:
+                rows = set()
+                # Reverse dependencies: every site referencing a name whose
+                # definition appeared, disappeared or moved
+                for name in touched.get(kind, ()):
+                    conn.execute("DELETE FROM errors WHERE check_order = ? AND ref_name = ?", (check_order, name))
+                    rows.update(conn.execute(f"{columns} WHERE kind = ? AND target = ?", (kind, name)))
+                for rel in changed_files:
+                    rows.update(conn.execute(f"{columns} WHERE kind = ? AND file = ?", (kind, rel)))
+                rows = sorted(rows)
+
+            definitions = getattr(data, kind)
+            refs = getattr(data, refs_attr)
+            for file, line, entry, target, raw in rows:
+                refs.append((file, line, entry, raw))
+                if full or target in definitions:
+                    continue
+                location = conn.execute(
+                    "SELECT file, line FROM definitions WHERE kind = ? AND name = ? LIMIT 1", (kind, target)
+                ).fetchone()
+                if location is None:
+                    for index in indexes:
+                        symbol = index.lookup(target, stats_type)
+                        if symbol is not None:
+                            location = (symbol.file, symbol.line)
+                            break
+                if location is not None:
+                    definitions[target] = location
+
+            self._insert_errors(check_order, check(data))
+            rechecked += len(rows)
+
+        return rechecked
+
+    def recheck_uuids(self, touched_uuids: Iterable[str], full: bool = False) -> None:
+        """Recheck uniqueness of the given UUIDs (or of all UUIDs)."""
+        conn = self._conn
+        if full:
+            conn.execute("DELETE FROM errors WHERE check_order = ?", (_UUID_CHECK,))
+            uuids = [uuid for (uuid,) in conn.execute(
+                "SELECT uuid FROM uuids GROUP BY uuid HAVING COUNT(*) > 1 ORDER BY MIN(rowid)")]
+        else:
+            uuids = sorted(touched_uuids)
+            for uuid in uuids:
+                conn.execute("DELETE FROM errors WHERE check_order = ? AND ref_name = ?", (_UUID_CHECK, uuid))
+
+        data = ParsedData()
+        for uuid in uuids:
+            data.uuids[uuid] = conn.execute(
+                "SELECT file, line, entry FROM uuids WHERE uuid = ? ORDER BY file, line", (uuid,)
+            ).fetchall()
+        self._insert_errors(_UUID_CHECK, validate_uuid_uniqueness(data))
+
+    def recheck_inheritance(self) -> None:
+        """Recheck the stored ``using`` graph for cycles."""
+        conn = self._conn
+        conn.execute("DELETE FROM errors WHERE check_order = ?", (_USING_CHECK,))
+
+        parents: Dict[str, Optional[str]] = {}
+        locations: Dict[str, Tuple[str, int]] = {}
+        for file, name, parent, line in conn.execute("SELECT file, name, parent, line FROM entries ORDER BY file, line"):
+            parents[name] = parent
+            locations[name] = (file, line)
+
+        errors = []
+        for cycle in _find_cycles(parents):
+            chain = " -> ".join(cycle + [cycle[0]])
+            for entry_name in cycle:
+                file, line = locations[entry_name]
+                errors.append(ReferenceError(
+                    file, line, entry_name, "Using", parents[entry_name] or "", f"Inheritance cycle: {chain}"
+                ))
+        self._insert_errors(_USING_CHECK, errors)
+
+    def errors(self, directory: str) -> List[ReferenceError]:
+        """Return the stored diagnostics, with paths under ``directory``."""
+        rows = self._conn.execute(
+            "SELECT file, line, entry, ref_type, ref_name, message FROM errors ORDER BY check_order, file, line, rowid"
+        )
+        return [
+            ReferenceError(str(Path(directory) / file), line, entry, ref_type, ref_name, message)
+            for file, line, entry, ref_type, ref_name, message in rows
+        ]
+
+
+def revalidate_references(directory: str, indexes: Sequence[SymbolIndex]) -> Tuple[List[ReferenceError], Dict[str, int]]:
+    """Bring the incremental store of ``directory`` up to date.
+
+    Returns:
+        Tuple of (all current reference errors, counters: changed, removed,
+        rechecked and full)
+    """
+    # Any change to these rules or to an included dump invalidates every stored result
+    fingerprint = json.dumps([
+        rules_fingerprint(__name__, "stats_parser", "functor_parser"),
+        [index.meta("content_hash") for index in indexes],
+    ])
 
+    with ReferenceStore.for_directory(directory) as store:
+        full = store.get_meta("fingerprint") != fingerprint
+        changed, removed = store.scan(find_stats_files(store.root))
+        touched, touched_uuids = store.update(changed, removed)
 
-def validate_directory(directory: str, include_dirs: List[str]) -> List[ReferenceError]:
+        rechecked = store.recheck_references(touched, [rel for _, rel, _ in changed], indexes, full)
+        store.recheck_uuids(touched_uuids, full)
+        if full or changed or removed:
+            store.recheck_inheritance()
+
+        store.set_meta("fingerprint", fingerprint)
+        store.commit()
+        errors = store.errors(directory)
+
+    return errors, {"changed": len(changed), "removed": len(removed), "rechecked": rechecked, "full": int(full)}
+
+
+def validate_directory_incremental(directory: str, include_dirs: Sequence[str]) -> List[ReferenceError]:
+    """Validate references, reparsing and rechecking only what changed since the last run."""
+    indexes: List[SymbolIndex] = []
+    for extra in include_dirs:
+        if not os.path.isdir(extra):
+            print(f"⚠️  Skipping include dir (not found): {extra}")
+            continue
+        print(f"➕ Including definitions from: {extra}")
+        indexes.append(open_symbol_index(extra))
+
+    errors, counts = revalidate_references(directory, indexes)
+
+    for index in indexes:
+        index.close()
+
+    mode = "full recheck" if counts["full"] else "incremental"
+    print(f"🔍 Checked references ({mode})")
+    print(f"   {counts['changed']} changed, {counts['removed']} removed file(s)")
+    print(f"   {counts['rechecked']} reference(s) rechecked")
+    print()
+
+    return errors
+
+
+def validate_directory(directory: str, include_dirs: Sequence[str]) -> List[ReferenceError]:
     all_errors: List[ReferenceError] = []
 
     print("🔍 Parsing all files (single pass)...")
     parsed_data = parse_directory_single_pass(directory)
 
+    indexes: List[SymbolIndex] = []
     for extra in include_dirs:
         if not os.path.isdir(extra):
             print(f"⚠️  Skipping include dir (not found): {extra}")
             continue
         print(f"➕ Including definitions from: {extra}")
-        include_data = parse_directory_single_pass(extra, collect_refs=False, collect_uuids=False)
-        merge_definitions(parsed_data, include_data)
+        index = open_symbol_index(extra)
+        merge_index_definitions(parsed_data, index)
+        indexes.append(index)
 
     print(f"   Found {len(parsed_data.spells)} spell definitions")
     print(f"   Found {len(parsed_data.passives)} passive definitions")
@@ -296,6 +772,8 @@ def validate_directory(directory: str, include_dirs: List[str]) -> List[Referenc
     print(f"   Found {len(parsed_data.status_refs)} status references")
     print()
 
+    resolver = build_resolver(directory)
+
     print("=" * 70)
     print("Validating Spell References")
     print("=" * 70)
@@ -326,6 +804,22 @@ def validate_directory(directory: str, include_dirs: List[str]) -> List[Referenc
     else:
         print("✅ All status references valid\n")
 
+    print("=" * 70)
+    print("Validating Inheritance")
+    print("=" * 70)
+    inheritance_errors = validate_inheritance(resolver)
+    all_errors.extend(inheritance_errors)
+    external_parents = [
+        parent for parent in resolver.unresolved_parents()
+        if not any(parent in index for index in indexes)
+    ]
+    if external_parents:
+        print(f"ℹ️  {len(external_parents)} parent(s) not found in scanned directories (assumed base game)")
+    if inheritance_errors:
+        print(f"❌ Found {len(inheritance_errors)} entries in inheritance cycles\n")
+    else:
+        print("✅ No inheritance cycles\n")
+
     print("=" * 70)
     print("Validating UUID Uniqueness")
     print("=" * 70)
@@ -336,6 +830,9 @@ def validate_directory(directory: str, include_dirs: List[str]) -> List[Referenc
     else:
         print("✅ All UUIDs are unique\n")
 
+    for index in indexes:
+        index.close()
+
     return all_errors
 
 
@@ -345,10 +842,24 @@ def main() -> None:
     parser.add_argument(
         "--include",
         nargs="*",
-        default=[],
-        help="Optional additional directories to pull definitions from (vanilla dumps, compatibility mods).",
+        default=[d for d in DEFAULT_INCLUDE_DIRS if os.path.isdir(d)],
+        help=(
+            "Additional directories to pull definitions from (vanilla dumps, compatibility mods). "
+            "Each is read through a cached symbol index. Defaults to the bundled reference dumps; "
+            "pass --include with no directories to disable."
+        ),
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "Reuse the definition table and reference graph stored by the previous run; only changed "
+            "files are reparsed and only references affected by changed definitions are rechecked."
+        ),
+    )
+    profiling.add_arguments(parser)
     args = parser.parse_args()
+    profiling.start_from_args(args)
 
     target = args.target
 
@@ -365,7 +876,10 @@ def main() -> None:
     print("=" * 70)
     print()
 
-    errors = validate_directory(target, args.include)
+    if args.incremental:
+        errors = validate_directory_incremental(target, args.include)
+    else:
+        errors = validate_directory(target, args.include)
 
     if errors:
         print("=" * 70)
@@ -6,30 +6,37 @@ This script validates spell definitions in BG3 mod files against known valid val
 and patterns from vanilla Baldur's Gate 3 data.
 
 Usage:
-    python3 validate_spells.py <path_to_spell_files_or_directory>
+    python3 validate_spells.py <path_to_spell_files_or_directory> [--include DIR ...] [--jobs N]
 
 Example:
     python3 validate_spells.py Public/EldertideArmament/Stats/Generated/Data/
     python3 validate_spells.py Public/EldertideArmament/Stats/Generated/Data/Spells_Eldertide_Main.txt
+    python3 validate_spells.py Public/EldertideArmament/Stats/Generated/Data/ --include reference/vanilla_data
+    python3 validate_spells.py reference/vanilla_data/GustavDev/ --jobs 4
 """
 
+import argparse
 import sys
 import os
 import re
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Sequence, Tuple, Optional
+
+import profiling
+from stats_parser import load_stats_file
+from parallel_validation import map_files, resolve_jobs
+from stats_resolver import StatsResolver, build_resolver
+from stats_rules import DiagnosticSink, RuleSet, one_of
 
 # Try to import caching module (optional dependency)
 try:
-    from validation_cache import ValidationCache
+    from validation_cache import ValidationCache, rules_fingerprint
     CACHING_AVAILABLE = True
 except ImportError:
     CACHING_AVAILABLE = False
     ValidationCache = None  # For type hints when not available
 
 # Pre-compiled regex patterns for better performance
-_ENTRY_PATTERN = re.compile(r'new entry "([^"]+)"')
-_DATA_PATTERN = re.compile(r'data "([^"]+)" "([^"]*)"')
 _USE_COSTS_COMMA_ERROR = re.compile(r'\w+:\d+,\s*\w+(?::|$)')
 
 # Valid values from BG3 vanilla data
@@ -86,259 +93,171 @@ class ValidationError:
                 f"   Value: {self.value}\n"
                 f"   Error: {self.message}\n")
 
-def parse_spell_entry(lines: List[str], start_idx: int) -> Tuple[Dict[str, str], int]:
-    """Parse a single spell entry and return properties dict and end index."""
-    entry = {}
-    entry_name = ""
-    i = start_idx
-    
-    # Get entry name - use pre-compiled pattern
-    match = _ENTRY_PATTERN.match(lines[i])
-    if match:
-        entry_name = match.group(1)
-        entry["_name"] = entry_name
-        entry["_start_line"] = i + 1
-    
-    i += 1
-    
-    # Parse properties until next entry or end
-    while i < len(lines):
-        line = lines[i].strip()
-        
-        # Check for next entry
-        if line.startswith("new entry"):
-            break
-            
-        # Parse data line - use pre-compiled pattern
-        match = _DATA_PATTERN.match(line)
-        if match:
-            key = match.group(1)
-            value = match.group(2)
-            entry[key] = value
-        
-        i += 1
-    
-    return entry, i
+# Property checks; each runs only for entries that have its property
+SPELL_RULES = RuleSet()
 
-def validate_spell_type(entry: Dict[str, str], file_path: str) -> List[ValidationError]:
-    """Validate SpellType property."""
-    errors = []
-    
-    if "SpellType" in entry:
-        spell_type = entry["SpellType"]
-        if spell_type not in VALID_SPELL_TYPES:
-            # Cache dict lookups for performance
-            entry_name = entry["_name"]
-            entry_line = entry["_start_line"]
-            errors.append(ValidationError(
-                file_path, entry_line, entry_name,
-                "SpellType", spell_type,
-                f"Invalid SpellType. Valid options: {_VALID_SPELL_TYPES_STR}"
-            ))
-    
-    return errors
+SPELL_RULES.add("SpellType", one_of(
+    VALID_SPELL_TYPES, f"Invalid SpellType. Valid options: {_VALID_SPELL_TYPES_STR}"))
 
-def validate_spell_level(entry: Dict[str, str], file_path: str) -> List[ValidationError]:
+@SPELL_RULES.rule("Level")
+def check_spell_level(level_str: str, entry: Dict[str, str], sink: DiagnosticSink) -> None:
     """Validate Level property."""
-    errors = []
-    
-    if "Level" in entry:
-        # Cache dict lookups for performance
-        entry_name = entry["_name"]
-        entry_line = entry["_start_line"]
-        level_str = entry["Level"]
-        
-        try:
-            level = int(level_str)
-            if level < 0 or level > 9:
-                errors.append(ValidationError(
-                    file_path, entry_line, entry_name,
-                    "Level", str(level),
-                    "Level must be between 0 (cantrip) and 9"
-                ))
-        except ValueError:
-            errors.append(ValidationError(
-                file_path, entry_line, entry_name,
-                "Level", level_str,
-                "Level must be a number"
-            ))
-    
-    return errors
+    try:
+        level = int(level_str)
+    except ValueError:
+        sink.report(level_str, "Level must be a number")
+        return
+    if level < 0 or level > 9:
+        sink.report(str(level), "Level must be between 0 (cantrip) and 9")
 
-def validate_spell_school(entry: Dict[str, str], file_path: str) -> List[ValidationError]:
-    """Validate SpellSchool property."""
-    errors = []
-    
-    if "SpellSchool" in entry:
-        school = entry["SpellSchool"]
-        if school not in VALID_SPELL_SCHOOLS:
-            # Cache dict lookups for performance
-            entry_name = entry["_name"]
-            entry_line = entry["_start_line"]
-            errors.append(ValidationError(
-                file_path, entry_line, entry_name,
-                "SpellSchool", school,
-                f"Invalid SpellSchool. Valid options: {_VALID_SPELL_SCHOOLS_STR}"
-            ))
-    
-    return errors
+SPELL_RULES.add("SpellSchool", one_of(
+    VALID_SPELL_SCHOOLS, f"Invalid SpellSchool. Valid options: {_VALID_SPELL_SCHOOLS_STR}"))
 
-def validate_damage_type(entry: Dict[str, str], file_path: str) -> List[ValidationError]:
-    """Validate DamageType property."""
-    errors = []
-    
-    if "DamageType" in entry:
-        damage_type = entry["DamageType"]
-        if damage_type not in VALID_DAMAGE_TYPES:
-            # Cache dict lookups for performance
-            entry_name = entry["_name"]
-            entry_line = entry["_start_line"]
-            errors.append(ValidationError(
-                file_path, entry_line, entry_name,
-                "DamageType", damage_type,
-                f"Invalid DamageType. Valid options: {_VALID_DAMAGE_TYPES_STR}"
-            ))
-    
-    return errors
+SPELL_RULES.add("DamageType", one_of(
+    VALID_DAMAGE_TYPES, f"Invalid DamageType. Valid options: {_VALID_DAMAGE_TYPES_STR}"))
 
-def validate_spell_flags(entry: Dict[str, str], file_path: str) -> List[ValidationError]:
+@SPELL_RULES.rule("SpellFlags")
+def check_spell_flags(flags_str: str, entry: Dict[str, str], sink: DiagnosticSink) -> None:
     """Validate SpellFlags property."""
-    errors = []
-    
-    if "SpellFlags" in entry:
-        flags_str = entry["SpellFlags"]
-        flags = [f.strip() for f in flags_str.split(";")]
-        
-        # Cache dict lookups for performance
-        entry_name = entry["_name"]
-        entry_line = entry["_start_line"]
-        
-        for flag in flags:
-            if flag and flag not in VALID_SPELL_FLAGS:
-                errors.append(ValidationError(
-                    file_path, entry_line, entry_name,
-                    "SpellFlags", flag,
-                    f"Unknown SpellFlag. Common flags: {_VALID_SPELL_FLAGS_SAMPLE}"
-                ))
-    
-    return errors
+    for flag in flags_str.split(";"):
+        flag = flag.strip()
+        if flag and flag not in VALID_SPELL_FLAGS:
+            sink.report(flag, f"Unknown SpellFlag. Common flags: {_VALID_SPELL_FLAGS_SAMPLE}")
 
-def validate_use_costs(entry: Dict[str, str], file_path: str) -> List[ValidationError]:
+@SPELL_RULES.rule("UseCosts")
+def check_use_costs(costs: str, entry: Dict[str, str], sink: DiagnosticSink) -> None:
     """Validate UseCosts property format."""
-    errors = []
+    # Check for malformed costs with commas in wrong places - use pre-compiled pattern
+    if _USE_COSTS_COMMA_ERROR.search(costs):
+        sink.report(costs, "UseCosts should use semicolons (;) not commas (,) to separate multiple costs")
+    
+    # Validate cost format
+    for cost in costs.split(";"):
+        cost = cost.strip()
+        if cost and ":" not in cost:
+            sink.report(cost, "Each cost should be in format 'ResourceType:Amount' or 'ResourceType:Amount:Level'")
+
+def validate_spell_file(file_path: str, cache: Optional[ValidationCache] = None,
+                        resolver: Optional[StatsResolver] = None) -> Tuple[int, List[ValidationError]]:
+    """Validate a single spell file.
     
-    if "UseCosts" in entry:
-        costs = entry["UseCosts"]
-        
-        # Cache dict lookups for performance
-        entry_name = entry["_name"]
-        entry_line = entry["_start_line"]
-        
-        # Check for malformed costs with commas in wrong places - use pre-compiled pattern
-        if _USE_COSTS_COMMA_ERROR.search(costs):
-            errors.append(ValidationError(
-                file_path, entry_line, entry_name,
-                "UseCosts", costs,
-                "UseCosts should use semicolons (;) not commas (,) to separate multiple costs"
-            ))
-        
-        # Validate cost format
-        cost_parts = [c.strip() for c in costs.split(";")]
-        for cost in cost_parts:
-            if cost and ":" not in cost:
-                errors.append(ValidationError(
-                    file_path, entry_line, entry_name,
-                    "UseCosts", cost,
-                    "Each cost should be in format 'ResourceType:Amount' or 'ResourceType:Amount:Level'"
-                ))
+    Entries are checked with their effective values, i.e. including every
+    property inherited through ``using``. Without a resolver only parents
+    defined in the same file are followed.
+    """
     
-    return errors
-
-def validate_spell_file(file_path: str, cache: Optional[ValidationCache] = None) -> Tuple[int, List[ValidationError]]:
-    """Validate a single spell file."""
+    valid_count = 0
+    
+    # Results also depend on every file `using` parents may come from: the
+    # include dirs plus the path and stat of each stats file in load order, so
+    # a parent added or overridden in another file invalidates this result
+    variant = (f"{';'.join(resolver.directories)}@{resolver.load_order_digest()}"
+               if resolver is not None else "")
     
-    # Try to load from cache if available
+    # Try to load from cache first; a hit only stats the files above, the
+    # file itself and the parents' files recorded with it, reading none of them
     if cache and CACHING_AVAILABLE:
-        cached = cache.load_cached_results(file_path)
+        cached = cache.load_cached_results(file_path, variant=variant)
         if cached is not None:
-            return cached
-    
-    errors = []
-    valid_count = 0
+            valid_count, cached_errors = cached
+            return valid_count, [ValidationError(**e) for e in cached_errors]
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        stats = load_stats_file(file_path)
     except Exception as e:
-        errors.append(ValidationError(
-            file_path, 0, "", "", "", f"Failed to read file: {e}"
-        ))
-        return 0, errors
+        return 0, [ValidationError(file_path, 0, "", "", "", f"Failed to read file: {e}")]
+    
+    if resolver is None:
+        resolver = StatsResolver()
+        resolver.add_file(stats)
     
-    # Track entries with errors using a set for O(1) lookups
-    entries_with_errors = set()
+    # Results depend on every file that defines an inherited parent
+    dependencies = resolver.ancestor_files(stats.entries) - {stats.path}
     
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
+    # Every rule reports into this one sink for the whole file
+    sink = DiagnosticSink(ValidationError, file_path)
+    errors = sink.items
+    for spell in stats.of_type("SpellData"):
+        first = SPELL_RULES.run(resolver.effective(spell), sink)
         
-        # Find spell entry - optimized to avoid unnecessary string joining
-        if line.startswith('new entry'):
-            # Check next few lines for type without joining (more efficient)
-            # Ensure we don't go beyond array bounds: j ranges from 0 to min(4, len(lines)-i-1)
-            max_lookahead = min(5, len(lines) - i)
-            is_spell_data = any('type "SpellData"' in lines[i+j] for j in range(max_lookahead))
-            
-            if is_spell_data:
-                entry, next_i = parse_spell_entry(lines, i)
-                entry_name = entry["_name"]
-                
-                # Run all validations and track if any errors occur
-                entry_errors_before = len(errors)
-                errors.extend(validate_spell_type(entry, file_path))
-                errors.extend(validate_spell_level(entry, file_path))
-                errors.extend(validate_spell_school(entry, file_path))
-                errors.extend(validate_damage_type(entry, file_path))
-                errors.extend(validate_spell_flags(entry, file_path))
-                errors.extend(validate_use_costs(entry, file_path))
-                
-                # Check if new errors were added (O(1) instead of O(n))
-                if len(errors) == entry_errors_before:
-                    valid_count += 1
-                else:
-                    entries_with_errors.add(entry_name)
-                
-                i = next_i
-            else:
-                i += 1
-        else:
-            i += 1
+        # Valid if no new errors were added (O(1) instead of O(n))
+        if len(errors) == first:
+            valid_count += 1
     
     results = (valid_count, errors)
     
-    # Save to cache if available
+    # Save to cache if available (errors are stored as plain dicts)
     if cache and CACHING_AVAILABLE:
-        cache.save_cached_results(file_path, results)
+        cache.save_cached_results(file_path, [valid_count, [vars(e) for e in errors]], dependencies, variant)
     
     return results
 
-def validate_directory(directory: str) -> Tuple[int, List[ValidationError]]:
-    """Validate all spell files in a directory."""
+def find_spell_files(directory: str) -> List[Path]:
+    """Return the spell files to validate for a file or directory target."""
+    path = Path(directory)
+    if path.is_file():
+        if "Spell" in path.name and path.suffix == ".txt":
+            return [path]
+        return []
+    return list(path.glob("**/Spell*.txt"))
+
+def create_cache() -> Optional[ValidationCache]:
+    """Return this validator's result cache, or None if caching is unavailable.
+    
+    Results are keyed by a fingerprint of this module and the stats parser and
+    resolver, so editing the rules here only invalidates cached spells results.
+    """
+    if not CACHING_AVAILABLE:
+        return None
+    fingerprint = rules_fingerprint(__name__, "stats_parser", "stats_resolver", "stats_rules")
+    return ValidationCache(namespace="spells", fingerprint=fingerprint)
+
+# Per-process state for --jobs workers (set by _init_worker)
+_worker_resolver: Optional[StatsResolver] = None
+_worker_use_cache = False
+
+def _init_worker(resolver: StatsResolver, use_cache: bool) -> None:
+    """Pool initializer: share the parent's resolver with each worker."""
+    global _worker_resolver, _worker_use_cache
+    _worker_resolver = resolver
+    _worker_use_cache = use_cache
+
+def _validate_in_worker(file_path: str):
+    """Validate one file in a pool worker; returns (results, cache stats)."""
+    cache = create_cache() if _worker_use_cache else None
+    results = validate_spell_file(file_path, cache, _worker_resolver)
+    if cache is None:
+        return results, None
+    cache.close()
+    return results, cache.get_stats()
+
+def _print_file_result(valid: int, errors: List[ValidationError]) -> None:
+    """Print the per-file progress summary."""
+    if errors:
+        print(f"   ⚠️  Found {len(errors)} error(s)")
+    else:
+        print(f"   ✅ All {valid} spell(s) valid")
+    print()
+
+def validate_directory(directory: str, include_dirs: Sequence[str] = (),
+                       jobs: int = 1) -> Tuple[int, List[ValidationError]]:
+    """Validate all spell files in a directory.
+    
+    ``using`` parents are resolved across the whole target directory plus
+    ``include_dirs`` (vanilla dumps, compatibility mods). With ``jobs > 1``
+    files are validated in a process pool.
+    """
     all_errors = []
     total_valid = 0
     
     # Initialize cache if available
-    cache = ValidationCache() if CACHING_AVAILABLE else None
+    cache = create_cache()
     
-    path = Path(directory)
+    # Build the inheritance graph once; every file shares the memoized parents
+    resolver = build_resolver(directory, include_dirs)
     
     # Find all spell files
-    spell_files = []
-    if path.is_file():
-        if "Spell" in path.name and path.suffix == ".txt":
-            spell_files = [path]
-    else:
-        spell_files = list(path.glob("**/Spell*.txt"))
+    spell_files = find_spell_files(directory)
     
     if not spell_files:
         print(f"❌ No spell files found in {directory}")
@@ -350,19 +269,36 @@ def validate_directory(directory: str) -> Tuple[int, List[ValidationError]]:
     else:
         print()
     
-    # Process files with progress indication
-    for idx, spell_file in enumerate(spell_files, 1):
-        file_size = spell_file.stat().st_size / 1024  # Size in KB
-        print(f"🔍 [{idx}/{len(spell_files)}] Validating: {spell_file.name} ({file_size:.1f} KB)")
-        valid, errors = validate_spell_file(str(spell_file), cache)
-        total_valid += valid
-        all_errors.extend(errors)
+    if jobs > 1:
+        # Fan out to a process pool; progress streams in completion order while
+        # results are merged in file order so error output matches a serial run
+        def report(idx, file_path, result, completed):
+            (valid, errors), _ = result
+            file_size = spell_files[idx].stat().st_size / 1024  # Size in KB
+            print(f"🔍 [{completed}/{len(spell_files)}] Validated: {spell_files[idx].name} ({file_size:.1f} KB)")
+            _print_file_result(valid, errors)
         
-        if errors:
-            print(f"   ⚠️  Found {len(errors)} error(s)")
-        else:
-            print(f"   ✅ All {valid} spell(s) valid")
-        print()
+        # Workers receive the resolver fully loaded rather than each parsing it
+        resolver.load()
+        results = map_files(
+            _validate_in_worker, [str(f) for f in spell_files], jobs,
+            initializer=_init_worker, initargs=(resolver, cache is not None),
+            on_done=report,
+        )
+        for (valid, errors), cache_stats in results:
+            total_valid += valid
+            all_errors.extend(errors)
+            if cache and cache_stats:
+                cache.merge_stats(cache_stats)
+    else:
+        # Process files with progress indication
+        for idx, spell_file in enumerate(spell_files, 1):
+            file_size = spell_file.stat().st_size / 1024  # Size in KB
+            print(f"🔍 [{idx}/{len(spell_files)}] Validating: {spell_file.name} ({file_size:.1f} KB)")
+            valid, errors = validate_spell_file(str(spell_file), cache, resolver)
+            total_valid += valid
+            all_errors.extend(errors)
+            _print_file_result(valid, errors)
     
     # Print cache stats if available
     if cache and CACHING_AVAILABLE:
@@ -375,7 +311,25 @@ def main():
         print(__doc__)
         sys.exit(1)
     
-    target = sys.argv[1]
+    parser = argparse.ArgumentParser(description="BG3 Spell Definition Validator")
+    parser.add_argument("target", help="Spell file or directory to validate")
+    parser.add_argument(
+        "--include",
+        nargs="*",
+        default=[],
+        help="Optional additional directories to resolve inherited `using` parents from (vanilla dumps, compatibility mods).",
+    )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=1,
+        help="Validate files in N worker processes (0 = one per CPU).",
+    )
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.start_from_args(args)
+    
+    target = args.target
     
     if not os.path.exists(target):
         print(f"❌ Error: Path does not exist: {target}")
@@ -386,7 +340,7 @@ def main():
     print("=" * 70)
     print()
     
-    valid_count, errors = validate_directory(target)
+    valid_count, errors = validate_directory(target, args.include, resolve_jobs(args.jobs))
     
     # Collect unique entry names in a single pass
     error_entry_names = set(e.entry_name for e in errors)
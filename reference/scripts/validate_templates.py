@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+BG3 RootTemplate <-> Stats Validator
+
+Cross-checks a mod's root templates (``RootTemplates/*.lsx``) against its
+stats entries:
+
+- every ``RootTemplate`` UUID in the stats must be a template of the mod or
+  one used by the included reference dumps
+- every template's ``Stats`` attribute must name an existing stats entry
+- an item template and the stats entry it names should point at each other,
+  and should agree on ``Icon`` when both set one
+- every template should be used by something: a stats entry, another
+  template's ``ParentTemplateId`` or a UUID in a stats property (summons,
+  projectiles, shapeshifts)
+
+Templates are streamed (see root_templates.py) and both sides are loaded into
+hash maps once, so the join is a single linear pass over each source however
+large the merged templates are.
+
+Usage:
+    python3 validate_templates.py <path_to_mod_directory> [--include DIR ...]
+
+Example:
+    python3 validate_templates.py Public/EldertideArmament/
+    python3 validate_templates.py Public/EldertideArmament/ --include reference/vanilla_data
+"""
+
+import argparse
+import os
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+
+import profiling
+from root_templates import GameObject, iter_game_objects
+from stats_parser import find_stats_files, load_stats_file
+from stats_resolver import StatsResolver, build_resolver
+from symbol_index import TEMPLATE_TYPE, SymbolIndex, open_symbol_index
+from validate_references import DEFAULT_INCLUDE_DIRS
+
+_UUID_PATTERN = re.compile(r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}')
+
+# Base-game stats entries missing from the partial reference dumps
+_EXTERNAL_STATS = frozenset({
+    "Familiar_Cat",
+})
+
+# Template types whose stats entry carries a RootTemplate pointing back at them
+_LINKED_TYPES = frozenset({"item"})
+
+
+class TemplateError:
+    def __init__(self, file_path: str, line_num: Optional[int], entry_name: str,
+                 property_name: str, value: str, message: str, severity: str = "error"):
+        self.file_path = file_path
+        self.line_num = line_num  # None for templates (iterparse has no line numbers)
+        self.entry_name = entry_name
+        self.property_name = property_name
+        self.value = value
+        self.message = message
+        self.severity = severity  # "error" or "warning"
+
+    def __str__(self) -> str:
+        icon = "❌" if self.severity == "error" else "⚠️"
+        location = self.file_path if self.line_num is None else f"{self.file_path}:{self.line_num}"
+        return (f"{icon} {location} - {self.entry_name}\n"
+                f"   Property: {self.property_name}\n"
+                f"   Value: {self.value}\n"
+                f"   {self.severity.title()}: {self.message}\n")
+
+
+def find_template_files(directory: Union[str, Path]) -> List[Path]:
+    """Return every RootTemplates ``.lsx`` file under a mod directory."""
+    return sorted(Path(directory).rglob("RootTemplates/*.lsx"))
+
+
+def _template_label(template: GameObject) -> str:
+    return template.name or template.map_key
+
+
+def index_templates(files: Sequence[Path]) -> Tuple[Dict[str, Tuple[GameObject, str]], List[TemplateError]]:
+    """Stream templates into a MapKey -> (record, file) map.
+
+    Returns:
+        The map and an error for every MapKey defined more than once
+    """
+    templates: Dict[str, Tuple[GameObject, str]] = {}
+    errors: List[TemplateError] = []
+    for file_path in files:
+        file_str = str(file_path)
+        for template in iter_game_objects(file_path):
+            previous = templates.get(template.map_key)
+            if previous is not None:
+                errors.append(TemplateError(
+                    file_str, None, _template_label(template), "MapKey", template.map_key,
+                    f"MapKey is already used by template '{_template_label(previous[0])}' in {previous[1]}",
+                ))
+            templates[template.map_key] = (template, file_str)
+    return templates, errors
+
+
+def validate_templates(directory: Union[str, Path], resolver: StatsResolver,
+                       indexes: Sequence[SymbolIndex] = ()) -> List[TemplateError]:
+    """Join the mod's templates with its stats entries and report mismatches.
+
+    Args:
+        directory: Mod directory (templates and stats are both found under it)
+        resolver: Resolver over the mod and the included dumps, for ``Stats``
+                  lookups and inherited ``RootTemplate``/``Icon`` values
+        indexes: Symbol indexes of the included dumps; RootTemplate UUIDs used
+                 by their stats count as existing templates
+
+    Returns:
+        Errors first, then warnings, each in file order
+    """
+    templates, errors = index_templates(find_template_files(directory))
+    warnings: List[TemplateError] = []
+
+    external_templates: Set[str] = set()
+    for index in indexes:
+        external_templates |= index.names(TEMPLATE_TYPE)
+
+    # Stats side: dangling RootTemplates, plus every template UUID that is used
+    used: Set[str] = {template.parent_template_id for template, _ in templates.values()}
+    for file_path in find_stats_files(directory):
+        try:
+            stats = load_stats_file(file_path)
+        except (OSError, UnicodeDecodeError):
+            continue
+        file_str = str(file_path)
+        for entry in stats.entries:
+            if entry.kind != "entry":
+                continue
+            for key, value, line_num in entry.items():
+                if key == "RootTemplate":
+                    if value and value not in templates and value not in external_templates:
+                        errors.append(TemplateError(
+                            file_str, line_num, entry.name, key, value,
+                            "RootTemplate does not match any template MapKey",
+                        ))
+                    used.add(value)
+                elif "-" in value:
+                    used.update(_UUID_PATTERN.findall(value))
+
+    # Template side: Stats links, icons and orphans
+    entries = resolver.entries
+    for map_key, (template, file_str) in templates.items():
+        label = _template_label(template)
+        if template.stats:
+            if template.stats not in entries and template.stats not in _EXTERNAL_STATS:
+                errors.append(TemplateError(
+                    file_str, None, label, "Stats", template.stats,
+                    "Template names a stats entry that does not exist",
+                ))
+            elif template.stats in entries:
+                properties = resolver.resolve(template.stats)
+                root_template = properties.get("RootTemplate")
+                if (template.type in _LINKED_TYPES and root_template
+                        and root_template not in (map_key, template.parent_template_id)):
+                    warnings.append(TemplateError(
+                        file_str, None, label, "Stats", template.stats,
+                        f"Stats entry points at RootTemplate '{root_template}', not back at this template",
+                        severity="warning",
+                    ))
+                icon = properties.get("Icon")
+                if icon and template.icon and icon != template.icon:
+                    warnings.append(TemplateError(
+                        file_str, None, label, "Icon", template.icon,
+                        f"Stats entry '{template.stats}' uses Icon '{icon}'",
+                        severity="warning",
+                    ))
+        elif map_key not in used:
+            warnings.append(TemplateError(
+                file_str, None, label, "MapKey", map_key,
+                "Template is not used by any stats entry or other template",
+                severity="warning",
+            ))
+
+    return errors + warnings
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    parser = argparse.ArgumentParser(description="BG3 RootTemplate <-> Stats Validator")
+    parser.add_argument("target", help="Path to mod directory to validate")
+    parser.add_argument(
+        "--include",
+        nargs="*",
+        default=[d for d in DEFAULT_INCLUDE_DIRS if os.path.isdir(d)],
+        help=(
+            "Additional directories to pull stats entries and template UUIDs from. "
+            "Defaults to the bundled reference dumps; pass --include with no directories to disable."
+        ),
+    )
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.start_from_args(args)
+
+    target = args.target
+
+    if not os.path.exists(target):
+        print(f"❌ Error: Path does not exist: {target}")
+        sys.exit(1)
+
+    if not os.path.isdir(target):
+        print(f"❌ Error: Path must be a directory: {target}")
+        sys.exit(1)
+
+    print("=" * 70)
+    print("BG3 RootTemplate Validator")
+    print("=" * 70)
+    print()
+
+    template_files = find_template_files(target)
+    print(f"📁 Found {len(template_files)} template file(s)")
+    for extra in args.include:
+        print(f"➕ Including definitions from: {extra}")
+    print()
+
+    indexes = [open_symbol_index(d) for d in args.include]
+    try:
+        diagnostics = validate_templates(target, build_resolver(target, args.include), indexes)
+    finally:
+        for index in indexes:
+            index.close()
+
+    errors = [d for d in diagnostics if d.severity == "error"]
+    warnings = [d for d in diagnostics if d.severity == "warning"]
+
+    if errors:
+        print("=" * 70)
+        print("ERRORS")
+        print("=" * 70)
+        print()
+        for error in errors:
+            print(error)
+
+    if warnings:
+        print("=" * 70)
+        print("WARNINGS")
+        print("=" * 70)
+        print()
+        for warning in warnings:
+            print(warning)
+
+    print("=" * 70)
+    print("VALIDATION SUMMARY")
+    print("=" * 70)
+
+    by_property = defaultdict(int)
+    for diagnostic in diagnostics:
+        by_property[diagnostic.property_name] += 1
+    for property_name, count in sorted(by_property.items()):
+        print(f"   {property_name}: {count} issue(s)")
+
+    print(f"\n❌ Total errors: {len(errors)}")
+    print(f"⚠️  Total warnings: {len(warnings)}")
+    print()
+
+    if errors:
+        print("❌ Validation FAILED")
+        sys.exit(1)
+    elif warnings:
+        print("⚠️  Validation PASSED with warnings")
+        sys.exit(0)
+    else:
+        print("✅ Validation PASSED")
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
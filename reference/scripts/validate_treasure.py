@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+BG3 Treasure Table Validator
+
+Checks a mod's ``Stats/Generated/TreasureTable.txt`` files (parsed with
+treasure_tables.py) against its stats entries and the treasure tables of the
+included reference dumps:
+
+- every line is a table, subtable, level range or object line the game reads,
+  and every subtable spec is a valid ``amount,weight;...`` list or ``-N``
+- every ``I_<name>`` object names an item stats entry (Armor, Weapon, Object)
+  of the mod or of the included dumps, or a base-game item the dumps' tables
+  drop
+- every ``T_<name>`` object names a table of the mod or of the dumps, or a
+  base-game table the dumps refer to
+- no table reaches itself through ``T_`` objects
+- subtables that can never drop anything, inverted level ranges, and tables
+  that replace an existing table without ``CanMerge 1``
+
+Usage:
+    python3 validate_treasure.py <path_to_mod_directory> [--include DIR ...]
+
+Example:
+    python3 validate_treasure.py Public/EldertideArmament/
+    python3 validate_treasure.py Public/EldertideArmament/ --include reference/vanilla_data
+"""
+
+import argparse
+import os
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Union
+
+import profiling
+from stats_parser import find_stats_files, load_stats_file
+from symbol_index import SymbolIndex, open_symbol_index
+from treasure_tables import (
+    ITEM_PREFIX, TABLE_PREFIX, TreasureTables, find_treasure_files, load_treasure_file, load_treasure_tables,
+)
+from validate_references import DEFAULT_INCLUDE_DIRS
+
+# Stats types an ``I_`` object may name
+ITEM_TYPES = ("Armor", "Weapon", "Object")
+
+
+class TreasureError:
+    def __init__(self, file_path: str, line_num: int, entry_name: str,
+                 property_name: str, value: str, message: str, severity: str = "error"):
+        self.file_path = file_path
+        self.line_num = line_num
+        self.entry_name = entry_name
+        self.property_name = property_name
+        self.value = value
+        self.message = message
+        self.severity = severity  # "error" or "warning"
+
+    def __str__(self) -> str:
+        icon = "❌" if self.severity == "error" else "⚠️"
+        return (f"{icon} {self.file_path}:{self.line_num} - {self.entry_name}\n"
+                f"   Property: {self.property_name}\n"
+                f"   Value: {self.value}\n"
+                f"   {self.severity.title()}: {self.message}\n")
+
+
+def _stats_types(directory: Union[str, Path], indexes: Sequence[SymbolIndex]) -> Dict[str, str]:
+    """Map every stats entry name of the dumps and the mod to its type."""
+    types: Dict[str, str] = {}
+    for index in indexes:
+        for type_name in ITEM_TYPES:
+            types.update(dict.fromkeys(index.names(type_name), type_name))
+    for file_path in find_stats_files(directory):
+        try:
+            stats = load_stats_file(file_path)
+        except (OSError, UnicodeDecodeError):
+            continue
+        for entry in stats.entries:
+            if entry.kind == "entry":
+                types[entry.name] = entry.type or ""
+    return types
+
+
+def validate_treasure(directory: Union[str, Path], include_dirs: Sequence[Union[str, Path]] = (),
+                      indexes: Sequence[SymbolIndex] = ()) -> List[TreasureError]:
+    """Check the treasure tables of a mod.
+
+    Args:
+        directory: Mod directory (treasure tables and stats are found under it)
+        include_dirs: Dumps whose treasure tables load before the mod's
+        indexes: Symbol indexes of the same dumps, for ``I_`` items they define
+
+    Returns:
+        Errors first, then warnings, each in file order
+    """
+    include_tables = load_treasure_tables(include_dirs)
+    mod_files = []
+    errors: List[TreasureError] = []
+    for file_path in find_treasure_files(directory):
+        try:
+            mod_files.append(load_treasure_file(file_path))
+        except (OSError, UnicodeDecodeError) as e:
+            errors.append(TreasureError(str(file_path), 0, "", "", "", f"Failed to read file: {e}"))
+    tables = TreasureTables(include_tables.files + mod_files)
+
+    stats_types = _stats_types(directory, indexes)
+    # Base-game tables outside the dumps are still known by the dump tables using them
+    known_tables = set(tables.tables) | include_tables.referenced_tables()
+    known_items = include_tables.dropped_items()
+    warnings: List[TreasureError] = []
+
+    for treasure_file in mod_files:
+        file_str = treasure_file.path
+        for line_num, text, message in treasure_file.problems:
+            errors.append(TreasureError(file_str, line_num, "", "line", text, message))
+
+        for table in treasure_file.tables:
+            replaced = tables.definitions[table.name].index(table) > 0
+            if replaced and not table.can_merge:
+                warnings.append(TreasureError(
+                    file_str, table.line, table.name, "CanMerge", "0",
+                    "Replaces an earlier table of the same name; add 'CanMerge 1' to extend it instead",
+                    "warning",
+                ))
+
+            for subtable in table.subtables:
+                spec = f'"{subtable.spec}"'
+                if not subtable.objects:
+                    warnings.append(TreasureError(
+                        file_str, subtable.line, table.name, "subtable", spec, "Subtable has no objects", "warning",
+                    ))
+                elif (subtable.drops or subtable.repeat) and not any(obj.frequency for obj in subtable.objects):
+                    warnings.append(TreasureError(
+                        file_str, subtable.line, table.name, "subtable", spec,
+                        "Every object has frequency 0, so the subtable never drops anything", "warning",
+                    ))
+                if subtable.drops and not any(amount for amount, _ in subtable.drops):
+                    warnings.append(TreasureError(
+                        file_str, subtable.line, table.name, "subtable", spec,
+                        "Every drop amount is 0, so the subtable never drops anything", "warning",
+                    ))
+                if (subtable.start_level is not None and subtable.end_level is not None
+                        and subtable.start_level > subtable.end_level):
+                    errors.append(TreasureError(
+                        file_str, subtable.line, table.name, "StartLevel", str(subtable.start_level),
+                        f"StartLevel is above EndLevel {subtable.end_level}",
+                    ))
+
+                for obj in subtable.objects:
+                    if obj.name.startswith(ITEM_PREFIX):
+                        stats_name = obj.name[len(ITEM_PREFIX):]
+                        stats_type = stats_types.get(stats_name)
+                        if stats_type is None:
+                            if stats_name in known_items:
+                                continue
+                            errors.append(TreasureError(
+                                file_str, obj.line, table.name, "object category", obj.name,
+                                f"No item stats entry named '{stats_name}'",
+                            ))
+                        elif stats_type not in ITEM_TYPES:
+                            errors.append(TreasureError(
+                                file_str, obj.line, table.name, "object category", obj.name,
+                                f"'{stats_name}' is a {stats_type or 'untyped'} entry, not an item "
+                                f"({', '.join(ITEM_TYPES)})",
+                            ))
+                    elif obj.name.startswith(TABLE_PREFIX):
+                        if obj.name[len(TABLE_PREFIX):] not in known_tables:
+                            errors.append(TreasureError(
+                                file_str, obj.line, table.name, "object category", obj.name,
+                                f"No treasure table named '{obj.name[len(TABLE_PREFIX):]}'",
+                            ))
+
+    # Cycles in the merged graph that pass through a table of the mod
+    mod_names = {table.name for treasure_file in mod_files for table in treasure_file.tables}
+    graph: Dict[str, Set[str]] = {
+        name: {obj.name[len(TABLE_PREFIX):] for obj in table.objects()
+               if obj.name.startswith(TABLE_PREFIX) and obj.name[len(TABLE_PREFIX):] in tables}
+        for name, table in tables.tables.items()
+    }
+    for cycle in _find_table_cycles(graph):
+        if not mod_names.intersection(cycle):
+            continue
+        first = next(name for name in cycle if name in mod_names)
+        table = tables.definitions[first][-1]
+        errors.append(TreasureError(
+            table.path, table.line, first, "object category", " -> ".join(cycle + [cycle[0]]),
+            "Treasure tables reach themselves through T_ objects",
+        ))
+
+    return errors + warnings
+
+
+def _find_table_cycles(graph: Dict[str, Set[str]]) -> List[List[str]]:
+    """Return one cycle per strongly connected group of the table graph.
+
+    Unlike an inheritance chain a table may roll several tables, so the
+    single-parent walk of validate_references does not apply; this is an
+    iterative depth-first search instead.
+    """
+    cycles: List[List[str]] = []
+    state: Dict[str, int] = {}  # 1: on the current path, 2: done
+    for start in sorted(graph):
+        if start in state:
+            continue
+        path: List[str] = []
+        stack = [(start, iter(sorted(graph[start])))]
+        state[start] = 1
+        path.append(start)
+        while stack:
+            node, children = stack[-1]
+            child: Optional[str] = next(children, None)
+            if child is None:
+                stack.pop()
+                path.pop()
+                state[node] = 2
+            elif state.get(child) == 1:
+                cycles.append(path[path.index(child):])
+            elif child not in state:
+                state[child] = 1
+                path.append(child)
+                stack.append((child, iter(sorted(graph[child]))))
+    return cycles
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    parser = argparse.ArgumentParser(description="BG3 Treasure Table Validator")
+    parser.add_argument("target", help="Path to mod directory to validate")
+    parser.add_argument(
+        "--include",
+        nargs="*",
+        default=[d for d in DEFAULT_INCLUDE_DIRS if os.path.isdir(d)],
+        help=(
+            "Directories whose treasure tables and item stats count as existing (vanilla dumps, "
+            "compatibility mods). Defaults to the bundled reference dumps; pass --include with no "
+            "directories to disable."
+        ),
+    )
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.start_from_args(args)
+
+    target = args.target
+
+    if not os.path.exists(target):
+        print(f"❌ Error: Path does not exist: {target}")
+        sys.exit(1)
+
+    if not os.path.isdir(target):
+        print(f"❌ Error: Path must be a directory: {target}")
+        sys.exit(1)
+
+    print("=" * 70)
+    print("BG3 Treasure Table Validator")
+    print("=" * 70)
+    print()
+
+    include_dirs = []
+    for extra in args.include:
+        if not os.path.isdir(extra):
+            print(f"⚠️  Skipping include dir (not found): {extra}")
+            continue
+        print(f"➕ Including definitions from: {extra}")
+        include_dirs.append(extra)
+    print()
+
+    indexes = [open_symbol_index(extra) for extra in include_dirs]
+    diagnostics = validate_treasure(target, include_dirs, indexes)
+    for index in indexes:
+        index.close()
+
+    errors = [d for d in diagnostics if d.severity == "error"]
+    warnings = [d for d in diagnostics if d.severity == "warning"]
+
+    if errors:
+        print("=" * 70)
+        print("ERRORS")
+        print("=" * 70)
+        print()
+        for error in errors:
+            print(error)
+
+    if warnings:
+        print("=" * 70)
+        print("WARNINGS")
+        print("=" * 70)
+        print()
+        for warning in warnings:
+            print(warning)
+
+    print("=" * 70)
+    print("VALIDATION SUMMARY")
+    print("=" * 70)
+
+    by_property = defaultdict(int)
+    for diagnostic in diagnostics:
+        by_property[diagnostic.property_name] += 1
+    for property_name, count in sorted(by_property.items()):
+        print(f"   {property_name}: {count} issue(s)")
+
+    print(f"\n❌ Total errors: {len(errors)}")
+    print(f"⚠️  Total warnings: {len(warnings)}")
+    print()
+
+    if errors:
+        print("❌ Validation FAILED")
+        sys.exit(1)
+    elif warnings:
+        print("⚠️  Validation PASSED with warnings")
+        sys.exit(0)
+    else:
+        print("✅ Validation PASSED")
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
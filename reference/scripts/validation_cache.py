@@ -5,10 +5,25 @@ Validation Results Caching Module
 This module provides caching functionality for validation results to speed up
 repeated validation runs when files haven't changed.
 
+All results live in a single SQLite manifest (``reference/.validation_cache/``
+by default) keyed by file path. Each row records the file's stat tuple
+(mtime_ns, size, inode), a SHA-256 of its content and the stat tuples of the
+files it depends on. A lookup only stats the file: the content hash is
+recomputed only when the stat tuple changed (e.g. after a checkout touched the
+file), so a warm run over an unchanged tree reads no data files at all.
+Results are stored as JSON, never pickled.
+
+Each validator caches under its own namespace together with a fingerprint of
+its rules (see :func:`rules_fingerprint`). Editing a validator's rule sets or
+source invalidates only that validator's results. A file keeps one row per
+namespace: saving results under a new variant (other include dirs, a changed
+load order) replaces the old row, so the manifest does not grow with edits.
+
 Usage:
     from validation_cache import ValidationCache
     
-    cache = ValidationCache()
+    cache = ValidationCache(namespace="spells",
+                            fingerprint=rules_fingerprint(__name__, "stats_parser"))
     
     # Try to load cached results
     cached = cache.load_cached_results(file_path)
@@ -18,32 +33,117 @@ Usage:
     # Run validation...
     results = validate_file(file_path)
     
-    # Save to cache
+    # Save to cache (results must be JSON-serializable)
     cache.save_cached_results(file_path, results)
 """
 
 import os
 import hashlib
-import pickle
 import json
+import re
+import sqlite3
+import sys
 from pathlib import Path
-from typing import Any, Optional, Dict
+from typing import Any, Optional, Dict, Iterable, List, Tuple
 from datetime import datetime, timedelta
 
+# Bump whenever the manifest schema or the stored result shape changes
+CACHE_VERSION = 3
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / ".validation_cache"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    path TEXT NOT NULL,
+    namespace TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    dependencies TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    results TEXT NOT NULL,
+    PRIMARY KEY (path, namespace)
+);
+"""
+
+StatKey = Tuple[int, int, int]
+
+
+def _rule_value_repr(value: Any) -> str:
+    """Order-independent representation of a rule constant."""
+    if isinstance(value, (set, frozenset)):
+        return repr(sorted(map(repr, value)))
+    if isinstance(value, dict):
+        return repr(sorted((repr(k), _rule_value_repr(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return repr([_rule_value_repr(v) for v in value])
+    if isinstance(value, re.Pattern):
+        return f"re({value.pattern!r}, {value.flags})"
+    if callable(value):
+        # Functions are covered by the source hash; their repr holds an address
+        return getattr(value, "__qualname__", type(value).__name__)
+    return repr(value)
+
+
+def rules_fingerprint(*module_names: str) -> str:
+    """Fingerprint the rules that produce a validator's results.
+    
+    Covers the source of each named (already imported) module plus the
+    current value of every upper-case module constant (``VALID_*`` sets,
+    ``MAX_*`` limits, precompiled patterns), so both edits to the file and
+    rules changed at runtime invalidate cached results.
+    
+    Args:
+        module_names: Modules whose rules affect the results, e.g. the
+                      validator itself and the parser it relies on
+    
+    Returns:
+        Short hexadecimal fingerprint
+    """
+    sha256 = hashlib.sha256()
+    for module_name in module_names:
+        module = sys.modules[module_name]
+        source = getattr(module, "__file__", None)
+        if source:
+            try:
+                with open(source, "rb") as f:
+                    sha256.update(f.read())
+            except OSError:
+                pass
+        for name, value in sorted(vars(module).items()):
+            if name.lstrip("_").isupper() and not callable(value):
+                sha256.update(f"{name}={_rule_value_repr(value)}\0".encode("utf-8"))
+    return sha256.hexdigest()[:16]
+
 
 class ValidationCache:
-    """Cache for validation results with file hash-based invalidation."""
+    """Cache for validation results with stat-first, hash-confirmed invalidation."""
     
-    def __init__(self, cache_dir: Optional[str] = None, max_age_days: int = 7):
+    def __init__(self, cache_dir: Optional[str] = None, max_age_days: int = 7,
+                 namespace: str = "", fingerprint: str = ""):
         """Initialize validation cache.
         
         Args:
-            cache_dir: Directory to store cache files. If None, uses .validation_cache
-                      in the same directory as the validated files.
+            cache_dir: Directory holding the manifest. If None, uses
+                      reference/.validation_cache.
             max_age_days: Maximum age of cache entries in days before auto-invalidation.
+            namespace: Validator the results belong to (e.g. "spells"); each
+                       namespace is cached and invalidated independently.
+            fingerprint: Fingerprint of the validator's rules; results stored
+                         under a different fingerprint are treated as stale.
         """
         self.cache_dir = cache_dir
         self.max_age_days = max_age_days
+        self.namespace = namespace
+        self.fingerprint = fingerprint
+        self._conn: Optional[sqlite3.Connection] = None
         self._cache_stats = {
             'hits': 0,
             'misses': 0,
@@ -51,23 +151,60 @@ class ValidationCache:
             'errors': 0
         }
     
-    def _get_cache_dir(self, file_path: str) -> Path:
-        """Get cache directory for a file."""
-        if self.cache_dir:
-            return Path(self.cache_dir)
-        
-        # Use a .validation_cache directory next to the validated file
-        file_parent = Path(file_path).parent
-        cache_dir = file_parent / '.validation_cache'
-        cache_dir.mkdir(exist_ok=True)
-        return cache_dir
+    @property
+    def manifest_path(self) -> Path:
+        """Path of the SQLite manifest."""
+        cache_dir = Path(self.cache_dir) if self.cache_dir else DEFAULT_CACHE_DIR
+        return cache_dir / f"manifest.v{CACHE_VERSION}.sqlite"
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open (and if needed create) the manifest on first use."""
+        if self._conn is None:
+            manifest = self.manifest_path
+            manifest.parent.mkdir(parents=True, exist_ok=True)
+            # Manifests of older cache versions are never read again
+            for old in manifest.parent.glob("manifest.v*.sqlite"):
+                if old != manifest:
+                    try:
+                        old.unlink()
+                    except OSError:
+                        pass
+            # Worker processes share the manifest, so wait for their writes
+            conn = sqlite3.connect(manifest, timeout=30)
+            conn.executescript(_SCHEMA)
+            row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or row[0] != str(CACHE_VERSION):
+                conn.execute("DELETE FROM results")
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (str(CACHE_VERSION),))
+                conn.commit()
+            self._conn = conn
+        return self._conn
+    
+    def close(self) -> None:
+        """Close the manifest connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
+    @staticmethod
+    def _cache_key(file_path: str) -> str:
+        return os.path.abspath(file_path)
+    
+    @staticmethod
+    def _stat_key(file_path: str) -> Optional[StatKey]:
+        """Return (mtime_ns, size, inode) for a file, or None if it is missing."""
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
     
     def _get_file_hash(self, file_path: str) -> str:
         """Calculate SHA256 hash of file content.
         
         Args:
             file_path: Path to file to hash
-            
+        
         Returns:
             Hexadecimal hash string
         """
@@ -75,162 +212,190 @@ class ValidationCache:
         try:
             with open(file_path, 'rb') as f:
                 # Read in chunks to handle large files efficiently
-                for chunk in iter(lambda: f.read(8192), b''):
+                for chunk in iter(lambda: f.read(1 << 16), b''):
                     sha256.update(chunk)
             return sha256.hexdigest()
         except (OSError, IOError, FileNotFoundError, PermissionError):
             # If we can't hash the file, return empty string to skip caching
             return ""
     
-    def _get_cache_path(self, file_path: str) -> Path:
-        """Get cache file path for a validation target.
+    def _get_dependency_signature(self, dependencies: Iterable[str]) -> Dict[str, Optional[List[int]]]:
+        """Stat every dependency of a validated file.
         
         Args:
-            file_path: Path to file being validated
-            
+            dependencies: Paths of other files the results depend on
+                          (e.g. files defining inherited parents)
+        
         Returns:
-            Path to cache file
+            Mapping of absolute path to [mtime_ns, size, inode], or None if the path is missing
         """
-        cache_dir = self._get_cache_dir(file_path)
-        file_name = Path(file_path).name
-        cache_name = f"{file_name}.cache"
-        return cache_dir / cache_name
+        signature = {}
+        for dep in sorted(self._cache_key(d) for d in dependencies):
+            stat_key = self._stat_key(dep)
+            signature[dep] = list(stat_key) if stat_key else None
+        return signature
     
-    def _is_cache_valid(self, cache_data: Dict[str, Any], file_hash: str) -> bool:
-        """Check if cached data is still valid.
+    def _is_cache_valid(self, timestamp: str, stored_dependencies: Dict[str, Optional[List[int]]],
+                        dependencies: Optional[Iterable[str]] = None) -> bool:
+        """Check if a manifest row is still valid once the file itself matched.
         
         Args:
-            cache_data: Cached data dictionary
-            file_hash: Current file hash
-            
+            timestamp: ISO timestamp of when the results were computed
+            stored_dependencies: Dependency signature recorded with the results
+            dependencies: If given, the dependency set the caller expects
+        
         Returns:
             True if cache is valid, False otherwise
         """
-        # Check if hash matches
-        if cache_data.get('hash') != file_hash:
+        # The caller may know the dependency set; it must match what was recorded
+        if dependencies is not None:
+            expected = {self._cache_key(d) for d in dependencies}
+            if expected != set(stored_dependencies):
+                return False
+        
+        # Check that no dependency changed since the results were computed
+        if self._get_dependency_signature(stored_dependencies) != stored_dependencies:
             return False
         
         # Check if cache is too old
-        if 'timestamp' in cache_data:
-            try:
-                cache_time = datetime.fromisoformat(cache_data['timestamp'])
-                age = datetime.now() - cache_time
-                if age > timedelta(days=self.max_age_days):
-                    return False
-            except Exception:
+        try:
+            age = datetime.now() - datetime.fromisoformat(timestamp)
+            if age > timedelta(days=self.max_age_days):
                 return False
+        except ValueError:
+            return False
         
         return True
     
-    def load_cached_results(self, file_path: str) -> Optional[Any]:
+    def load_cached_results(self, file_path: str, dependencies: Optional[Iterable[str]] = None,
+                            variant: str = "") -> Optional[Any]:
         """Load validation results from cache if available and valid.
         
+        Only the file and its recorded dependencies are stat'ed; the file is
+        read (to re-hash it) only when its stat tuple changed.
+        
         Args:
             file_path: Path to file being validated
-            
+            dependencies: Paths of other files the results depend on. If None,
+                          the dependencies recorded with the results are checked.
+            variant: Settings the results must have been computed under (e.g.
+                     the include dirs); results saved under another variant
+                     are a miss
+        
         Returns:
             Cached validation results if valid, None otherwise
         """
-        cache_path = self._get_cache_path(file_path)
-        
-        if not cache_path.exists():
-            self._cache_stats['misses'] += 1
+        key = self._cache_key(file_path)
+        stat_key = self._stat_key(key)
+        if stat_key is None:
+            self._cache_stats['errors'] += 1
             return None
         
         try:
-            # Get current file hash
-            file_hash = self._get_file_hash(file_path)
-            if not file_hash:
-                self._cache_stats['errors'] += 1
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT variant, fingerprint, mtime_ns, size, inode, hash, dependencies, timestamp, results "
+                "FROM results WHERE path = ? AND namespace = ?",
+                (key, self.namespace),
+            ).fetchone()
+            
+            # Missing, or computed under different settings or rules
+            if row is None or row[0] != variant or row[1] != self.fingerprint:
+                self._cache_stats['misses'] += 1
                 return None
             
-            # Load cache file
-            with open(cache_path, 'rb') as f:
-                cache_data = pickle.load(f)
+            _, _, mtime_ns, size, inode, file_hash, stored_deps, timestamp, results = row
+            
+            if (mtime_ns, size, inode) != stat_key:
+                # Touched or replaced: only re-hash now, and keep the results
+                # if the content turns out to be unchanged
+                if self._get_file_hash(key) != file_hash:
+                    self._cache_stats['misses'] += 1
+                    return None
+                conn.execute(
+                    "UPDATE results SET mtime_ns = ?, size = ?, inode = ? "
+                    "WHERE path = ? AND namespace = ?",
+                    (*stat_key, key, self.namespace),
+                )
+                conn.commit()
             
-            # Validate cache
-            if not self._is_cache_valid(cache_data, file_hash):
+            if not self._is_cache_valid(timestamp, json.loads(stored_deps), dependencies):
                 self._cache_stats['misses'] += 1
                 return None
             
             self._cache_stats['hits'] += 1
-            return cache_data.get('results')
-            
-        except (FileNotFoundError, PermissionError, pickle.UnpicklingError, EOFError, AttributeError):
-            # On expected cache errors, treat as cache miss
-            # AttributeError can occur when unpickling objects from different modules
+            return json.loads(results)
+        
+        except (sqlite3.Error, ValueError):
+            # On expected cache errors (locked or corrupt manifest, bad JSON), treat as cache miss
             self._cache_stats['errors'] += 1
             return None
     
-    def save_cached_results(self, file_path: str, results: Any) -> bool:
+    def save_cached_results(self, file_path: str, results: Any, dependencies: Iterable[str] = (),
+                            variant: str = "") -> bool:
         """Save validation results to cache.
         
         Args:
             file_path: Path to file being validated
-            results: Validation results to cache
-            
+            results: JSON-serializable validation results
+            dependencies: Paths of other files the results depend on
+            variant: Settings the results were computed under (see
+                     load_cached_results); replaces results saved under any
+                     other variant, so each file keeps one row per namespace
+        
         Returns:
             True if saved successfully, False otherwise
         """
+        key = self._cache_key(file_path)
+        stat_key = self._stat_key(key)
+        file_hash = self._get_file_hash(key)
+        if stat_key is None or not file_hash:
+            return False
+        
         try:
-            cache_path = self._get_cache_path(file_path)
-            
-            # Get file hash
-            file_hash = self._get_file_hash(file_path)
-            if not file_hash:
-                return False
-            
-            # Prepare cache data
-            cache_data = {
-                'hash': file_hash,
-                'timestamp': datetime.now().isoformat(),
-                'results': results,
-                'file_path': str(file_path)
-            }
-            
-            # Save to cache
-            with open(cache_path, 'wb') as f:
-                pickle.dump(cache_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key, self.namespace, variant, self.fingerprint, *stat_key, file_hash,
+                    json.dumps(self._get_dependency_signature(dependencies)),
+                    datetime.now().isoformat(),
+                    json.dumps(results),
+                ),
+            )
+            conn.commit()
             
             self._cache_stats['saves'] += 1
             return True
-            
-        except (OSError, PermissionError, pickle.PicklingError):
+        
+        except (OSError, sqlite3.Error, TypeError, ValueError):
             self._cache_stats['errors'] += 1
             return False
     
     def clear_cache(self, file_path: Optional[str] = None) -> int:
-        """Clear cache files.
+        """Clear this namespace's cached results.
         
         Args:
             file_path: If provided, clear cache for this file only.
-                      If None, clear all cache files in cache directory.
-                      
+                      If None, clear every entry of the namespace.
+        
         Returns:
-            Number of cache files deleted
+            Number of cache entries deleted
         """
-        deleted = 0
-        
         try:
+            conn = self._connect()
             if file_path:
-                # Clear specific file cache
-                cache_path = self._get_cache_path(file_path)
-                if cache_path.exists():
-                    cache_path.unlink()
-                    deleted = 1
+                cursor = conn.execute(
+                    "DELETE FROM results WHERE path = ? AND namespace = ?",
+                    (self._cache_key(file_path), self.namespace),
+                )
             else:
-                # Clear all caches in cache directory
-                if self.cache_dir:
-                    cache_dir = Path(self.cache_dir)
-                    if cache_dir.exists():
-                        for cache_file in cache_dir.glob("*.cache"):
-                            cache_file.unlink()
-                            deleted += 1
-        except (OSError, PermissionError):
-            # Silently ignore file deletion errors
-            pass
-        
-        return deleted
+                cursor = conn.execute("DELETE FROM results WHERE namespace = ?", (self.namespace,))
+            conn.commit()
+            return cursor.rowcount
+        except (OSError, sqlite3.Error):
+            # Silently ignore manifest errors
+            return 0
     
     def get_stats(self) -> Dict[str, int]:
         """Get cache statistics.
@@ -249,6 +414,15 @@ class ValidationCache:
         
         return stats
     
+    def merge_stats(self, stats: Dict[str, Any]) -> None:
+        """Add counters collected by another cache instance (e.g. a worker process).
+        
+        Args:
+            stats: Statistics as returned by get_stats()
+        """
+        for key in self._cache_stats:
+            self._cache_stats[key] += stats.get(key, 0)
+    
     def print_stats(self):
         """Print cache statistics to stdout."""
         stats = self.get_stats()
@@ -289,6 +463,7 @@ def main():
     cache = ValidationCache()
     
     print(f"Testing cache with: {file_path}")
+    print(f"Manifest: {cache.manifest_path}")
     print()
     
     # Try to load from cache
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Regression tests for cached spell and item validation results.
+
+Run with:
+    python3 -m pytest reference/tests
+    python3 -m unittest discover reference/tests
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import validate_spells  # noqa: E402
+from stats_parser import clear_cache  # noqa: E402
+from stats_resolver import build_resolver  # noqa: E402
+from validation_cache import ValidationCache, rules_fingerprint  # noqa: E402
+
+SPELL_A = '''new entry "X"
+type "SpellData"
+using "P"
+data "Level" "1"
+'''
+
+SPELL_B = '''new entry "P"
+type "SpellData"
+data "SpellType" "Bogus"
+'''
+
+
+class CachedParentTest(unittest.TestCase):
+    """A parent added in another file must invalidate cached results."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        self.data_dir = root / "Data"
+        self.data_dir.mkdir()
+        self.cache_dir = root / "cache"
+        clear_cache()
+
+    def tearDown(self):
+        clear_cache()
+        self._tmp.cleanup()
+
+    def validate(self):
+        """One run as validate_directory does it: a fresh resolver and cache."""
+        cache = ValidationCache(cache_dir=str(self.cache_dir), namespace="spells",
+                                fingerprint=rules_fingerprint("validate_spells"))
+        resolver = build_resolver(self.data_dir)
+        errors = []
+        try:
+            for spell_file in validate_spells.find_spell_files(str(self.data_dir)):
+                errors.extend(validate_spells.validate_spell_file(str(spell_file), cache, resolver)[1])
+        finally:
+            cache.close()
+        return sorted(e.entry_name for e in errors)
+
+    def test_parent_added_in_other_file(self):
+        (self.data_dir / "Spell_A.txt").write_text(SPELL_A, encoding="utf-8")
+        self.assertEqual(self.validate(), [])
+
+        (self.data_dir / "Spell_B.txt").write_text(SPELL_B, encoding="utf-8")
+        self.assertEqual(self.validate(), ["P", "X"])
+        # Warm run over the unchanged tree agrees with the cold one
+        self.assertEqual(self.validate(), ["P", "X"])
+
+    def test_parent_overridden_in_other_file(self):
+        (self.data_dir / "Spell_A.txt").write_text(SPELL_A, encoding="utf-8")
+        (self.data_dir / "Spell_B.txt").write_text(SPELL_B, encoding="utf-8")
+        self.assertEqual(self.validate(), ["P", "X"])
+
+        (self.data_dir / "Spell_B.txt").write_text(SPELL_B.replace("Bogus", "Target"), encoding="utf-8")
+        self.assertEqual(self.validate(), [])
+
+    def test_edits_keep_one_row_per_file(self):
+        (self.data_dir / "Spell_A.txt").write_text(SPELL_A, encoding="utf-8")
+        for spell_type in ("Bogus", "Target", "Zone"):
+            (self.data_dir / "Spell_B.txt").write_text(SPELL_B.replace("Bogus", spell_type), encoding="utf-8")
+            self.validate()
+
+        cache = ValidationCache(cache_dir=str(self.cache_dir), namespace="spells")
+        try:
+            rows = cache._connect().execute("SELECT path, COUNT(*) FROM results GROUP BY path").fetchall()
+        finally:
+            cache.close()
+        self.assertEqual(sorted(count for _, count in rows), [1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,16 +1,23 @@
 """Heuristic validator for Eldertide Armament status/passive/spell references."""
 import pathlib
 import re
+import sys
+from typing import Optional
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent / "reference" / "scripts"))
+
+from stats_parser import StatsFile, load_stats_file, parse_stats_text  # noqa: E402
+from symbol_index import open_symbol_index  # noqa: E402
 
 # Set to your mod's stats folder
 MOD_DIR = pathlib.Path("Public/EldertideArmament/Stats/Generated/Data")
 
 # Optional: AI-Allies (Overhaul) reference dump (placed under reference/)
-AI_ALLIES_DIR = pathlib.Path(
-    "reference/AI-Allies (Overhaul)/Public/AI Allies/Stats/Generated/Data"
-)
+AI_ALLIES_ROOT = pathlib.Path("reference/AI-Allies (Overhaul)")
+AI_ALLIES_DIR = AI_ALLIES_ROOT / "Public/AI Allies/Stats/Generated/Data"
 
-REF_BASE = pathlib.Path("reference/vanilla_data/Gustav/Stats/Generated/Data")
+VANILLA_ROOT = pathlib.Path("reference/vanilla_data")
+REF_BASE = VANILLA_ROOT / "Gustav/Stats/Generated/Data"
 REF_STATUS = REF_BASE / "Status_BOOST.txt"
 REF_PASSIVE = REF_BASE / "Passive.txt"
 REF_SPELLS = [REF_BASE / "Spell_Target.txt", REF_BASE / "Spell_Projectile.txt"]
@@ -48,46 +55,64 @@ AI_SPELLS = [
 ]
 
 
-def entries(path: pathlib.Path) -> set[str]:
+_REFERENCE_PATTERN = re.compile(
+    r"(?:ApplyStatus|HasStatus|RemoveStatus|UnlockSpell)\(\s*([A-Za-z0-9_]+)"
+)
+
+
+def load(path: pathlib.Path) -> Optional[StatsFile]:
+    """Parse ``path``, dropping undecodable bytes instead of the whole file."""
     try:
-        text = path.read_text(encoding="utf-8", errors="ignore")
+        return load_stats_file(path)
     except FileNotFoundError:
+        return None
+    except UnicodeDecodeError as e:
+        print(f"Warning: {path} is not valid UTF-8 ({e}); ignoring the bad bytes", file=sys.stderr)
+        return parse_stats_text(path.read_text(encoding="utf-8", errors="ignore"), str(path))
+
+
+def entries(path: pathlib.Path) -> set[str]:
+    stats = load(path)
+    return set(stats.by_name) if stats is not None else set()
+
+
+def indexed_entries(root: pathlib.Path, type_name: str, paths: list[pathlib.Path]) -> set[str]:
+    """Names of ``type_name`` defined in ``paths``, read from the dump's symbol index."""
+    if not root.is_dir():
         return set()
-    return {m.group(1) for m in re.finditer(r'new entry "([^"]+)"', text)}
+    with open_symbol_index(root) as index:
+        return index.names(type_name, [p.resolve() for p in paths])
 
 
 def referenced_tokens(text: str) -> set[str]:
-    tokens: set[str] = set()
-    for functor in ("ApplyStatus", "HasStatus", "RemoveStatus"):
-        tokens.update(re.findall(rf"{functor}\(\s*([A-Za-z0-9_]+)", text))
-    tokens.update(re.findall(r"UnlockSpell\(\s*([A-Za-z0-9_]+)", text))
-    return {t for t in tokens if t.upper() == t}
+    return {t for t in _REFERENCE_PATTERN.findall(text) if t.upper() == t}
 
 
 def collect_refs() -> set[str]:
     refs: set[str] = set()
     for path in SCAN_FILES:
-        try:
-            text = path.read_text(encoding="utf-8", errors="ignore")
-        except FileNotFoundError:
+        stats = load(path)
+        if stats is None:
             continue
-        for tok in referenced_tokens(text):
-            refs.add(tok)
+        for entry in stats:
+            for _, value, _ in entry.items():
+                if "(" in value:
+                    refs.update(referenced_tokens(value))
     return refs
 
 
 def main() -> None:
-    ref_status = entries(REF_STATUS)
-    ref_passive = entries(REF_PASSIVE)
-    ref_spells = set().union(*(entries(p) for p in REF_SPELLS))
+    ref_status = indexed_entries(VANILLA_ROOT, "StatusData", [REF_STATUS])
+    ref_passive = indexed_entries(VANILLA_ROOT, "PassiveData", [REF_PASSIVE])
+    ref_spells = indexed_entries(VANILLA_ROOT, "SpellData", REF_SPELLS)
 
     custom_status = set().union(*(entries(p) for p in CUSTOM_STATUS))
     custom_passive = set().union(*(entries(p) for p in CUSTOM_PASSIVE))
     custom_spells = set().union(*(entries(p) for p in CUSTOM_SPELLS))
 
-    ai_status = set().union(*(entries(p) for p in AI_STATUS))
-    ai_passive = set().union(*(entries(p) for p in AI_PASSIVE))
-    ai_spells = set().union(*(entries(p) for p in AI_SPELLS))
+    ai_status = indexed_entries(AI_ALLIES_ROOT, "StatusData", AI_STATUS)
+    ai_passive = indexed_entries(AI_ALLIES_ROOT, "PassiveData", AI_PASSIVE)
+    ai_spells = indexed_entries(AI_ALLIES_ROOT, "SpellData", AI_SPELLS)
 
     noise = {"ALLIES_AI_1", "ALLIES_AI_2", "ALLIES_CONTROLLED", "ALLIES_ORDER"}
 